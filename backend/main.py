@@ -1,4 +1,5 @@
 import sys
+from pathlib import Path
 from typing import Optional
 
 import typer
@@ -22,13 +23,59 @@ def scrape(type: Optional[EntityType] = None):
     uc.execute()
 
 
+@app.command("ingest-dump")
+def ingest_dump(
+    dump: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True),
+    type: Optional[EntityType] = None,
+):
+    """Load the pages of a Wikimedia HTML dump (tar.gz of NDJSON) into the storage,
+    instead of scraping them.
+
+    Example usage:
+        python main.py ingest-dump frwiki-NS0-ENTERPRISE-HTML.json.tar.gz --type movies
+        python main.py ingest-dump frwiki-NS0-ENTERPRISE-HTML.json.tar.gz # loads both types
+    """
+
+    from src.use_cases.ingest_dump import DumpIngestionUseCase
+
+    uc = DumpIngestionUseCase(
+        app_settings=AppSettings(),
+        types=[type.value] if type else list(EntityType),
+        dump_path=dump,
+    )
+    uc.execute()
+
+
+@app.command("compress-html")
+def compress_html(type: Optional[EntityType] = None):
+    """Compress the HTML contents stored in Redis with a zstd dictionary trained from them.
+
+    Example usage:
+        python main.py compress-html --type movies
+        python main.py compress-html # runs both types
+    """
+
+    from src.use_cases.compress_html import HtmlCompressionUseCase
+
+    uc = HtmlCompressionUseCase(
+        app_settings=AppSettings(),
+        types=[type.value] if type else list(EntityType),
+    )
+    uc.execute()
+
+
 @app.command()
-def extract(type: Optional[EntityType] = None):
+def extract(
+    type: Optional[EntityType] = None,
+    partition: int = typer.Option(0, min=0),
+    num_partitions: int = typer.Option(1, min=1),
+):
     """
     Example usage:
         python main.py extract --type movies
         python main.py extract --type persons
         python main.py extract # runs both types
+        python main.py extract --partition 0 --num-partitions 4 # extracts a quarter of the pages
     """
 
     from src.use_cases.extract import EntityExtractionUseCase
@@ -36,21 +83,27 @@ def extract(type: Optional[EntityType] = None):
     uc = EntityExtractionUseCase(
         app_settings=AppSettings(),
         types=[type.value] if type else list(EntityType),
+        partition=partition,
+        num_partitions=num_partitions,
     )
     uc.execute()
 
 
 @app.command()
-def store(type: Optional[EntityType] = None):
+def store(type: Optional[EntityType] = None, bulk_load: bool = False):
     """Store extracted entities in the database.
 
     Args:
         type (Optional[EntityType], optional): The type of entities to store. Defaults to None.
+        bulk_load (bool, optional): populate an empty graph DB in bulk (CSV staging files + LOAD CSV),
+            much faster than the batched inserts. The load is run once, one type after the other,
+            before the deployments are created; their later runs insert by batches. Defaults to False.
 
     Example usage:
         python main.py store --type movies
         python main.py store --type persons
         python main.py store # runs both types
+        python main.py store --bulk-load # first-time population of the graph DB
     """
 
     from src.use_cases.db_storage import DBStorageUseCase
@@ -58,6 +111,7 @@ def store(type: Optional[EntityType] = None):
     uc = DBStorageUseCase(
         app_settings=AppSettings(),
         types=[type.value] if type else list(EntityType),
+        bulk_load=bulk_load,
     )
     uc.execute()
 
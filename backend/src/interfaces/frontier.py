@@ -0,0 +1,51 @@
+from enum import StrEnum
+from typing import Protocol
+
+from src.entities.content import PageLink
+
+
+class LinkStatus(StrEnum):
+
+    PENDING = "pending"
+    DONE = "done"
+    VOID = "void"
+    FAILED = "failed"
+
+
+class IFrontier(Protocol):
+    """
+    Interface for persisting the links discovered in a table of contents along with their status,
+    so that an interrupted scraping can be resumed from the links not downloaded yet.
+    """
+
+    def load(self, frontier_id: str) -> list[PageLink] | None:
+        """
+        Returns the links of the frontier which remain to be downloaded (pending or failed).
+
+        Args:
+            frontier_id (str): The ID of the frontier, e.g. derived from the table of contents.
+
+        Returns:
+            list[PageLink] | None: the links to download, or None if the frontier was not saved.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def save(self, frontier_id: str, page_links: list[PageLink]) -> None:
+        """
+        Saves the given links as pending, replacing the previous frontier if any.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def mark(
+        self, frontier_id: str, page_links: list[PageLink], status: LinkStatus
+    ) -> None:
+        """
+        Updates the status of the given links.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def clear(self, frontier_id: str) -> None:
+        """
+        Discards the frontier, once all its links are processed.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
@@ -0,0 +1,47 @@
+from typing import Protocol
+
+from src.entities.content import PageLink
+
+
+class IPageRegistry(Protocol):
+    """
+    Interface for keeping track of the pages already downloaded,
+    so that a page linked by several tables of contents is downloaded once.
+    """
+
+    def claim(self, page_links: list[PageLink], flow_id: str) -> list[PageLink]:
+        """
+        Marks the given pages as downloaded, and returns those which were not already.
+
+        Args:
+            page_links (list[PageLink]): The pages about to be downloaded.
+            flow_id (str): The ID of the flow run downloading the pages.
+
+        Returns:
+            list[PageLink]: the pages which were not downloaded yet, and must be downloaded by the caller.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def take_over(self, page_links: list[PageLink], flow_id: str) -> None:
+        """
+        Claims the given pages for the flow run `flow_id`, whatever flow run claimed them before,
+        e.g. the pages left pending by an interrupted flow run which scraping is resumed.
+
+        Args:
+            page_links (list[PageLink]): The pages about to be downloaded.
+            flow_id (str): The ID of the flow run downloading the pages.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def release(self, page_links: list[PageLink], flow_id: str) -> None:
+        """
+        Forgets the given pages, when they could not be downloaded, so that they can be downloaded again.
+
+        Only the pages claimed by the flow run `flow_id` are released,
+        the pages claimed by another flow run are kept until they expire.
+
+        Args:
+            page_links (list[PageLink]): The pages which could not be downloaded.
+            flow_id (str): The ID of the flow run which claimed the pages.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
@@ -0,0 +1,22 @@
+from typing import Protocol
+
+
+class IRateLimiter(Protocol):
+    """
+    Interface for limiting the rate of the requests sent to an API.
+    """
+
+    def acquire(self, tokens: int = 1) -> None:
+        """
+        Blocks until the given number of tokens is available, and consumes them.
+
+        Args:
+            tokens (int): The number of tokens to consume, one per request.
+        """
+        pass
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """
+        Same as `acquire`, without blocking the event loop.
+        """
+        pass
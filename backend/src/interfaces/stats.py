@@ -7,6 +7,10 @@ class StatKey(StrEnum):
     SCRAPING_SUCCESS = "scraping_success"
     SCRAPING_FAILED = "scraping_failed"
     SCRAPING_VOID = "scraping_void"
+    SCRAPING_UNCHANGED = "scraping_unchanged"
+    SCRAPING_DUPLICATE = "scraping_duplicate"
+    HTTP_CACHE_HIT = "http_cache_hit"
+    HTTP_CACHE_MISS = "http_cache_miss"
     EXTRACTION_SUCCESS = "extraction_success"
     EXTRACTION_FAILED = "extraction_failed"
     EXTRACTION_VOID = "extraction_void"
@@ -30,5 +34,9 @@ class IStatsCollector(Protocol):
     ) -> None:
         raise NotImplementedError("This method should be overridden by subclasses.")
 
+    def flush(self, flow_id: str | None = None) -> None:
+        """writes the values buffered by the collector, if any"""
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
     def collect(self, flow_id: str) -> dict[str, int]:
         raise NotImplementedError("This method should be overridden by subclasses.")
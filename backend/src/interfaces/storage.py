@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generator, Sequence
+from typing import Generator, Iterable, Sequence
 
 from src.entities.composable import Composable
 from src.entities.relationship import BaseRelationship
@@ -51,6 +51,55 @@ class IStorageHandler[U](ABC):
         raise NotImplementedError("This method should be overridden by subclasses.")
 
 
+class IVersionedStorageHandler[U](IStorageHandler[U]):
+    """A storage handler keeping track of the revision of the contents it stores,
+    so that contents which did not change are not downloaded again.
+    """
+
+    @abstractmethod
+    def select_revisions(
+        self,
+        content_ids: Sequence[str],
+        *args,
+        **kwargs,
+    ) -> dict[str, int]:
+        """Loads the revision ids of the given contents.
+
+        Returns:
+            dict[str, int]: the revision id of each content, contents stored without revision are omitted.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+class IEvictableStorageHandler[U](IStorageHandler[U]):
+    """A storage handler whose contents can be evicted once they are processed,
+    according to its retention policy (e.g. expired or moved to an archive).
+    """
+
+    @abstractmethod
+    def evict(self, content_id: str, *args, **kwargs) -> None:
+        """Applies the retention policy to a content which was processed."""
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+class IBulkLoadableStorageHandler[U](IStorageHandler[U]):
+    """A storage handler which can be populated in bulk, faster than by `insert_many`,
+    when it does not contain any content yet.
+    """
+
+    @abstractmethod
+    def bulk_load(self, contents: Iterable[U], *args, **kwargs) -> int:
+        """Loads the contents into the empty storage.
+
+        Returns:
+            int: the number of contents loaded.
+
+        raises:
+            StorageError: If the storage is not empty or the contents cannot be loaded.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
 class IRelationshipHandler[U: Composable](IStorageHandler[U]):
 
     @abstractmethod
@@ -66,3 +115,18 @@ class IRelationshipHandler[U: Composable](IStorageHandler[U]):
             RelationshipError: If the relationship cannot be added.
         """
         raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def add_relationships(
+        self,
+        relationships: Sequence[BaseRelationship],
+        *args,
+        **kwargs,
+    ) -> None:
+        """Adds several relationships at once,
+        by default they are added one by one, implementations may write them in bulk.
+
+        raises:
+            RelationshipError: If the relationships cannot be added.
+        """
+        for relationship in relationships:
+            self.add_relationship(relationship, *args, **kwargs)
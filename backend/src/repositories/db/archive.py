@@ -0,0 +1,160 @@
+import fcntl
+import sqlite3
+import threading
+from pathlib import Path
+
+from src.repositories.db.redis.compression import compress, decompress
+
+INDEX_FILENAME = "index.sqlite"
+LOCK_FILENAME = ".lock"
+
+# a new segment file is started when the current one exceeds this size, in bytes
+DEFAULT_SEGMENT_SIZE = 256 * 1024 * 1024
+
+
+class SegmentArchive:
+    """an append-only archive of zstd-compressed contents on the local disk
+
+    The contents are appended to segment files (`segment-00001.zst`, ...), each content compressed
+    as an independent zstd frame. A SQLite index maps each content ID to its segment,
+    its offset and its length, so that a content is read with a single seek.
+    Archiving a content again appends it and points the index to the new copy.
+
+    The appends are serialized between processes by a lock file.
+    SQLite connections cannot be shared across processes nor serialized,
+        thus a single archive is opened per directory in each process (see `get_archive`).
+    """
+
+    directory: Path
+    segment_size: int
+    compression_level: int
+
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        compression_level: int = 3,
+    ):
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.segment_size = segment_size
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.directory / INDEX_FILENAME,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS contents(
+                content_id TEXT PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                revision_id INTEGER
+            )""")
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"segment-{segment:05d}.zst"
+
+    def _current_segment(self) -> int:
+        """the segment the contents are appended to, a new one when the last one is full"""
+
+        segments = sorted(
+            int(path.stem.removeprefix("segment-"))
+            for path in self.directory.glob("segment-*.zst")
+        )
+
+        if not segments:
+            return 1
+
+        last = segments[-1]
+
+        if self._segment_path(last).stat().st_size >= self.segment_size:
+            return last + 1
+
+        return last
+
+    def put(
+        self,
+        content_id: str,
+        content: str,
+        revision_id: int | None = None,
+    ) -> None:
+        """appends the content to the current segment and indexes it"""
+
+        data = compress(content, level=self.compression_level)
+
+        with self._lock, open(self.directory / LOCK_FILENAME, "a") as lock_file:
+
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            try:
+                segment = self._current_segment()
+
+                with open(self._segment_path(segment), "ab") as segment_file:
+                    offset = segment_file.tell()
+                    segment_file.write(data)
+                    segment_file.flush()
+
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO contents(content_id, segment, offset, length, revision_id) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (content_id, segment, offset, len(data), revision_id),
+                )
+
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, content_id: str) -> str | None:
+        """reads the content from its segment, None when it is not archived"""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT segment, offset, length FROM contents WHERE content_id = ?",
+                (content_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        segment, offset, length = row
+
+        with open(self._segment_path(segment), "rb") as segment_file:
+            segment_file.seek(offset)
+            return decompress(segment_file.read(length))
+
+    def __contains__(self, content_id: str) -> bool:
+
+        with self._lock:
+            return (
+                self._connection.execute(
+                    "SELECT 1 FROM contents WHERE content_id = ?", (content_id,)
+                ).fetchone()
+                is not None
+            )
+
+
+_archives: dict[str, SegmentArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(directory: str | Path, compression_level: int = 3) -> SegmentArchive:
+    """returns the archive opened in the current process for the given directory"""
+
+    key = Path(directory).resolve().as_posix()
+
+    with _archives_lock:
+
+        archive = _archives.get(key)
+
+        if archive is None:
+            archive = _archives[key] = SegmentArchive(
+                key, compression_level=compression_level
+            )
+
+        return archive
@@ -0,0 +1,137 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+import orjson
+
+# the columns of the staging files: the uid of the node and its properties as a JSON object,
+# so that the nested properties (lists, maps) are loaded as is
+STAGING_HEADER = ("uid", "doc")
+
+# the number of nodes of each staging file, each file is loaded by a single query
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def write_staging_files(
+    rows: Iterable[dict[str, Any]],
+    directory: str | Path,
+    prefix: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[Path]:
+    """writes the rows into CSV files of `chunk_size` rows, named `<prefix>-00001.csv`, ...
+
+    The rows are deduplicated by uid, the last row of a uid is kept, as `insert_many` would do
+    by updating the node with each row in turn. The rows are streamed: the uids are held in memory,
+    and the files are rewritten without the superseded rows when some uids are duplicated.
+
+    Args:
+        rows (Iterable[dict[str, Any]]): the properties of the nodes, `uid` included
+        directory (str | Path): the directory of the files, created if it does not exist
+        prefix (str): the prefix of the file names, e.g. the label of the nodes
+        chunk_size (int, optional): the number of rows per file. Defaults to `DEFAULT_CHUNK_SIZE`.
+
+    Returns:
+        list[Path]: the paths of the files written, in order
+    """
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths: list[Path] = []
+
+    # the position of the last row of each uid
+    last_rows: dict[str, int] = {}
+    position = 0
+
+    writer = None
+    staging_file = None
+    count = 0
+
+    try:
+
+        for row in rows:
+
+            uid = row.get("uid")
+
+            if uid is None:
+                continue
+
+            last_rows[uid] = position
+            position += 1
+
+            if writer is None or count >= chunk_size:
+
+                if staging_file is not None:
+                    staging_file.close()
+
+                path = directory / f"{prefix}-{len(paths) + 1:05d}.csv"
+                paths.append(path)
+
+                staging_file = open(path, "w", newline="", encoding="utf-8")
+                writer = csv.writer(staging_file)
+                writer.writerow(STAGING_HEADER)
+                count = 0
+
+            writer.writerow((uid, orjson.dumps(row).decode()))
+            count += 1
+
+    finally:
+        if staging_file is not None:
+            staging_file.close()
+
+    if len(last_rows) < position:
+        paths = _drop_superseded_rows(paths, last_rows)
+
+    return paths
+
+
+def _drop_superseded_rows(paths: list[Path], last_rows: dict[str, int]) -> list[Path]:
+    """rewrites the staging files with the last row of each uid only, the files left empty are removed
+
+    Returns:
+        list[Path]: the paths of the files left, in order
+    """
+
+    kept_paths: list[Path] = []
+    position = 0
+
+    for path in paths:
+
+        with open(path, newline="", encoding="utf-8") as staging_file:
+            rows = list(csv.reader(staging_file))[1:]
+
+        kept_rows = []
+
+        for row in rows:
+            if last_rows[row[0]] == position:
+                kept_rows.append(row)
+            position += 1
+
+        if not kept_rows:
+            path.unlink()
+            continue
+
+        with open(path, "w", newline="", encoding="utf-8") as staging_file:
+            writer = csv.writer(staging_file)
+            writer.writerow(STAGING_HEADER)
+            writer.writerows(kept_rows)
+
+        kept_paths.append(path)
+
+    return kept_paths
+
+
+def load_csv_query(label: str, path: str) -> str:
+    """the query creating the nodes of a staging file, and returning their count
+
+    The path is inlined as a string literal, as expected by `LOAD CSV`;
+    the JSON properties are parsed by `convert.str2object` of Memgraph MAGE.
+    """
+
+    return f"""
+        LOAD CSV FROM {json.dumps(path)} WITH HEADER AS row
+        CREATE (n:{label} {{uid: row.uid}})
+        SET n += convert.str2object(row.doc)
+        RETURN count(n) AS count;
+        """
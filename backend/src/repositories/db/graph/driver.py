@@ -0,0 +1,80 @@
+import atexit
+import os
+import threading
+
+from neo4j import Driver, GraphDatabase
+
+# the default number of connections opened by a process to the graph DB
+DEFAULT_MAX_CONNECTIONS = 50
+
+# the number of seconds to wait for a connection when all the connections of the pool are in use
+CONNECTION_ACQUISITION_TIMEOUT = 20
+
+# the number of seconds a pooled connection may stay idle before it is checked before being used
+DEFAULT_LIVENESS_CHECK_TIMEOUT = 60
+
+# the drivers are shared by all the repositories of the process, whatever the task they run in;
+# a driver cannot be used in a forked process, the process ID is stored along with the driver
+_drivers: dict[tuple[str, int, float | None], tuple[int, Driver]] = {}
+_drivers_lock = threading.Lock()
+
+
+def get_driver(
+    graphdb_uri: str,
+    max_connections: int | None = None,
+    liveness_check_timeout: float | None = DEFAULT_LIVENESS_CHECK_TIMEOUT,
+) -> Driver:
+    """returns the driver of the current process for the given URI
+
+    Drivers cannot be serialized, we cannot share them across tasks and store them as an attribute of the repositories,
+        thus a single driver is created lazily per URI in each process, and reused by every repository connecting to that URI.
+        The connectivity is verified once, when the driver is created;
+        then each session borrows a connection from the pool of the driver.
+
+    Args:
+        graphdb_uri (str): the URI of the graph DB
+        max_connections (int | None, optional): the maximum number of connections of the pool,
+            when all of them are in use the sessions wait for a connection to be released.
+            Defaults to `DEFAULT_MAX_CONNECTIONS`.
+        liveness_check_timeout (float | None, optional): the number of seconds a connection may stay idle
+            before being checked when borrowed, None to never check. Defaults to `DEFAULT_LIVENESS_CHECK_TIMEOUT`.
+    """
+
+    max_connections = max_connections or DEFAULT_MAX_CONNECTIONS
+    key = (graphdb_uri, max_connections, liveness_check_timeout)
+
+    with _drivers_lock:
+
+        pid, driver = _drivers.get(key, (None, None))
+
+        if driver is None or pid != os.getpid():
+
+            driver = GraphDatabase.driver(
+                graphdb_uri,
+                auth=("", ""),
+                max_connection_pool_size=max_connections,
+                connection_acquisition_timeout=CONNECTION_ACQUISITION_TIMEOUT,
+                liveness_check_timeout=liveness_check_timeout,
+            )
+
+            try:
+                driver.verify_connectivity()
+            except Exception:
+                driver.close()
+                raise
+
+            _drivers[key] = (os.getpid(), driver)
+
+        return driver
+
+
+@atexit.register
+def close_drivers() -> None:
+    """closes the connections of the drivers created by the current process"""
+
+    with _drivers_lock:
+
+        for key, (pid, driver) in list(_drivers.items()):
+            if pid == os.getpid():
+                driver.close()
+            del _drivers[key]
@@ -1,9 +1,13 @@
+import hashlib
 import importlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator, Sequence
+from pathlib import Path
+from typing import Generator, Iterable, NamedTuple, Sequence
 
+import orjson
 from loguru import logger
-from neo4j import GraphDatabase, Session
+from neo4j import Session
 from pydantic import ValidationError
 
 from src.entities.composable import Composable
@@ -14,11 +18,47 @@ from src.entities.relationship import (
     StrongRelationship,
 )
 from src.exceptions import RelationshipError, StorageError
-from src.interfaces.storage import IRelationshipHandler
+from src.interfaces.storage import IBulkLoadableStorageHandler, IRelationshipHandler
+from src.repositories.db.graph.bulk import load_csv_query, write_staging_files
+from src.repositories.db.graph.driver import get_driver
 from src.settings import StorageSettings
 
+# the label of the nodes of the loose relationships (see `BaseRelationship.to_entity_type`)
+LOOSE_NODE_LABEL = "Unknown"
 
-class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
+# the property of the nodes storing the fingerprint of their other properties (see `insert_many`)
+FINGERPRINT_PROPERTY = "fingerprint"
+
+# the number of nodes read by each query of `scan`
+DEFAULT_SCAN_PAGE_SIZE = 500
+
+
+def fingerprint(properties: dict) -> str:
+    """a hash of the properties of a node, which changes when any of them changes"""
+
+    return hashlib.blake2b(
+        orjson.dumps(properties, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+class InsertCounts(NamedTuple):
+    """the number of contents stored by `insert_many`, detailed by status:
+    `created` and `updated` nodes were written, `unchanged` nodes were left as is
+    """
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """the number of contents stored, written or not"""
+        return self.created + self.updated + self.unchanged
+
+
+class AbstractMemGraph[T: Composable](
+    IRelationshipHandler[T], IBulkLoadableStorageHandler[T]
+):
     """
     Base class for MemoryGraph DB storage handler.
 
@@ -29,6 +69,9 @@ class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
     settings: StorageSettings
     entity_type: type[T]
 
+    # the properties of the nodes, besides the uid
+    properties: tuple[str, ...] = ()
+
     def __init__(
         self,
         settings: StorageSettings | None = None,
@@ -37,15 +80,14 @@ class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
 
     @contextmanager
     def client(self):
-        _client = GraphDatabase.driver(
+        """the driver shared by the process for the `graphdb_uri` (see `get_driver`),
+        it is not closed after use: the sessions borrow their connection from its pool
+        """
+        yield get_driver(
             str(self.settings.graphdb_uri),
-            auth=("", ""),
+            max_connections=self.settings.graphdb_max_connections,
+            liveness_check_timeout=self.settings.graphdb_liveness_check_timeout,
         )
-        try:
-            _client.verify_connectivity()
-            yield _client
-        finally:
-            _client.close()
 
     def __class_getitem__(cls, generic_type):
         """Called when the class is indexed with a type parameter.
@@ -60,38 +102,218 @@ class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
 
     def on_init(self):
 
+        # the nodes of the entities are matched by uid or permalink,
+        # the loose nodes are merged by label and title (see `add_relationships`)
+        indexes = (
+            f":{self.entity_type.__name__}(uid)",
+            f":{self.entity_type.__name__}(permalink)",
+            f":{LOOSE_NODE_LABEL}",
+            f":{LOOSE_NODE_LABEL}(title)",
+        )
+
         with self.client() as _client:
+
+            session: Session = _client.session()
+
+            with session:
+
+                for index in indexes:
+                    try:
+                        # create indexes if they do not exist
+                        session.run(f"CREATE INDEX ON {index};").consume()
+
+                    except Exception:
+                        logger.warning(
+                            f"Index {index} already exists or could not be created."
+                        )
+
+                logger.info(
+                    f"Indexes for '{self.entity_type.__name__}' ensured in MemoryGraphDB."
+                )
+
+    def bulk_load(self, contents: Iterable[T]) -> int:
+        """loads the contents into the graph DB when it contains no node of the entity type yet,
+        much faster than `insert_many` for a first-time population.
+
+        1. the contents are streamed into CSV staging files (see `write_staging_files`)
+        2. the DB is switched to the analytical storage mode and the indexes of the entity type are dropped
+        3. each staging file is loaded by a single `LOAD CSV` query
+        4. the transactional storage mode and the indexes are restored, even when the load fails
+
+        The storage mode is global to the DB: no other query should be running while the contents are loaded.
+        The staging files are written to `graphdb_staging_directory`,
+            which Memgraph reads from `graphdb_server_staging_directory` (e.g. a volume of its container).
+
+        Args:
+            contents (Iterable[T]): the contents to load, e.g. scanned from another storage
+
+        Raises:
+            StorageError: when the DB already contains nodes of the entity type or the load fails
+
+        Returns:
+            int: the number of nodes created
+        """
+
+        label = self.entity_type.__name__
+
+        with self.client() as _client:
+
+            records, _, _ = _client.execute_query(
+                f"MATCH (n:{label}) RETURN count(n) AS count;"
+            )
+
+            if records[0]["count"] > 0:
+                raise StorageError(
+                    f"'{label}' nodes are already stored, use `insert_many` to update them"
+                )
+
+            paths = write_staging_files(
+                rows=(self._to_row(content) for content in contents),
+                directory=self.settings.graphdb_staging_directory,
+                prefix=label,
+                chunk_size=self.settings.graphdb_bulk_load_chunk_size,
+            )
+
+            server_directory = (
+                self.settings.graphdb_server_staging_directory
+                or Path(self.settings.graphdb_staging_directory).resolve().as_posix()
+            )
+
+            count = 0
+
             try:
 
-                # create indexes if they do not exist
                 session: Session = _client.session()
+
                 with session:
-                    session.run(
-                        f"""
-                            CREATE INDEX ON :{self.entity_type.__name__}(uid);
-                            CREATE INDEX ON :{self.entity_type.__name__}(permalink);
-                            """
-                    )
-                    logger.info(
-                        f"Indexes for '{self.entity_type.__name__}' ensured in MemoryGraphDB."
-                    )
 
-            except Exception:
-                logger.warning(
-                    f"Index for {self.entity_type.__name__} already exists or could not be created."
-                )
+                    session.run("STORAGE MODE IN_MEMORY_ANALYTICAL;").consume()
+
+                    for index in (f":{label}(uid)", f":{label}(permalink)"):
+                        try:
+                            session.run(f"DROP INDEX ON {index};").consume()
+                        except Exception:
+                            logger.debug(f"Index {index} does not exist.")
+
+                    for path in paths:
+
+                        result = session.run(
+                            load_csv_query(label, f"{server_directory}/{path.name}")
+                        )
+                        count += result.single()["count"]
+
+                        logger.info(
+                            f"Loaded '{path.name}' into MemoryGraphDB, {count} '{label}' loaded so far."
+                        )
+
+            except Exception as e:
+                raise StorageError(f"Error bulk loading '{label}': {e}") from e
+
+            finally:
+
+                with _client.session() as session:
+                    session.run("STORAGE MODE IN_MEMORY_TRANSACTIONAL;").consume()
+
+                self.on_init()
+
+                for path in paths:
+                    path.unlink(missing_ok=True)
+
+        return count
+
+    def _to_row(self, content: T) -> dict:
+        """the properties of the node of a content, with their fingerprint"""
+
+        properties = self._to_properties(content)
+
+        return {**properties, FINGERPRINT_PROPERTY: fingerprint(properties)}
+
+    def _to_properties(self, content: T) -> dict:
+        """the properties of the node of a content, i.e. its uid and its `properties`"""
+
+        row = content.model_dump(
+            exclude_unset=True,
+            exclude_none=True,
+            mode="json",
+            by_alias=False,
+        )
+
+        return {
+            key: value
+            for key, value in row.items()
+            if key == "uid" or key in self.properties
+        }
 
     def insert_many(
         self,
-        contents: list[T],
-    ) -> int:
-        """
-        Flatten the composable objects to retain only the necessary fields
-        and insert them into the database.
+        contents: Sequence[T],
+    ) -> InsertCounts:
+        """only the `properties` of the contents are retained in the database,
+        along with their fingerprint (see `fingerprint`).
+
+        The fingerprints are compared in the same query as the writes:
+        the nodes whose fingerprint did not change are not written again.
+
+        NB: when storing in DB, serialization aliases are not used (useless for DB),
+        so the field names are the same as in the model definition.
+        This makes testing more robust.
+
+        Returns:
+            InsertCounts: the number of contents stored, detailed by created, updated and unchanged nodes
         """
-        raise NotImplementedError(
-            "This method should be overridden by subclasses to implement the insertion logic."
-        )
+
+        label = self.entity_type.__name__
+
+        try:
+
+            # deduplicate rows based on 'uid'
+            unique_rows = {row["uid"]: row for row in map(self._to_row, contents)}
+            rows = list(unique_rows.values())
+
+            assignments = ", ".join(
+                f"n.{name} = o.{name}"
+                for name in (*self.properties, FINGERPRINT_PROPERTY)
+            )
+
+            with self.client() as _client:
+
+                session: Session = _client.session()
+
+                with session:
+                    result = session.run(
+                        f"""
+                        UNWIND $rows AS o
+                        OPTIONAL MATCH (e:{label} {{uid: o.uid}})
+                        WITH o, CASE
+                            WHEN e IS NULL THEN 'created'
+                            WHEN e.{FINGERPRINT_PROPERTY} = o.{FINGERPRINT_PROPERTY} THEN 'unchanged'
+                            ELSE 'updated'
+                        END AS status
+                        FOREACH (_ IN CASE WHEN status = 'unchanged' THEN [] ELSE [1] END |
+                            MERGE (n:{label} {{uid: o.uid}})
+                            SET {assignments}
+                        )
+                        RETURN status, count(*) AS count;
+                        """,
+                        parameters={"rows": rows},
+                    )
+
+                    counts = {record["status"]: record["count"] for record in result}
+
+            counts = InsertCounts(
+                created=counts.get("created", 0),
+                updated=counts.get("updated", 0),
+                unchanged=counts.get("unchanged", 0),
+            )
+
+            logger.debug(f"Stored '{label}': {counts!r}")
+
+            return counts
+
+        except Exception as e:
+
+            logger.error(f"Error inserting '{label}': {e}")
+            return InsertCounts()
 
     def select(
         self,
@@ -114,13 +336,11 @@ class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
 
                 with session:
 
-                    result = session.run(
-                        f"""
+                    result = session.run(f"""
                         MATCH (n:{self.entity_type.__name__} {{uid: '{content_id}'}})
                         RETURN n
                         LIMIT 1;
-                        """
-                    )
+                        """)
 
                     doc = dict(result.fetch(1)[0].get("n"))
 
@@ -150,58 +370,95 @@ class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
             RelationshipError
         """
 
+        self.add_relationships([relationship])
+
+    def add_relationships(
+        self,
+        relationships: Sequence[BaseRelationship],
+    ) -> None:
+        """
+        adds several relationships in a single transaction,
+        the relationships are grouped by their types and kind (strong or loose),
+        each group is written by a single `UNWIND` query.
+
+        Args:
+            relationships (Sequence[BaseRelationship]): The relationships to add.
+
+        Raises:
+            RelationshipError
+        """
+
+        groups: dict[tuple[str, str, str, bool], list[dict[str, str]]] = {}
+
+        for relationship in relationships:
+
+            key = (
+                relationship.from_entity_type,
+                relationship.to_entity_type,
+                relationship.relation_type.value,
+                relationship.is_strong,
+            )
+
+            groups.setdefault(key, []).append(
+                {
+                    "from_uid": relationship.from_entity.uid,
+                    "to": (
+                        relationship.to_entity.uid
+                        if relationship.is_strong
+                        else relationship.to_title
+                    ),
+                }
+            )
+
+        if not groups:
+            return
+
         try:
             with self.client() as _client:
                 session: Session = _client.session()
 
-                with session:
+                with session, session.begin_transaction() as tx:
 
-                    if relationship.is_strong:
-
-                        session.run(
-                            f"""
-                            MATCH (c1:{relationship.from_entity_type} {{uid: $from_uid}}), (c2:{relationship.to_entity_type} {{uid: $to_uid}})
-                            MERGE (c1)-[r:{relationship.relation_type.value} {{is_strong: true}}]->(c2)
-                            RETURN r, c1, c2;
-                            """,
-                            parameters={
-                                "from_uid": relationship.from_entity.uid,
-                                "to_uid": relationship.to_entity.uid,
-                            },
-                        )
+                    for (
+                        from_type,
+                        to_type,
+                        relation_type,
+                        is_strong,
+                    ), rows in groups.items():
 
-                        logger.info(
-                            f"Stored strong relationship '{relationship.from_entity.uid}' -[{relationship.relation_type}]-> '{relationship.to_entity.uid}'."
-                        )
+                        if is_strong:
 
-                    else:
+                            tx.run(
+                                f"""
+                                UNWIND $rows AS row
+                                MATCH (c1:{from_type} {{uid: row.from_uid}}), (c2:{to_type} {{uid: row.to}})
+                                MERGE (c1)-[r:{relation_type} {{is_strong: true}}]->(c2);
+                                """,
+                                parameters={"rows": rows},
+                            ).consume()
 
-                        session.run(
-                            f"""
-                            MERGE (c2:{relationship.to_entity_type} {{title: $to_title}})
-                            """,
-                            parameters={"to_title": relationship.to_title},
-                        )
+                        else:
 
-                        _ = session.run(
-                            f"""
-                            MATCH (c1:{relationship.from_entity_type} {{uid: $from_uid}}), (c2:{relationship.to_entity_type} {{title: $to_title}})
-                            MERGE (c1)-[r:{relationship.relation_type.value} {{is_strong: false}}]->(c2)
-                            RETURN r, c1, c2;
-                            """,
-                            parameters={
-                                "from_uid": relationship.from_entity.uid,
-                                "to_title": relationship.to_title,
-                            },
-                        )
+                            tx.run(
+                                f"""
+                                UNWIND $rows AS row
+                                MERGE (c2:{to_type} {{title: row.to}})
+                                WITH c2, row
+                                MATCH (c1:{from_type} {{uid: row.from_uid}})
+                                MERGE (c1)-[r:{relation_type} {{is_strong: false}}]->(c2);
+                                """,
+                                parameters={"rows": rows},
+                            ).consume()
 
-                        logger.info(
-                            f"Stored loose relationship '{relationship.from_entity.uid}' -[{relationship.relation_type}]-> '{relationship.to_title}'."
-                        )
+                    tx.commit()
+
+                logger.info(
+                    f"Stored {len(relationships)} relationships in {len(groups)} queries."
+                )
 
         except Exception as e:
             raise RelationshipError(
-                f"Invalid relationship {relationship.model_dump()}: {e}"
+                f"Invalid relationships {[r.model_dump() for r in relationships]}: {e}"
             ) from e
 
     def get_related(
@@ -285,53 +542,86 @@ class AbstractMemGraph[T: Composable](IRelationshipHandler[T]):
 
         return []
 
-    def scan(self) -> Generator[tuple[str, T], None, None]:
+    def _fetch_page(self, last_uid: str, page_size: int) -> list[dict]:
+        """the nodes following `last_uid` in the order of their uid, in a single query
 
-        try:
+        Each call borrows its own session, so that the next page can be fetched by another thread.
+        """
 
-            with self.client() as _client:
+        with self.client() as _client:
 
-                _last_uid = ""
+            session: Session = _client.session()
 
-                while _last_uid is not None:
+            with session:
 
-                    try:
+                result = session.run(
+                    f"""
+                    MATCH (n:{self.entity_type.__name__})
+                    WHERE n.uid IS NOT NULL AND n.uid > $uid
+                    RETURN n
+                    ORDER BY n.uid ASC
+                    LIMIT $page_size;
+                    """,
+                    parameters={"uid": last_uid, "page_size": page_size},
+                )
+
+                return [dict(record.get("n")) for record in result]
 
-                        session: Session = _client.session()
+    def scan(
+        self,
+        page_size: int = DEFAULT_SCAN_PAGE_SIZE,
+        prefetch: bool = False,
+    ) -> Generator[tuple[str, T], None, None]:
+        """iterates over the nodes of the entity type, in the order of their uid
 
-                        with session:
+        The nodes are read by pages (keyset pagination on the uid), one query per page.
 
-                            result = session.run(
-                                f"""
-                                MATCH (n:{self.entity_type.__name__})
-                                WHERE n.uid IS NOT NULL AND n.uid > $uid
-                                RETURN n
-                                ORDER BY n.uid ASC
-                                LIMIT 1;
-                                """,
-                                parameters={"uid": _last_uid},
-                            )
+        Args:
+            page_size (int, optional): the number of nodes read by each query. Defaults to `DEFAULT_SCAN_PAGE_SIZE`.
+            prefetch (bool, optional): when True, the next page is fetched by a background thread
+                while the nodes of the current page are processed. Defaults to False.
+        """
 
-                            if not result.peek():
-                                # stop if no more results
-                                logger.debug(
-                                    f"No more '{self.entity_type.__name__}' found after UID '{_last_uid}'"
-                                )
-                                break
+        try:
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+
+                page = self._fetch_page("", page_size)
 
-                            doc = dict(result.fetch(1)[0].get("n"))
+                while page:
 
-                            _last_uid = doc.get("uid")
+                    last_uid = page[-1].get("uid")
 
-                            yield _last_uid, self.entity_type.model_validate(
+                    next_page: Future | None = (
+                        executor.submit(self._fetch_page, last_uid, page_size)
+                        if prefetch and len(page) == page_size
+                        else None
+                    )
+
+                    for doc in page:
+                        try:
+                            yield doc.get("uid"), self.entity_type.model_validate(
                                 doc, by_name=True
                             )
 
-                    except (IndexError, KeyError, ValidationError):
-                        logger.warning(
-                            f"No documents found for entity type '{self.entity_type.__name__}'"
-                        )
-                        continue
+                        except ValidationError as e:
+                            logger.warning(
+                                f"Invalid '{self.entity_type.__name__}' with UID '{doc.get('uid')}': {e}"
+                            )
+
+                    if len(page) < page_size:
+                        # the last page
+                        break
+
+                    page = (
+                        next_page.result()
+                        if next_page is not None
+                        else self._fetch_page(last_uid, page_size)
+                    )
+
+                logger.debug(
+                    f"No more '{self.entity_type.__name__}' found after the last page"
+                )
 
         except Exception as e:
 
@@ -0,0 +1,106 @@
+import threading
+from typing import Callable, Sequence
+
+import zstandard
+
+# marks the values compressed by the codec, an HTML content never starts with a null byte
+# so that the values stored before the compression was enabled are still read as plain text
+COMPRESSION_HEADER = b"\x00zstd\x00"
+
+# the size of the dictionaries trained from the stored contents, in bytes
+DEFAULT_DICTIONARY_SIZE = 112_640
+
+# the dictionaries are shared by all the handlers of the process, they are loaded once per ID
+_dictionaries: dict[tuple[str, int], zstandard.ZstdCompressionDict] = {}
+_dictionaries_lock = threading.Lock()
+
+
+def is_compressed(value: bytes) -> bool:
+    return value.startswith(COMPRESSION_HEADER)
+
+
+def get_dictionary_id(value: bytes) -> int:
+    """the ID of the dictionary the value was compressed with, 0 when compressed without dictionary"""
+
+    return zstandard.get_frame_parameters(value[len(COMPRESSION_HEADER) :]).dict_id
+
+
+def compress(
+    content: str,
+    dictionary: zstandard.ZstdCompressionDict | None = None,
+    level: int = 3,
+) -> bytes:
+    """compresses the content with zstd, prefixed by the `COMPRESSION_HEADER`"""
+
+    compressor = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+
+    return COMPRESSION_HEADER + compressor.compress(content.encode("utf-8"))
+
+
+def decompress(
+    value: bytes,
+    dictionary: zstandard.ZstdCompressionDict | None = None,
+) -> str:
+    """decompresses a value returned by `compress`, the values without header are returned as is
+
+    Args:
+        value (bytes): the stored value
+        dictionary (zstandard.ZstdCompressionDict | None, optional): the dictionary the value was compressed with,
+            see `get_dictionary_id`. Defaults to None.
+    """
+
+    if not is_compressed(value):
+        return value.decode("utf-8")
+
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+
+    return decompressor.decompress(value[len(COMPRESSION_HEADER) :]).decode("utf-8")
+
+
+def train_dictionary(
+    samples: Sequence[str],
+    dict_size: int = DEFAULT_DICTIONARY_SIZE,
+) -> zstandard.ZstdCompressionDict:
+    """trains a zstd dictionary from sample contents
+
+    Raises:
+        zstandard.ZstdError: when the samples are not enough to train a dictionary
+    """
+
+    return zstandard.train_dictionary(
+        dict_size, [sample.encode("utf-8") for sample in samples]
+    )
+
+
+def get_dictionary(
+    namespace: str,
+    dict_id: int,
+    load: Callable[[int], bytes | None],
+) -> zstandard.ZstdCompressionDict | None:
+    """returns the dictionary of the namespace with the given ID, loaded once per process
+
+    Args:
+        namespace (str): the namespace of the dictionary, e.g. the DSN and the namespace of the storage
+        dict_id (int): the ID of the dictionary
+        load (Callable[[int], bytes | None]): loads the raw dictionary from the storage when not loaded yet
+    """
+
+    if dict_id == 0:
+        return None
+
+    key = (namespace, dict_id)
+
+    with _dictionaries_lock:
+
+        dictionary = _dictionaries.get(key)
+
+        if dictionary is None:
+
+            data = load(dict_id)
+
+            if data is None:
+                return None
+
+            dictionary = _dictionaries[key] = zstandard.ZstdCompressionDict(data)
+
+        return dictionary
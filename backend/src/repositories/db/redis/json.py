@@ -1,30 +1,75 @@
 import hashlib
+import time
 from contextlib import contextmanager
+from itertools import batched
 from typing import Generator, Sequence
 
-import redis
 from loguru import logger
+from redis import ResponseError
 from redis.commands.json.path import Path
-from redis.commands.search.field import NumericField, TagField
+from redis.commands.search.aggregation import AggregateRequest
+from redis.commands.search.field import Field, NumericField, TagField
 from redis.commands.search.index_definition import IndexDefinition, IndexType
 from redis.commands.search.query import NumericFilter, Query
 
 from src.entities.composable import Composable
 from src.interfaces.storage import IStorageHandler
+from src.repositories.db.redis.membership import (
+    get_partition_buckets,
+    index_members,
+    scan_partition,
+    to_member,
+)
+from src.repositories.db.redis.pool import pooled_client
+from src.repositories.db.redis.projection import (
+    construct_partial,
+    from_json_paths,
+    to_json_paths,
+)
+
+# the maximum duration of the build of an index, before it is used anyway
+INDEX_BUILD_TIMEOUT = 600
+
+# the duration after which an idle cursor of `stream` is deleted by RediSearch, in seconds
+CURSOR_MAX_IDLE = 300
 
 
 class RedisJsonStorage[U: Composable](IStorageHandler[U]):
     """
     Dumps and loads JSON-serializable entities to/from redis-like databases.
     DB used must support the `redis` client's JSON commands.
+
+    The keys of the documents are indexed in a sorted set `<entity_type>-ids`, updated on insert and delete,
+    so that the documents are enumerated without walking the whole keyspace,
+    and split into disjoint partitions processed by independent workers (see `scan`).
+
+    `select`, `scan` and `query` accept a projection (`fields`), in which case only the given fields
+    of the documents are loaded (multi-path `JSON.GET`) and the entities are partial, built without validation
+    (see `projection.construct_partial`).
     """
 
     _index_name: str
     entity_type: type[U]
     redis_dsn: str
+    max_connections: int | None
+    batch_size: int
 
-    def __init__(self, redis_dsn: str):
+    def __init__(
+        self,
+        redis_dsn: str,
+        max_connections: int | None = None,
+        batch_size: int = 500,
+    ):
+        """
+        Args:
+            redis_dsn (str): the Redis DSN
+            max_connections (int | None, optional): the size of the connection pool shared by the handlers
+                connecting to `redis_dsn` in the process. Defaults to None.
+            batch_size (int, optional): the number of contents sent to Redis in a single round-trip. Defaults to 500.
+        """
         self.redis_dsn = redis_dsn
+        self.max_connections = max_connections
+        self.batch_size = batch_size
 
     def __class_getitem__(cls, generic_type):
         """Called when the class is indexed with a type parameter.
@@ -40,37 +85,116 @@ class RedisJsonStorage[U: Composable](IStorageHandler[U]):
 
     @contextmanager
     def client(self):
-        _client = redis.Redis.from_url(self.redis_dsn, decode_responses=True)
-        try:
+        with pooled_client(self.redis_dsn, self.max_connections) as _client:
             yield _client
-        finally:
-            _client.close()
+
+    def _get_ids_key(self) -> str:
+        """The Redis sorted set of the document keys, see `membership.to_member`."""
+        return f"{self.entity_type.__name__}-ids"
+
+    def _get_schema_key(self) -> str:
+        """The fingerprint of the schema of the index currently queried."""
+        return f"{self.entity_type.__name__}-idx-schema"
+
+    def _get_lock_key(self) -> str:
+        """Held by the process rebuilding the index."""
+        return f"{self.entity_type.__name__}-idx-lock"
+
+    def _schema(self) -> tuple[tuple[Field, ...], IndexDefinition]:
+        return (
+            (
+                TagField("$.permalink", as_name="permalink"),
+                NumericField(
+                    "$.uid_hash", as_name="uid_hash", sortable=True
+                ),  # used for sorting
+            ),
+            IndexDefinition(
+                prefix=[f"{self.entity_type.__name__}:"],
+                index_type=IndexType.JSON,
+            ),
+        )
+
+    def _schema_fingerprint(self) -> str:
+        """a hash of the definition of the index, which changes when the schema changes"""
+
+        fields, definition = self._schema()
+        args = [arg for field in fields for arg in field.redis_args()] + definition.args
+
+        return hashlib.sha1("|".join(map(str, args)).encode()).hexdigest()[:12]
 
     def on_init(self):
+        """Creates the search index, when its schema changed since it was created.
 
+        The index is queried through an alias (`<entity_type>:idx`), the index itself is versioned
+        by the fingerprint of its schema. When the schema changes, a new index is built by a single process
+        while the others keep querying the previous one, then the alias is swapped atomically
+        and the previous index is dropped, without the documents.
+        When there is no previous index, the other processes wait until the index is built,
+        or build it themselves if the lock of the build expires.
+
+        The keys of the documents stored before the keys were indexed are indexed once.
+        """
+
+        # the alias of the index
         self._index_name = f"{self.entity_type.__name__}:idx"
 
+        fingerprint = self._schema_fingerprint()
+
         with self.client() as _client:
 
             try:
-                # delete if existing
-                _client.ft(self._index_name).dropindex(delete_documents=False)
+                indexed = index_members(
+                    _client,
+                    self._get_ids_key(),
+                    match=f"{self.entity_type.__name__}:*",
+                    get_content_id=str,
+                    batch_size=self.batch_size,
+                )
+
+                if indexed is not None:
+                    logger.info(
+                        f"Indexed {indexed} keys of '{self.entity_type.__name__}'"
+                    )
+
             except Exception as e:
-                logger.warning(f"Error deleting index for Redis: {e}")
+                logger.warning(
+                    f"Error indexing the keys of '{self.entity_type.__name__}': {e}"
+                )
 
             try:
-                _client.ft(self._index_name).create_index(
-                    (
-                        TagField("$.permalink", as_name="permalink"),
-                        NumericField(
-                            "$.uid_hash", as_name="uid_hash", sortable=True
-                        ),  # used for sorting
-                    ),
-                    definition=IndexDefinition(
-                        prefix=[f"{self.entity_type.__name__}:"],
-                        index_type=IndexType.JSON,
-                    ),
-                )
+
+                deadline = time.monotonic() + INDEX_BUILD_TIMEOUT
+
+                while _client.get(self._get_schema_key()) != fingerprint:
+
+                    if _client.set(
+                        self._get_lock_key(),
+                        fingerprint,
+                        nx=True,
+                        ex=INDEX_BUILD_TIMEOUT,
+                    ):
+                        try:
+                            self._build_index(_client, fingerprint)
+                        finally:
+                            _client.delete(self._get_lock_key())
+                        break
+
+                    # the previous index is queried until the alias is swapped,
+                    # without index the queries must wait for the build of the other process
+                    if self._current_index(_client) is not None:
+                        logger.info(
+                            f"Index '{self._index_name}' is being built by another process"
+                        )
+                        break
+
+                    if time.monotonic() > deadline:
+                        logger.warning(
+                            f"Index '{self._index_name}' is still built by another process after {INDEX_BUILD_TIMEOUT}s"
+                        )
+                        break
+
+                    time.sleep(1)
+
             except Exception as e:
                 logger.warning(f"Error creating index for Redis: {e}")
 
@@ -78,6 +202,62 @@ class RedisJsonStorage[U: Composable](IStorageHandler[U]):
                 f"RedisJsonStorage[{self.entity_type.__name__}] connected to '{self.redis_dsn}'"
             )
 
+    def _current_index(self, _client) -> str | None:
+        """the name of the index behind the alias, None when there is no index"""
+
+        try:
+            return _client.ft(self._index_name).info()["index_name"]
+        except ResponseError:
+            return None
+
+    def _wait_for_indexing(self, _client, index_name: str) -> None:
+        """waits until the existing documents are indexed, so that the index returns complete results"""
+
+        deadline = time.monotonic() + INDEX_BUILD_TIMEOUT
+
+        while str(_client.ft(index_name).info().get("indexing", 0)) not in ("0", "0.0"):
+
+            if time.monotonic() > deadline:
+                logger.warning(
+                    f"Index '{index_name}' is still indexing after {INDEX_BUILD_TIMEOUT}s, it is used anyway"
+                )
+                return
+
+            time.sleep(1)
+
+    def _build_index(self, _client, fingerprint: str) -> None:
+
+        index_name = f"{self._index_name}:{fingerprint}"
+        fields, definition = self._schema()
+
+        try:
+            _client.ft(index_name).create_index(fields, definition=definition)
+        except ResponseError as e:
+            # a previous build was interrupted before swapping the alias
+            logger.warning(f"Index '{index_name}' not created: {e}")
+
+        self._wait_for_indexing(_client, index_name)
+
+        previous = self._current_index(_client)
+
+        if previous is None:
+            _client.ft(index_name).aliasadd(self._index_name)
+
+        elif previous == self._index_name:
+            # the index was not versioned yet, its name must be released for the alias
+            _client.ft(previous).dropindex(delete_documents=False)
+            _client.ft(index_name).aliasadd(self._index_name)
+
+        else:
+            _client.ft(index_name).aliasupdate(self._index_name)
+
+        if previous is not None and previous not in (index_name, self._index_name):
+            _client.ft(previous).dropindex(delete_documents=False)
+
+        _client.set(self._get_schema_key(), fingerprint)
+
+        logger.info(f"Index '{self._index_name}' now points to '{index_name}'")
+
     def _get_uid_hash(self, content: U) -> int:
         """Generates a numeric hash for the UID of the content.
 
@@ -103,38 +283,124 @@ class RedisJsonStorage[U: Composable](IStorageHandler[U]):
 
             try:
 
-                data = content.model_dump(mode="json")
-                data["uid_hash"] = self._get_uid_hash(
-                    content
-                )  # Store the hash for sorting
-
                 # Store the content as a JSON object in Redis
-                _client.json().set(
+                pipe = _client.pipeline()
+                pipe.json().set(
                     content_id,
                     Path.root_path(),
-                    data,
+                    self._dump(content),
                 )
+                pipe.zadd(self._get_ids_key(), {to_member(content_id): 0})
+                pipe.execute()
 
             except Exception as e:
                 logger.error(f"Error saving '{content_id}': {e}")
 
+    def _dump(self, content: U) -> dict:
+        data = content.model_dump(mode="json")
+        data["uid_hash"] = self._get_uid_hash(content)  # Store the hash for sorting
+        return data
+
     def insert_many(
         self,
         contents: Sequence[U],
-    ) -> None:
+    ) -> int:
+        """Saves the contents by batches of `batch_size`, each batch in a single round-trip.
+
+        A content which cannot be saved is logged and skipped, the other contents are saved anyway.
+
+        Returns:
+            int: the number of contents saved
+        """
+
+        saved = 0
+
+        with self.client() as _client:
+
+            for batch in batched(contents, self.batch_size):
+
+                pipe = _client.pipeline(transaction=False)
+                content_ids: list[str] = []
+
+                for content in batch:
+                    try:
+                        pipe.json().set(
+                            content.uid, Path.root_path(), self._dump(content)
+                        )
+                        pipe.zadd(self._get_ids_key(), {to_member(content.uid): 0})
+                        content_ids.append(content.uid)
+                    except Exception as e:
+                        logger.error(f"Error saving '{content.uid}': {e}")
+
+                try:
+                    results = pipe.execute(raise_on_error=False)
+                except Exception as e:
+                    logger.error(f"Error saving {len(content_ids)} contents: {e}")
+                    continue
+
+                # each content is saved with 2 commands, the document and its key
+                for content_id, *content_results in zip(
+                    content_ids, results[::2], results[1::2]
+                ):
+                    error = next(
+                        (r for r in content_results if isinstance(r, Exception)),
+                        None,
+                    )
+                    if error is not None:
+                        logger.error(f"Error saving '{content_id}': {error}")
+                    else:
+                        saved += 1
+
+        return saved
+
+    def _get_projections(
+        self,
+        _client,
+        keys: Sequence[str],
+        fields: Sequence[str],
+    ) -> list[dict | None]:
+        """loads the fields of the documents in a single round-trip,
+        a document which does not exist is None
+        """
+
+        paths = to_json_paths(fields)
+
+        pipe = _client.pipeline(transaction=False)
+        for key in keys:
+            pipe.json().get(key, *paths)
 
-        for content in contents:
-            self.insert(content_id=content.uid, content=content)
+        return [
+            from_json_paths(values) if isinstance(values, dict) else None
+            for values in pipe.execute()
+        ]
 
     def select(
         self,
         content_id: str,
+        fields: Sequence[str] | None = None,
     ) -> U | None:
+        """
+        Args:
+            content_id (str): the key of the document
+            fields (Sequence[str] | None, optional): the fields to load, e.g. `["specifications.directed_by"]`,
+                the entity returned is partial. Defaults to None, i.e. all the fields.
+        """
 
         with self.client() as _client:
 
             try:
 
+                if fields is not None:
+                    body = self._get_projections(_client, [content_id], fields)[0]
+
+                    if not body:
+                        logger.warning(
+                            f"JSON Content '{content_id}' not found in Redis."
+                        )
+                        return None
+
+                    return construct_partial(self.entity_type, body)
+
                 # Load the content as a JSON object from Redis
                 body = _client.json().get(content_id, Path.root_path())
 
@@ -149,49 +415,120 @@ class RedisJsonStorage[U: Composable](IStorageHandler[U]):
                 logger.error(f"Error loading '{content_id}': {e}")
                 return None
 
-    def scan(self) -> Generator[tuple[str, U], None, None]:
+    def scan(
+        self,
+        count: int = 1000,
+        batch_size: int | None = None,
+        partition: int = 0,
+        num_partitions: int = 1,
+        fields: Sequence[str] | None = None,
+    ) -> Generator[tuple[str, U], None, None]:
         """Scans the persistent storage and iterates over contents.
 
+        The keys are read from the index of the storage by batches, the documents of each batch
+        are loaded in a single round-trip (`JSON.MGET`, or pipelined `JSON.GET` for a projection)
+        and yielded one by one.
+
+        The storage can be split into `num_partitions` disjoint partitions, so that N workers
+        each process a partition without coordinating.
+
+        Args:
+            count (int, optional): the number of keys examined by each `SCAN` call,
+                when the keys of the storage are not indexed yet. Defaults to 1000.
+            batch_size (int | None, optional): the maximum number of contents loaded at once.
+                Defaults to the `batch_size` of the storage.
+            partition (int, optional): the partition to scan. Defaults to 0.
+            num_partitions (int, optional): the number of partitions. Defaults to 1, i.e. all the documents.
+            fields (Sequence[str] | None, optional): the fields to load, e.g. `["specifications.directed_by"]`,
+                the entities yielded are partial. Defaults to None, i.e. all the fields.
+
+        Raises:
+            ValueError: when the partition does not exist
+
         Returns:
             Generator[tuple[str, U], None, None]: a generator of documents of type U
                 with their storage key as first element of the tuple.
         """
 
+        get_partition_buckets(partition, num_partitions)
+
         with self.client() as _client:
 
             try:
 
-                for key in _client.scan_iter(match=f"{self.entity_type.__name__}:*"):
+                for keys in scan_partition(
+                    _client,
+                    self._get_ids_key(),
+                    match=f"{self.entity_type.__name__}:*",
+                    get_content_id=str,
+                    partition=partition,
+                    num_partitions=num_partitions,
+                    count=count,
+                    batch_size=batch_size or self.batch_size,
+                ):
+                    yield from self._load_documents(_client, keys, fields)
 
-                    try:
-                        data = _client.json().get(key, Path.root_path())
-                        data.pop("uid_hash", None)  # Remove the hash field if it exists
-                        yield key, self.entity_type.model_validate(data, by_name=True)
+            except Exception as e:
+                logger.error(f"Error scanning redis: {e}")
+                return
 
-                    except Exception as e:
-                        logger.error(f"Error parsing JSON from key '{key}': {e}")
-                        continue
+    def _load_documents(
+        self,
+        _client,
+        keys: Sequence[str],
+        fields: Sequence[str] | None = None,
+    ) -> Generator[tuple[str, U], None, None]:
+        """loads the documents in a single round-trip, the documents which cannot be parsed are skipped"""
+
+        if fields is not None:
+            documents = self._get_projections(_client, keys, fields)
+        else:
+            documents = _client.json().mget(keys, Path.root_path())
+
+        for key, data in zip(keys, documents):
+
+            if not data:
+                # the key was deleted since it was scanned
+                continue
+
+            try:
+                if fields is not None:
+                    yield key, construct_partial(self.entity_type, data)
+                    continue
+
+                data.pop("uid_hash", None)  # Remove the hash field if it exists
+                yield key, self.entity_type.model_validate(data, by_name=True)
 
             except Exception as e:
-                raise StopIteration from e
+                logger.error(f"Error parsing JSON from key '{key}': {e}")
+                continue
+
+    def _get_query_string(self, permalink: str | None = None) -> str:
+        if permalink is not None:
+            return f"@permalink:{{'{permalink}'}}"
+
+        return "*"
 
     def query(
         self,
         permalink: str | None = None,
         limit: int = 100,
         after: U | None = None,
+        fields: Sequence[str] | None = None,
         **kwargs,
     ) -> Sequence[U]:
         """
         @see: https://redis.io/docs/latest/develop/clients/redis-py/queryjson/
+
+        The results are sorted by `uid_hash` on each call and paged after the hash of `after`,
+        to page through many results, prefer `stream`.
+
+        When `fields` is given, the search returns the keys of the documents only,
+        then the fields of the documents are loaded in a single round-trip, the entities returned are partial.
         """
 
         with self.client() as _client:
-            if permalink is not None:
-                q = f"@permalink:{{'{permalink}'}}"
-
-            else:
-                q = "*"
+            q = self._get_query_string(permalink)
 
             if after:
                 min_uid = self._get_uid_hash(after)
@@ -211,15 +548,123 @@ class RedisJsonStorage[U: Composable](IStorageHandler[U]):
                     "RedisJsonStorage not initialized. Call on_init() before querying."
                 )
 
-            results = _client.ft(self._index_name).search(
-                query.paging(0, limit).sort_by("uid_hash", asc=True)
-            )
+            query = query.paging(0, limit).sort_by("uid_hash", asc=True)
+
+            if fields is not None:
+
+                results = _client.ft(self._index_name).search(query.no_content())
+                keys = [doc.id for doc in results.docs][:limit]
+
+                return [
+                    construct_partial(self.entity_type, data)
+                    for data in self._get_projections(_client, keys, fields)
+                    if data
+                ]
+
+            results = _client.ft(self._index_name).search(query)
 
             return [
                 self.entity_type.model_validate_json(doc.json, by_name=True)
                 for doc in results.docs
             ][:limit]
 
+    def stream(
+        self,
+        permalink: str | None = None,
+        chunk_size: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Generator[list[U], None, None]:
+        """Streams the documents matching the query by chunks, with a RediSearch cursor
+        (`FT.AGGREGATE ... WITHCURSOR`).
+
+        Unlike `query`, the results are not sorted: each chunk costs the same whatever its position,
+        and no document is skipped when the hashes of their uids collide.
+        The cursor is deleted when the iteration stops before the end.
+
+        `stream` is meant for the reads filtered by the search index;
+        the full reads of the storage (e.g. the storage flow, the bulk load) iterate with `scan`,
+        which reads the ID index without depending on RediSearch and can be split into partitions.
+
+        Example:
+        ```python
+            for movies in storage.stream(chunk_size=1000, fields=["specifications.directed_by"]):
+                export(movies)
+        ```
+
+        Args:
+            permalink (str | None, optional): the permalink of the documents. Defaults to None, i.e. all the documents.
+            chunk_size (int | None, optional): the number of documents of each chunk.
+                Defaults to the `batch_size` of the storage.
+            fields (Sequence[str] | None, optional): the fields to load, the entities are partial.
+                Defaults to None, i.e. all the fields.
+
+        Returns:
+            Generator[list[U], None, None]: a generator of chunks of documents
+        """
+
+        if not hasattr(self, "_index_name"):
+            raise RuntimeError(
+                "RedisJsonStorage not initialized. Call on_init() before querying."
+            )
+
+        request = (
+            AggregateRequest(self._get_query_string(permalink))
+            .load("@__key")
+            .cursor(count=chunk_size or self.batch_size, max_idle=CURSOR_MAX_IDLE)
+        )
+
+        with self.client() as _client:
+
+            index = _client.ft(self._index_name)
+            result = index.aggregate(request)
+
+            try:
+
+                while True:
+
+                    keys = [
+                        row[row.index("__key") + 1]
+                        for row in result.rows
+                        if "__key" in row
+                    ]
+
+                    if keys:
+                        yield [
+                            document
+                            for _, document in self._load_documents(
+                                _client, keys, fields
+                            )
+                        ]
+
+                    if result.cursor is None or result.cursor.cid == 0:
+                        break
+
+                    result = index.aggregate(result.cursor)
+
+            finally:
+
+                if result.cursor is not None and result.cursor.cid != 0:
+                    try:
+                        _client.execute_command(
+                            "FT.CURSOR", "DEL", self._index_name, result.cursor.cid
+                        )
+                    except Exception as e:
+                        logger.warning(f"Error deleting the cursor: {e}")
+
+    def delete(self, content_id: str) -> None:
+        """Deletes the document and its key from the index."""
+
+        with self.client() as _client:
+
+            try:
+                pipe = _client.pipeline()
+                pipe.delete(content_id)
+                pipe.zrem(self._get_ids_key(), to_member(content_id))
+                pipe.execute()
+
+            except Exception as e:
+                logger.error(f"Error deleting '{content_id}': {e}")
+
     def update(
         self,
         content: U,
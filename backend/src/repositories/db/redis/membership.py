@@ -0,0 +1,194 @@
+import zlib
+from typing import Callable, Generator
+
+import redis
+
+from src.repositories.db.redis.scan import scan_keys
+
+# the content IDs are spread over a fixed number of buckets, the partitions are ranges of buckets
+# so that any number of partitions up to `PARTITION_BUCKETS` splits the contents evenly
+PARTITION_BUCKETS = 4096
+
+# the width of the hexadecimal bucket prefixing each member of the index
+_BUCKET_WIDTH = 3
+
+
+def _index_marker(key: str) -> str:
+    """the key set once the contents stored before the index was maintained are indexed"""
+
+    return f"{key}-indexed"
+
+
+def get_bucket(content_id: str) -> int:
+    """the bucket of the content ID, stable across processes and machines"""
+
+    return zlib.crc32(content_id.encode("utf-8")) % PARTITION_BUCKETS
+
+
+def to_member(content_id: str) -> str:
+    """the member of the index for the content ID, prefixed by its bucket
+    so that the members of a partition are a lexicographical range of the index
+    """
+
+    return f"{get_bucket(content_id):0{_BUCKET_WIDTH}x}:{content_id}"
+
+
+def from_member(member: str | bytes) -> str:
+    """the content ID of a member of the index"""
+
+    if isinstance(member, bytes):
+        member = member.decode("utf-8")
+
+    return member[_BUCKET_WIDTH + 1 :]
+
+
+def get_partition_buckets(partition: int, num_partitions: int) -> range:
+    """the buckets of the partition, the partitions are disjoint and cover all the buckets
+
+    Raises:
+        ValueError: when the partition does not exist
+    """
+
+    if not 0 < num_partitions <= PARTITION_BUCKETS:
+        raise ValueError(
+            f"The number of partitions must be between 1 and {PARTITION_BUCKETS}, got {num_partitions}"
+        )
+
+    if not 0 <= partition < num_partitions:
+        raise ValueError(
+            f"The partition must be between 0 and {num_partitions - 1}, got {partition}"
+        )
+
+    return range(
+        partition * PARTITION_BUCKETS // num_partitions,
+        (partition + 1) * PARTITION_BUCKETS // num_partitions,
+    )
+
+
+def scan_members(
+    client: redis.Redis,
+    key: str,
+    partition: int = 0,
+    num_partitions: int = 1,
+    batch_size: int = 500,
+) -> Generator[list[str], None, None]:
+    """iterates over the content IDs of a partition of the index, by batches of at most `batch_size` IDs
+
+    The index is a sorted set whose members all have the same score, the members are read
+    by lexicographical ranges (`ZRANGEBYLEX`), each batch starting after the last member of the previous one.
+
+    Args:
+        client (redis.Redis): the Redis client
+        key (str): the key of the index
+        partition (int, optional): the partition to iterate over. Defaults to 0.
+        num_partitions (int, optional): the number of partitions the index is split into. Defaults to 1.
+        batch_size (int, optional): the maximum number of IDs of each batch. Defaults to 500.
+    """
+
+    buckets = get_partition_buckets(partition, num_partitions)
+
+    start = f"[{buckets.start:0{_BUCKET_WIDTH}x}:"
+    stop = (
+        f"({buckets.stop:0{_BUCKET_WIDTH}x}:"
+        if buckets.stop < PARTITION_BUCKETS
+        else "+"
+    )
+
+    while True:
+
+        members = client.zrangebylex(key, start, stop, start=0, num=batch_size)
+
+        if not members:
+            break
+
+        yield [from_member(member) for member in members]
+
+        if len(members) < batch_size:
+            break
+
+        last = members[-1]
+        start = "(" + (last.decode("utf-8") if isinstance(last, bytes) else last)
+
+
+def scan_partition(
+    client: redis.Redis,
+    key: str,
+    match: str,
+    get_content_id: Callable[[str | bytes], str],
+    partition: int = 0,
+    num_partitions: int = 1,
+    count: int = 1000,
+    batch_size: int = 500,
+) -> Generator[list[str], None, None]:
+    """iterates over the content IDs of a partition, by batches of at most `batch_size` IDs
+
+    The IDs are read from the index once it is complete, i.e. once the contents stored before the index
+    was maintained are indexed (see `index_members`). Otherwise, the keys matching the pattern are scanned
+    and the IDs out of the partition are skipped.
+
+    Args:
+        client (redis.Redis): the Redis client
+        key (str): the key of the index
+        match (str): the pattern of the keys of the contents, e.g. `Movie:*`
+        get_content_id (Callable[[str | bytes], str]): extracts the content ID from a key
+        partition (int, optional): the partition to iterate over. Defaults to 0.
+        num_partitions (int, optional): the number of partitions. Defaults to 1.
+        count (int, optional): the number of keys examined by each `SCAN` call. Defaults to 1000.
+        batch_size (int, optional): the maximum number of IDs of each batch. Defaults to 500.
+    """
+
+    buckets = get_partition_buckets(partition, num_partitions)
+
+    if client.exists(_index_marker(key)):
+        yield from scan_members(
+            client,
+            key,
+            partition=partition,
+            num_partitions=num_partitions,
+            batch_size=batch_size,
+        )
+        return
+
+    for keys in scan_keys(client, match=match, count=count, batch_size=batch_size):
+
+        content_ids = [
+            content_id
+            for content_id in map(get_content_id, keys)
+            if num_partitions == 1 or get_bucket(content_id) in buckets
+        ]
+
+        if content_ids:
+            yield content_ids
+
+
+def index_members(
+    client: redis.Redis,
+    key: str,
+    match: str,
+    get_content_id: Callable[[str | bytes], str],
+    count: int = 1000,
+    batch_size: int = 500,
+) -> int | None:
+    """adds the content IDs of the keys matching the pattern to the index,
+    for the contents stored before the index was maintained.
+
+    It is done once, a marker `<key>-indexed` is set when all the keys are indexed.
+
+    Returns:
+        int | None: the number of keys indexed, None when the keys were already indexed
+    """
+
+    marker = _index_marker(key)
+
+    if client.exists(marker):
+        return None
+
+    indexed = 0
+
+    for keys in scan_keys(client, match=match, count=count, batch_size=batch_size):
+        client.zadd(key, {to_member(get_content_id(k)): 0 for k in keys})
+        indexed += len(keys)
+
+    client.set(marker, 1)
+
+    return indexed
@@ -0,0 +1,100 @@
+import threading
+from contextlib import contextmanager
+from typing import Generator
+
+import redis
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+
+# the default number of connections opened by a process to a Redis server
+DEFAULT_MAX_CONNECTIONS = 50
+
+# the number of seconds to wait for a connection when all the connections of the pool are in use
+POOL_TIMEOUT = 20
+
+# the number of attempts of a command when its connection was closed,
+# pooled connections may have been closed by the server since they were released to the pool
+CONNECTION_RETRIES = 3
+
+# the pools are shared by all the handlers of the process, whatever the task they run in;
+# redis-py resets a pool when it is used in a forked process, so the registry is fork-safe
+_pools: dict[tuple[str, int, bool, bool], redis.ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(
+    redis_dsn: str,
+    max_connections: int | None = None,
+    decode_responses: bool = True,
+    retry: bool = True,
+) -> redis.ConnectionPool:
+    """returns the connection pool of the current process for the given DSN
+
+    Connection pools cannot be serialized, we cannot share them across tasks and store them as an attribute of the handlers,
+        thus a single pool is created lazily per DSN in each process, and reused by every handler connecting to that DSN.
+
+    Args:
+        redis_dsn (str): the Redis DSN
+        max_connections (int | None, optional): the maximum number of connections of the pool,
+            when all of them are in use the clients wait for a connection to be released.
+            Defaults to `DEFAULT_MAX_CONNECTIONS`.
+        decode_responses (bool, optional): False to read the responses as bytes. Defaults to True.
+        retry (bool, optional): False not to send a command again when its connection is lost,
+            for the commands which are not idempotent (e.g. `HINCRBY`): the server may have run the command
+            before the connection was lost. Defaults to True.
+    """
+
+    max_connections = max_connections or DEFAULT_MAX_CONNECTIONS
+    key = (redis_dsn, max_connections, decode_responses, retry)
+
+    with _pools_lock:
+
+        pool = _pools.get(key)
+
+        if pool is None:
+            pool = _pools[key] = redis.BlockingConnectionPool.from_url(
+                redis_dsn,
+                max_connections=max_connections,
+                timeout=POOL_TIMEOUT,
+                decode_responses=decode_responses,
+                **(
+                    {
+                        "retry": Retry(ExponentialBackoff(), CONNECTION_RETRIES),
+                        "retry_on_error": [redis.ConnectionError],
+                    }
+                    if retry
+                    else {}
+                ),
+            )
+
+        return pool
+
+
+@contextmanager
+def pooled_client(
+    redis_dsn: str,
+    max_connections: int | None = None,
+    decode_responses: bool = True,
+    retry: bool = True,
+) -> Generator[redis.Redis, None, None]:
+    """a Redis client borrowing its connections from the pool of the process for the given DSN,
+    see `get_connection_pool` for the arguments
+
+    Example:
+    ```python
+        with pooled_client("redis://localhost:6379/0") as _client:
+            _client.get("key")
+        # the connection is back in the pool, not closed
+    ```
+    """
+
+    _client = redis.Redis(
+        connection_pool=get_connection_pool(
+            redis_dsn, max_connections, decode_responses, retry
+        )
+    )
+    try:
+        yield _client
+    finally:
+        # releases the connections of the client to the pool, the pool is not disconnected
+        _client.close()
@@ -0,0 +1,84 @@
+from typing import Any, Sequence, get_args
+
+from pydantic import BaseModel
+
+# the fields always loaded, which identify the entity
+IDENTITY_FIELDS = ("uid", "title", "permalink")
+
+
+def to_json_paths(fields: Sequence[str]) -> list[str]:
+    """the JSONPaths of the projected fields, the identity fields included
+
+    Args:
+        fields (Sequence[str]): the fields, nested fields are separated by a dot, e.g. `specifications.directed_by`
+    """
+
+    paths = dict.fromkeys(f"$.{field}" for field in (*IDENTITY_FIELDS, *fields))
+
+    return list(paths)
+
+
+def from_json_paths(values: dict[str, list[Any]]) -> dict[str, Any]:
+    """the nested dict of the values returned by a multi-path `JSON.GET`,
+    the paths which do not match any value are omitted
+    """
+
+    data: dict[str, Any] = {}
+
+    for path, matches in values.items():
+
+        if not matches:
+            continue
+
+        *parents, name = path.removeprefix("$.").split(".")
+
+        node = data
+        for parent in parents:
+            node = node.setdefault(parent, {})
+
+        node[name] = matches[0]
+
+    return data
+
+
+def _model_of(annotation: Any) -> type[BaseModel] | None:
+    """the model of a field annotation, e.g. `Influences` for `list[Influences] | None`"""
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    for arg in get_args(annotation):
+        model = _model_of(arg)
+        if model is not None:
+            return model
+
+    return None
+
+
+def _construct_value(annotation: Any, value: Any) -> Any:
+
+    if isinstance(value, list):
+        return [_construct_value(annotation, item) for item in value]
+
+    if isinstance(value, dict):
+        model = _model_of(annotation)
+        if model is not None:
+            return construct_partial(model, value)
+
+    return value
+
+
+def construct_partial[M: BaseModel](model: type[M], data: dict[str, Any]) -> M:
+    """builds a model from a subset of its fields, without validating it
+
+    The fields missing from `data` keep their default value, the nested models are built the same way.
+    The model is meant to be read only: as its required fields may be missing, it may not be serialized.
+    """
+
+    values = {
+        name: _construct_value(model.model_fields[name].annotation, value)
+        for name, value in data.items()
+        if name in model.model_fields
+    }
+
+    return model.model_construct(_fields_set=set(values), **values)
@@ -0,0 +1,36 @@
+from itertools import batched
+from typing import Generator
+
+import redis
+
+
+def scan_keys(
+    client: redis.Redis,
+    match: str,
+    count: int,
+    batch_size: int,
+) -> Generator[list[str], None, None]:
+    """iterates over the keys matching the pattern, by batches of at most `batch_size` keys
+
+    The keys of each SCAN page are yielded as soon as the page is received,
+    so that their values can be fetched in a single round-trip (`MGET`, `JSON.MGET`)
+    instead of one round-trip per key.
+
+    Args:
+        client (redis.Redis): the Redis client
+        match (str): the pattern of the keys, e.g. `Movie:*`
+        count (int): the number of keys examined by each SCAN call
+        batch_size (int): the maximum number of keys of each batch
+    """
+
+    cursor = 0
+
+    while True:
+
+        cursor, keys = client.scan(cursor=cursor, match=match, count=count)
+
+        for batch in batched(keys, batch_size):
+            yield list(batch)
+
+        if cursor == 0:
+            break
@@ -1,24 +1,112 @@
 from contextlib import contextmanager
-from typing import Generator, Sequence
+from itertools import batched
+from pathlib import Path
+from typing import Generator, Literal, Sequence
 
 import redis
+import zstandard
 from loguru import logger
 
 from src.entities.composable import Composable
-from src.interfaces.storage import IStorageHandler
-
-
-class RedisTextStorage[U: Composable](IStorageHandler[str]):
+from src.interfaces.storage import IEvictableStorageHandler, IVersionedStorageHandler
+from src.repositories.db.archive import INDEX_FILENAME, SegmentArchive, get_archive
+from src.repositories.db.redis.compression import (
+    DEFAULT_DICTIONARY_SIZE,
+    compress,
+    decompress,
+    get_dictionary,
+    get_dictionary_id,
+    is_compressed,
+    train_dictionary,
+)
+from src.repositories.db.redis.membership import (
+    get_partition_buckets,
+    index_members,
+    scan_partition,
+    to_member,
+)
+from src.repositories.db.redis.pool import pooled_client
+from src.repositories.db.redis.scan import scan_keys
+
+# the default duration the processed contents are kept when they expire, in seconds
+DEFAULT_RETENTION_TTL = 7 * 24 * 3600
+
+
+class RedisTextStorage[U: Composable](
+    IVersionedStorageHandler[str], IEvictableStorageHandler[str]
+):
     """
     Stores raw text data in Redis.
     the keys are namespaced based on the generic type U.
+
+    The revision ids of the contents are stored next to them, in a hash `<namespace>-revisions`
+    which is not matched when scanning the contents.
+
+    The IDs of the contents are indexed in a sorted set `<namespace>-ids`, updated on insert and delete,
+    so that the contents are enumerated without walking the whole keyspace,
+    and split into disjoint partitions processed by independent workers (see `scan`).
+
+    When `compression` is enabled, the contents are compressed with zstd and the dictionary
+    trained from the stored contents (see `train_dictionary`). The dictionaries are stored in a hash `<namespace>-dictionaries`,
+    the ID of the dictionary used to compress new contents in `<namespace>-dictionary`.
+    The compressed values are marked by a header, so that the values stored without compression are still read,
+    whatever the `compression` of the storage.
+
+    The contents processed (see `evict`) are kept in Redis unless a `retention` policy is set:
+    either they expire after `retention_ttl` seconds, or they are moved to a local archive
+    (see `SegmentArchive`) in `<archive_directory>/<namespace>`. When an `archive_directory` is set,
+    the contents not found in Redis are read from the archive.
     """
 
     redis_dsn: str
+    max_connections: int | None
+    batch_size: int
+    compression: Literal["zstd"] | None
+    compression_level: int
+    retention: Literal["ttl", "archive"] | None
+    retention_ttl: int
+    archive_directory: str | None
     _namespace: str
 
-    def __init__(self, redis_dsn: str):
+    def __init__(
+        self,
+        redis_dsn: str,
+        max_connections: int | None = None,
+        batch_size: int = 500,
+        compression: Literal["zstd"] | None = None,
+        compression_level: int = 3,
+        retention: Literal["ttl", "archive"] | None = None,
+        retention_ttl: int = DEFAULT_RETENTION_TTL,
+        archive_directory: str | None = None,
+    ):
+        """
+        Args:
+            redis_dsn (str): the Redis DSN
+            max_connections (int | None, optional): the size of the connection pool shared by the handlers
+                connecting to `redis_dsn` in the process. Defaults to None.
+            batch_size (int, optional): the number of contents sent to Redis in a single round-trip. Defaults to 500.
+            compression (Literal["zstd"] | None, optional): the compression of the contents written. Defaults to None.
+            compression_level (int, optional): the zstd compression level. Defaults to 3.
+            retention (Literal["ttl", "archive"] | None, optional): what happens to the contents once processed,
+                None to keep them in Redis. Defaults to None.
+            retention_ttl (int, optional): the duration the processed contents are kept in Redis
+                when `retention` is "ttl", in seconds. Defaults to 7 days.
+            archive_directory (str | None, optional): the directory of the local archive of the contents,
+                required when `retention` is "archive". Defaults to None.
+        """
         self.redis_dsn = redis_dsn
+        self.max_connections = max_connections
+        self.batch_size = batch_size
+        self.compression = compression
+        self.compression_level = compression_level
+        self.retention = retention
+        self.retention_ttl = retention_ttl
+        self.archive_directory = archive_directory
+
+        if retention == "archive" and archive_directory is None:
+            raise ValueError(
+                "An archive directory is required to archive the contents, see `archive_directory`"
+            )
 
         if not hasattr(self, "_namespace"):
             raise ValueError(
@@ -39,37 +127,145 @@ class RedisTextStorage[U: Composable](IStorageHandler[str]):
 
     @contextmanager
     def client(self):
-        _client = redis.Redis.from_url(self.redis_dsn, decode_responses=True)
-        try:
+        """the contents may be compressed, the client reads and writes bytes"""
+        with pooled_client(
+            self.redis_dsn, self.max_connections, decode_responses=False
+        ) as _client:
             yield _client
-        finally:
-            _client.close()
 
     def on_init(self):
-        pass
+        """Indexes the IDs of the contents stored before the IDs were indexed, once."""
+
+        with self.client() as _client:
+
+            try:
+                indexed = index_members(
+                    _client,
+                    self._get_ids_key(),
+                    match=f"{self._namespace}:*",
+                    get_content_id=self._get_content_id,
+                    batch_size=self.batch_size,
+                )
+
+                if indexed is not None:
+                    logger.info(f"Indexed {indexed} IDs of '{self._namespace}'")
+
+            except Exception as e:
+                logger.warning(f"Error indexing the IDs of '{self._namespace}': {e}")
 
     def _get_key(self, content_id: str) -> str:
         """Constructs the Redis key for the given content ID."""
         return f"{self._namespace}:{content_id}"
 
-    def _get_content_id(self, key: str) -> str:
+    def _get_revisions_key(self) -> str:
+        """The Redis hash mapping the content IDs to their revision ID."""
+        return f"{self._namespace}-revisions"
+
+    def _get_ids_key(self) -> str:
+        """The Redis sorted set of the content IDs, see `membership.to_member`."""
+        return f"{self._namespace}-ids"
+
+    def _get_dictionaries_key(self) -> str:
+        """The Redis hash mapping the dictionary IDs to the dictionaries."""
+        return f"{self._namespace}-dictionaries"
+
+    def _get_current_dictionary_key(self) -> str:
+        """The ID of the dictionary used to compress the contents."""
+        return f"{self._namespace}-dictionary"
+
+    def _get_archive(self, create: bool = False) -> SegmentArchive | None:
+        """the archive of the storage, None when there is no archive"""
+
+        if self.archive_directory is None:
+            return None
+
+        directory = Path(self.archive_directory) / self._namespace
+
+        if not create and not (directory / INDEX_FILENAME).exists():
+            return None
+
+        return get_archive(directory, compression_level=self.compression_level)
+
+    def _get_content_id(self, key: str | bytes) -> str:
         """Extracts the content ID from the Redis key."""
 
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+
         return key.split(":", 1)[1] if ":" in key else key
 
+    def _get_dictionary(
+        self, _client, dict_id: int
+    ) -> zstandard.ZstdCompressionDict | None:
+        return get_dictionary(
+            f"{self.redis_dsn}/{self._namespace}",
+            dict_id,
+            load=lambda i: _client.hget(self._get_dictionaries_key(), str(i)),
+        )
+
+    def _get_compression_dictionary(
+        self, _client
+    ) -> zstandard.ZstdCompressionDict | None:
+        """the dictionary to compress new contents with, None when no dictionary was trained"""
+
+        dict_id = _client.get(self._get_current_dictionary_key())
+
+        return self._get_dictionary(_client, int(dict_id)) if dict_id else None
+
+    def _encode(
+        self, content: str, dictionary: zstandard.ZstdCompressionDict | None
+    ) -> bytes:
+
+        if self.compression is None:
+            return content.encode("utf-8")
+
+        return compress(content, dictionary=dictionary, level=self.compression_level)
+
+    def _decode(self, _client, value: bytes) -> str:
+
+        if not is_compressed(value):
+            return value.decode("utf-8")
+
+        return decompress(
+            value, dictionary=self._get_dictionary(_client, get_dictionary_id(value))
+        )
+
     def insert(
         self,
         content_id: str,
         content: str,
+        revision_id: int | None = None,
     ) -> None:
-        """Saves the given data to a file."""
+        """Saves the given data to a file.
+
+        Args:
+            content_id (str): the ID of the content
+            content (str): the content to store
+            revision_id (int | None, optional): the revision of the content, if known.
+                When not provided, the revision previously stored is discarded.
+        """
 
         with self.client() as _client:
 
             try:
                 key = self._get_key(content_id)
 
-                _client.set(key, content)
+                dictionary = (
+                    self._get_compression_dictionary(_client)
+                    if self.compression is not None
+                    else None
+                )
+
+                pipe = _client.pipeline()
+                pipe.set(key, self._encode(content, dictionary))
+                pipe.zadd(self._get_ids_key(), {to_member(content_id): 0})
+
+                if revision_id is not None:
+                    pipe.hset(self._get_revisions_key(), content_id, revision_id)
+                else:
+                    pipe.hdel(self._get_revisions_key(), content_id)
+
+                pipe.execute()
 
                 logger.info(f"Saved '{key}' to Redis storage.")
 
@@ -85,14 +281,59 @@ class RedisTextStorage[U: Composable](IStorageHandler[str]):
         with self.client() as _client:
 
             try:
-                return _client.get(self._get_key(content_id))
+                value = _client.get(self._get_key(content_id))
+
+                if value is not None:
+                    return self._decode(_client, value)
+
+                # the content may have been archived once processed
+                archive = self._get_archive()
+                return archive.get(content_id) if archive is not None else None
+
             except Exception as e:
                 logger.error(f"Error loading '{content_id}': {e}")
                 return None
 
-    def scan(self) -> Generator[tuple[str, str], None, None]:
+    def select_revisions(
+        self,
+        content_ids: Sequence[str],
+    ) -> dict[str, int]:
+        """Loads the revision ids of the given contents in a single round-trip."""
+
+        if not content_ids:
+            return {}
+
+        with self.client() as _client:
+
+            try:
+                revisions = _client.hmget(self._get_revisions_key(), list(content_ids))
+
+                return {
+                    content_id: int(revision)
+                    for content_id, revision in zip(content_ids, revisions)
+                    if revision is not None
+                }
+
+            except Exception as e:
+                logger.error(f"Error loading revisions: {e}")
+                return {}
+
+    def scan(
+        self,
+        count: int = 1000,
+        batch_size: int | None = None,
+        partition: int = 0,
+        num_partitions: int = 1,
+    ) -> Generator[tuple[str, str], None, None]:
         """Scans the persistent storage and iterates over contents.
 
+        The IDs are read from the index of the storage by batches, the contents of each batch
+        are loaded in a single round-trip (`MGET`) and yielded one by one.
+
+        The storage can be split into `num_partitions` disjoint partitions, so that N workers
+        each process a partition without coordinating, e.g. `scan(partition=i, num_partitions=N)`
+        for each worker `i`.
+
         Example:
         ```python
             for key, content in storage.scan():
@@ -104,22 +345,48 @@ class RedisTextStorage[U: Composable](IStorageHandler[str]):
 
         ```
 
+        Args:
+            count (int, optional): the number of keys examined by each `SCAN` call,
+                when the IDs of the storage are not indexed yet. Defaults to 1000.
+            batch_size (int | None, optional): the maximum number of contents loaded at once.
+                Defaults to the `batch_size` of the storage.
+            partition (int, optional): the partition to scan. Defaults to 0.
+            num_partitions (int, optional): the number of partitions. Defaults to 1, i.e. all the contents.
+
+        Raises:
+            ValueError: when the partition does not exist
+
         Returns:
             Generator[str, None, None]: a generator of HTML contents.
         """
 
+        get_partition_buckets(partition, num_partitions)
+
         with self.client() as _client:
 
             try:
 
-                for key in _client.scan_iter(match=f"{self._namespace}:*"):
-                    uid = self._get_content_id(key)
-                    content = _client.get(key)
-                    if content is not None:
-                        yield uid, content
-                    else:
-                        logger.warning(f"Content for key '{key}' not found in Redis.")
-                        continue
+                for content_ids in scan_partition(
+                    _client,
+                    self._get_ids_key(),
+                    match=f"{self._namespace}:*",
+                    get_content_id=self._get_content_id,
+                    partition=partition,
+                    num_partitions=num_partitions,
+                    count=count,
+                    batch_size=batch_size or self.batch_size,
+                ):
+
+                    keys = [self._get_key(content_id) for content_id in content_ids]
+
+                    for content_id, value in zip(content_ids, _client.mget(keys)):
+                        if value is not None:
+                            yield content_id, self._decode(_client, value)
+                        else:
+                            logger.warning(
+                                f"Content for key '{self._get_key(content_id)}' not found in Redis."
+                            )
+                            continue
 
             except Exception as e:
                 logger.error(f"Error scanning redis: {e}")
@@ -137,13 +404,265 @@ class RedisTextStorage[U: Composable](IStorageHandler[str]):
     def insert_many(
         self,
         contents: Sequence[str],
-        *args,
-        **kwargs,
-    ) -> None:
-        raise NotImplementedError(
-            "Bulk insert is not supported for RedisTextStorage. Use insert() instead."
+        content_ids: Sequence[str],
+        revision_ids: Sequence[int | None] | None = None,
+    ) -> int:
+        """Saves the contents by batches of `batch_size`, each batch in a single round-trip.
+
+        A content which cannot be saved is logged and skipped, the other contents are saved anyway.
+
+        Args:
+            contents (Sequence[str]): the contents to store
+            content_ids (Sequence[str]): the ID of each content
+            revision_ids (Sequence[int | None] | None, optional): the revision of each content, if known.
+                When not provided, the revisions previously stored are discarded.
+
+        Returns:
+            int: the number of contents saved
+        """
+
+        if len(contents) != len(content_ids):
+            raise ValueError(
+                f"Expected one ID per content, got {len(content_ids)} IDs for {len(contents)} contents"
+            )
+
+        if revision_ids is None:
+            revision_ids = [None] * len(contents)
+
+        saved = 0
+
+        with self.client() as _client:
+
+            dictionary = (
+                self._get_compression_dictionary(_client)
+                if self.compression is not None
+                else None
+            )
+
+            for batch in batched(
+                zip(content_ids, contents, revision_ids), self.batch_size
+            ):
+
+                pipe = _client.pipeline(transaction=False)
+
+                for content_id, content, revision_id in batch:
+                    pipe.set(
+                        self._get_key(content_id), self._encode(content, dictionary)
+                    )
+                    pipe.zadd(self._get_ids_key(), {to_member(content_id): 0})
+
+                    if revision_id is not None:
+                        pipe.hset(self._get_revisions_key(), content_id, revision_id)
+                    else:
+                        pipe.hdel(self._get_revisions_key(), content_id)
+
+                try:
+                    results = pipe.execute(raise_on_error=False)
+                except Exception as e:
+                    logger.error(f"Error saving {len(batch)} contents: {e}")
+                    continue
+
+                # each content is saved with 3 commands, the content, its ID and its revision
+                for (content_id, _, _), *content_results in zip(
+                    batch, results[::3], results[1::3], results[2::3]
+                ):
+                    error = next(
+                        (r for r in content_results if isinstance(r, Exception)),
+                        None,
+                    )
+                    if error is not None:
+                        logger.error(f"Error saving '{content_id}': {error}")
+                    else:
+                        saved += 1
+
+        logger.info(f"Saved {saved} contents to Redis storage.")
+
+        return saved
+
+    def train_dictionary(
+        self,
+        sample_size: int = 1000,
+        dict_size: int = DEFAULT_DICTIONARY_SIZE,
+    ) -> int | None:
+        """Trains a zstd dictionary from the stored contents, new contents are compressed with it.
+
+        The previous dictionaries are kept to read the contents compressed with them,
+        until they are compressed again (see `recompress`).
+
+        Args:
+            sample_size (int, optional): the number of contents the dictionary is trained from. Defaults to 1000.
+            dict_size (int, optional): the size of the dictionary, in bytes. Defaults to `DEFAULT_DICTIONARY_SIZE`.
+
+        Returns:
+            int | None: the ID of the dictionary, None when the contents are not enough to train a dictionary.
+        """
+
+        samples = []
+
+        for _, content in self.scan():
+            samples.append(content)
+            if len(samples) >= sample_size:
+                break
+
+        try:
+            dictionary = train_dictionary(samples, dict_size=dict_size)
+        except zstandard.ZstdError as e:
+            logger.warning(
+                f"Could not train a dictionary from {len(samples)} contents: {e}"
+            )
+            return None
+
+        dict_id = dictionary.dict_id()
+
+        with self.client() as _client:
+
+            pipe = _client.pipeline()
+            pipe.hset(self._get_dictionaries_key(), str(dict_id), dictionary.as_bytes())
+            pipe.set(self._get_current_dictionary_key(), dict_id)
+            pipe.execute()
+
+        logger.info(
+            f"Trained dictionary {dict_id} for '{self._namespace}' from {len(samples)} contents"
         )
 
+        return dict_id
+
+    def recompress(self, count: int = 1000) -> int:
+        """Compresses again the contents which are not compressed with the current dictionary,
+        i.e. the contents stored before the compression was enabled or before the dictionary was trained.
+
+        The contents are rewritten by batches of `batch_size`, it is meant to be run
+        while no other process writes into the storage.
+
+        Args:
+            count (int, optional): the number of keys examined by each `SCAN` call. Defaults to 1000.
+
+        Returns:
+            int: the number of contents compressed again
+        """
+
+        if self.compression is None:
+            raise ValueError(
+                f"Compression is not enabled for '{self._namespace}', contents cannot be compressed"
+            )
+
+        recompressed = 0
+
+        with self.client() as _client:
+
+            dictionary = self._get_compression_dictionary(_client)
+            dict_id = dictionary.dict_id() if dictionary is not None else 0
+
+            for keys in scan_keys(
+                _client,
+                match=f"{self._namespace}:*",
+                count=count,
+                batch_size=self.batch_size,
+            ):
+
+                pipe = _client.pipeline(transaction=False)
+                updated = 0
+
+                for key, value in zip(keys, _client.mget(keys)):
+
+                    if value is None or (
+                        is_compressed(value) and get_dictionary_id(value) == dict_id
+                    ):
+                        continue
+
+                    try:
+                        content = self._decode(_client, value)
+                        pipe.set(key, self._encode(content, dictionary), xx=True)
+                        updated += 1
+                    except Exception as e:
+                        logger.error(f"Error compressing '{key}': {e}")
+
+                if updated:
+                    pipe.execute()
+                    recompressed += updated
+
+        logger.info(f"Compressed {recompressed} contents of '{self._namespace}'")
+
+        return recompressed
+
+    def evict(self, content_id: str) -> None:
+        """Applies the retention policy to a content which was processed:
+        it expires after `retention_ttl` seconds or it is moved to the archive.
+
+        Either way, the content is not scanned anymore, until it is inserted again.
+        An expiring content loses its revision, so that the page is downloaded again once it expired,
+        whereas an archived content keeps it.
+        A content inserted again while it is being archived is kept in Redis.
+        """
+
+        if self.retention is None:
+            return
+
+        key = self._get_key(content_id)
+
+        with self.client() as _client:
+
+            try:
+
+                if self.retention == "ttl":
+                    # the revision is dropped, so that the content is downloaded again once expired
+                    pipe = _client.pipeline()
+                    pipe.expire(key, self.retention_ttl)
+                    pipe.zrem(self._get_ids_key(), to_member(content_id))
+                    pipe.hdel(self._get_revisions_key(), content_id)
+                    pipe.execute()
+                    return
+
+                with _client.pipeline() as pipe:
+
+                    pipe.watch(key)
+
+                    value = pipe.get(key)
+
+                    if value is None:
+                        return
+
+                    revision_id = pipe.hget(self._get_revisions_key(), content_id)
+
+                    self._get_archive(create=True).put(
+                        content_id,
+                        self._decode(_client, value),
+                        revision_id=int(revision_id) if revision_id else None,
+                    )
+
+                    # the revision is kept, so that the content is not downloaded again
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.zrem(self._get_ids_key(), to_member(content_id))
+                    pipe.execute()
+
+                logger.info(f"Archived '{key}'")
+
+            except redis.WatchError:
+                logger.info(f"'{key}' was inserted again while archived, it is kept")
+
+            except Exception as e:
+                logger.error(f"Error evicting '{content_id}': {e}")
+
+    def delete(self, content_id: str) -> None:
+        """Deletes the content, its revision and its ID from the index."""
+
+        with self.client() as _client:
+
+            try:
+                pipe = _client.pipeline()
+                pipe.delete(self._get_key(content_id))
+                pipe.hdel(self._get_revisions_key(), content_id)
+                pipe.zrem(self._get_ids_key(), to_member(content_id))
+                pipe.execute()
+
+                logger.info(
+                    f"Deleted '{self._get_key(content_id)}' from Redis storage."
+                )
+
+            except Exception as e:
+                logger.error(f"Error deleting '{content_id}': {e}")
+
     def update(
         self,
         content: str,
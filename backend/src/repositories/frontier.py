@@ -0,0 +1,125 @@
+from contextlib import contextmanager
+
+import orjson
+
+from src.entities.content import PageLink
+from src.interfaces.frontier import IFrontier, LinkStatus
+from src.repositories.db.redis.pool import pooled_client
+
+
+class RedisFrontier(IFrontier):
+    """
+    Persists the frontier of a table of contents in a Redis hash `frontier:<frontier_id>`,
+    mapping each link to its title and status; the hash expires after `ttl` seconds
+    so that an abandoned frontier does not prevent the table of contents from being scraped again.
+    """
+
+    _key_prefix: str = "frontier:"
+    redis_dsn: str
+    max_connections: int | None
+    ttl: int
+
+    def __init__(self, redis_dsn: str, ttl: int, max_connections: int | None = None):
+        """for serialization purposes, we store the dsn as a string not as a `RedisDsn` object,
+        the connections are borrowed from a pool shared by the process (see `pooled_client`)
+        """
+        self.redis_dsn = redis_dsn
+        self.ttl = ttl
+        self.max_connections = max_connections
+
+    @contextmanager
+    def client(self):
+        with pooled_client(self.redis_dsn, self.max_connections) as _client:
+            yield _client
+
+    def _compose_key(self, frontier_id: str) -> str:
+        return f"{self._key_prefix}{frontier_id}"
+
+    def _compose_field(self, page_link: PageLink) -> str:
+        return f"{page_link.entity_type}:{page_link.page_id}"
+
+    def _compose_value(self, page_link: PageLink, status: LinkStatus) -> bytes:
+        return orjson.dumps({"page_title": page_link.page_title, "status": status})
+
+    def load(self, frontier_id: str) -> list[PageLink] | None:
+
+        with self.client() as _client:
+            fields = _client.hgetall(self._compose_key(frontier_id))
+
+        if not fields:
+            return None
+
+        page_links = []
+
+        for field, value in fields.items():
+
+            entity_type, page_id = field.split(":", 1)
+            value = orjson.loads(value)
+
+            if value["status"] in (LinkStatus.PENDING, LinkStatus.FAILED):
+                page_links.append(
+                    PageLink(
+                        page_id=page_id,
+                        page_title=value["page_title"],
+                        entity_type=entity_type,
+                    )
+                )
+
+        return page_links
+
+    def save(self, frontier_id: str, page_links: list[PageLink]) -> None:
+
+        key = self._compose_key(frontier_id)
+
+        with self.client() as _client:
+
+            pipeline = _client.pipeline()
+            pipeline.delete(key)
+
+            if page_links:
+                pipeline.hset(
+                    key,
+                    mapping={
+                        self._compose_field(link): self._compose_value(
+                            link, LinkStatus.PENDING
+                        )
+                        for link in page_links
+                    },
+                )
+                pipeline.expire(key, self.ttl)
+
+            pipeline.execute()
+
+    def mark(
+        self, frontier_id: str, page_links: list[PageLink], status: LinkStatus
+    ) -> None:
+
+        if not page_links:
+            return
+
+        with self.client() as _client:
+            # the links of a frontier already cleared are not saved again
+            _client.eval(
+                """
+                if redis.call('EXISTS', KEYS[1]) == 1 then
+                    for i = 1, #ARGV, 2 do
+                        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+                    end
+                end
+                """,
+                1,
+                self._compose_key(frontier_id),
+                *[
+                    item
+                    for link in page_links
+                    for item in (
+                        self._compose_field(link),
+                        self._compose_value(link, status),
+                    )
+                ],
+            )
+
+    def clear(self, frontier_id: str) -> None:
+
+        with self.client() as _client:
+            _client.delete(self._compose_key(frontier_id))
@@ -1,6 +1,6 @@
 import re
 from io import StringIO
-from typing import Generator, Literal
+from typing import Generator, Literal, Sequence
 
 import pandas as pd
 from bs4 import BeautifulSoup, Tag
@@ -131,18 +131,22 @@ class WikipediaParser(IContentParser):
             )
 
     def retrieve_inner_links(
-        self, html_content: str, config: TableOfContents
+        self, html_content: str, config: TableOfContents | Sequence[TableOfContents]
     ) -> list[PageLink]:
         """
         Parses the given HTML content and discovers wikipedia links to Wikipedia pages.
         A wikipedia link starts with `./` and is followed by the page ID.
 
+        When several configurations of the same page are given (e.g. one selector per entity type),
+        the HTML content is parsed once and every selector is run against the same DOM.
+
         Example:
         - https://api.wikimedia.org/core/v1/wikipedia/fr/page/Liste_de_films_fran%C3%A7ais_sortis_en_1907/html
 
         Args:
             html_content (str): The HTML content to parse.
-            config (WikiTOCPageConfig): The configuration for the page to be downloaded, which may include CSS selectors.
+            config (TableOfContents | Sequence[TableOfContents]): The configuration(s) for the page to be downloaded,
+                which may include CSS selectors.
 
         Example:
         ```
@@ -178,20 +182,24 @@ class WikipediaParser(IContentParser):
             WikiDataExtractionError: if the HTML content cannot be parsed or if the table structure is not as expected.
         """
 
+        configs = [config] if isinstance(config, TableOfContents) else config
+
         links: list[PageLink] = []
         soup = BeautifulSoup(html_content, "html.parser")
 
-        # discover the structure of the HTML content
-        # and extract the relevant links
-        roots = (
-            soup.select(config.inner_links_selector)
-            if config.inner_links_selector
-            else soup.find_all()
-        )
+        for _config in configs:
+
+            # discover the structure of the HTML content
+            # and extract the relevant links
+            roots = (
+                soup.select(_config.inner_links_selector)
+                if _config.inner_links_selector
+                else soup.find_all()
+            )
 
-        for root in roots:
-            for link in self._parse_structure(root, config):
-                links.append(link)
+            for root in roots:
+                for link in self._parse_structure(root, _config):
+                    links.append(link)
 
         return self._deduplicate_links(links)
 
@@ -231,7 +239,8 @@ class WikipediaParser(IContentParser):
 
     def _deduplicate_links(self, links: list[PageLink]) -> list[PageLink]:
         """
-        Deduplicates the list of links based on their page_id.
+        Deduplicates the list of links based on their page_id,
+        a page linked for several entity types is kept once per entity type.
 
         Args:
             links (list[WikiPageLink]): The list of links to deduplicate.
@@ -242,7 +251,9 @@ class WikipediaParser(IContentParser):
         if not links or len(links) == 0:
             return []
 
-        unique_links = {link.page_id: link for link in links}.values()
+        unique_links = {
+            (link.page_id, link.entity_type): link for link in links
+        }.values()
 
         return list(unique_links)
 
@@ -0,0 +1,191 @@
+import asyncio
+import atexit
+import weakref
+from typing import Literal
+
+import hishel
+import httpx
+from loguru import logger
+
+from src.exceptions import HttpError
+from src.interfaces.http_client import IHttpClient
+from src.interfaces.rate_limiter import IRateLimiter
+from src.repositories.http.cache_storage import create_async_cache_storage
+from src.repositories.http.event_loop import get_event_loop, run_coroutine
+from src.settings import ScrapingSettings
+
+# the `httpx.AsyncClient` is bound to the event loop where it was created,
+# so connections are pooled per event loop and shared by all the requests running in it
+_pools: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    dict[tuple, tuple[httpx.AsyncClient, asyncio.Semaphore]],
+] = weakref.WeakKeyDictionary()
+
+
+class AsyncHttpClient(IHttpClient):
+    """executes HTTP requests asynchronously, over a pool of keep-alive HTTP/2 connections
+
+    The client cannot be serialized, we cannot share it across tasks and store it as a class attribute,
+        thus a single `httpx.AsyncClient` is created lazily for each event loop, and reused by every request sent in that loop.
+        The number of requests in flight is bounded by `ScrapingSettings.max_concurrency`.
+
+    Synchronous callers run their coroutines in the event loop of the process (see `run_coroutine`),
+        so that the connections are kept alive from one task to the next; they are closed when the process exits.
+
+    Example:
+    ```python
+        http_client = AsyncHttpClient(settings=settings)
+
+        async def fetch(urls: list[str]) -> list[str]:
+            return await asyncio.gather(
+                *[http_client.send(url, response_type="text") for url in urls]
+            )
+
+        pages = run_coroutine(fetch(urls))
+    ```
+    """
+
+    settings: ScrapingSettings
+    rate_limiter: IRateLimiter | None
+
+    def __init__(
+        self,
+        settings: ScrapingSettings,
+        rate_limiter: IRateLimiter | None = None,
+    ):
+        """
+        Args:
+            settings (ScrapingSettings): the scraping settings
+            rate_limiter (IRateLimiter | None, optional): when provided, a token is acquired before each request.
+                Defaults to None.
+        """
+        self.settings = settings
+        self.rate_limiter = rate_limiter
+
+    def _pool_key(self) -> tuple:
+        return (
+            self.settings.mediawiki_user_agent,
+            self.settings.mediawiki_api_key,
+            self.settings.request_timeout,
+            self.settings.cache_expire_after,
+            self.settings.cache_backend,
+            self.settings.cache_dir,
+            self.settings.cache_max_size_mb,
+            self.settings.max_concurrency,
+        )
+
+    def _create_client(self) -> httpx.AsyncClient:
+
+        pwd = self.settings.mediawiki_api_key
+
+        return hishel.AsyncCacheClient(
+            storage=create_async_cache_storage(self.settings),
+            http2=True,
+            follow_redirects=True,
+            headers={
+                "User-Agent": self.settings.mediawiki_user_agent,
+                "Authorization": f"Bearer {pwd}",
+            },
+            limits=httpx.Limits(
+                max_connections=self.settings.max_concurrency,
+                max_keepalive_connections=self.settings.max_concurrency,
+            ),
+            timeout=self.settings.request_timeout,
+        )
+
+    def _pool(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """returns the client shared in the running event loop, and the semaphore bounding its requests"""
+
+        pools = _pools.setdefault(asyncio.get_running_loop(), {})
+        key = self._pool_key()
+
+        if key not in pools or pools[key][0].is_closed:
+            pools[key] = (
+                self._create_client(),
+                asyncio.Semaphore(self.settings.max_concurrency),
+            )
+
+        return pools[key]
+
+    async def send(
+        self,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        response_type: Literal["json", "text"] = "json",
+    ) -> dict | str:
+        """Sends a GET request to the specified URL."""
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+
+        _client, semaphore = self._pool()
+
+        try:
+
+            async with semaphore:
+
+                response = await _client.get(url, params=params, headers=headers)
+
+            response.raise_for_status()
+
+            return response.text if response_type == "text" else response.json()
+
+        except httpx.TimeoutException as t:
+            raise HttpError(reason=f"Request timed out: {t}", status_code=504)
+
+        except httpx.HTTPStatusError as e:
+
+            if e.response.status_code >= 400:
+                logger.error(
+                    f"failed to fetch '{url}': {e.response.status_code} - {params}"
+                )
+
+            raise HttpError(
+                reason=f"HTTP error occurred: {e.response.status_code} - {e.response.text}",
+                status_code=e.response.status_code,
+            )
+
+    async def aclose(self):
+        """closes the connections opened in the running event loop"""
+
+        pools = _pools.get(asyncio.get_running_loop(), {})
+        pool = pools.pop(self._pool_key(), None)
+
+        if pool is not None and not pool[0].is_closed:
+            try:
+                await pool[0].aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client connection: {e}")
+
+    def close(self):
+        """closes the connections opened in the event loop of the process,
+        use `aclose()` to close the connections opened in another event loop
+        """
+
+        loop = get_event_loop(create=False)
+
+        if loop is not None and _pools.get(loop):
+            run_coroutine(self.aclose())
+
+
+async def _close_pools() -> None:
+
+    pools = _pools.pop(asyncio.get_running_loop(), {})
+
+    for _client, _ in pools.values():
+        if not _client.is_closed:
+            try:
+                await _client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client connection: {e}")
+
+
+@atexit.register
+def close_pools() -> None:
+    """closes the connections pooled in the event loop of the current process"""
+
+    loop = get_event_loop(create=False)
+
+    if loop is not None and _pools.get(loop):
+        run_coroutine(_close_pools())
@@ -0,0 +1,391 @@
+import asyncio
+import datetime
+import sqlite3
+import threading
+import time
+import typing as tp
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+import hishel
+import zstandard
+from httpcore import Request, Response
+from loguru import logger
+
+from src.settings import ScrapingSettings
+
+SQLITE_CACHE_FILENAME = "http-cache.sqlite"
+
+# the oldest responses are evicted until the cache is back under this ratio of its max size,
+# so that eviction does not run after each response stored
+EVICTION_RATIO = 0.9
+
+type StoredResponse = tuple[Response, Request, hishel.Metadata]
+
+# the hits and misses of the caller, e.g. a task run (see `track_cache_usage`);
+# the counter is shared by the threads and coroutines running in a copy of its context
+_usage: ContextVar[Counter[str] | None] = ContextVar("http_cache_usage", default=None)
+
+
+@contextmanager
+def track_cache_usage() -> tp.Iterator[Counter[str]]:
+    """counts the `hits` and `misses` of the SQLite HTTP cache within the context
+
+    Example:
+    ```python
+        with track_cache_usage() as usage:
+            http_client.send(url, response_type="text")
+
+        usage["hits"], usage["misses"]
+    ```
+    """
+
+    usage = Counter()
+    token = _usage.set(usage)
+
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+class _SQLiteCache:
+    """a key/value store of zstd-compressed blobs in a single SQLite file, evicted by LRU
+
+    SQLite connections cannot be shared across processes nor serialized,
+        thus a single cache is opened per file in each process (see `_get_cache`)
+        and shared by all the HTTP clients of that process.
+    """
+
+    path: str
+    max_size: int
+    ttl: int | None
+
+    hits: int
+    misses: int
+
+    def __init__(self, path: str, max_size: int, ttl: int | None = None):
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS responses(
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)"
+        )
+
+        # the size is tracked in memory, and read again from the file before evicting
+        # because other processes may write into the same file
+        self._size = self._read_size()
+
+    def _read_size(self) -> int:
+        return self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def get(self, key: str) -> bytes | None:
+
+        now = time.time()
+
+        with self._lock:
+
+            row = self._connection.execute(
+                "SELECT data, created_at FROM responses WHERE key = ?", [key]
+            ).fetchone()
+
+            if row is not None and self.ttl is not None and row[1] + self.ttl < now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", [key])
+                row = None
+
+            usage = _usage.get()
+
+            if row is None:
+                self.misses += 1
+                if usage is not None:
+                    usage["misses"] += 1
+                return None
+
+            self.hits += 1
+            if usage is not None:
+                usage["hits"] += 1
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", [now, key]
+            )
+
+        return zstandard.ZstdDecompressor().decompress(row[0])
+
+    def put(self, key: str, data: bytes) -> None:
+
+        compressed = zstandard.ZstdCompressor().compress(data)
+        now = time.time()
+
+        with self._lock:
+
+            # the response replaced, if any, no longer counts in the size of the cache
+            replaced = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", [key]
+            ).fetchone()
+
+            self._connection.execute(
+                """INSERT OR REPLACE INTO responses(key, data, size, created_at, accessed_at)
+                VALUES(?, ?, ?, ?, ?)""",
+                [key, compressed, len(compressed), now, now],
+            )
+            self._size += len(compressed) - (replaced[0] if replaced else 0)
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", [key])
+
+    def _evict(self) -> None:
+        """removes the expired responses, then the least recently used ones; the lock must be held"""
+
+        if self.ttl is not None:
+            self._connection.execute(
+                "DELETE FROM responses WHERE created_at + ? < ?",
+                [self.ttl, time.time()],
+            )
+
+        self._size = self._read_size()
+        excess = self._size - int(self.max_size * EVICTION_RATIO)
+
+        if excess <= 0:
+            return
+
+        evicted: list[str] = []
+
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            if excess <= 0:
+                break
+            evicted.append(key)
+            excess -= size
+
+        self._connection.executemany(
+            "DELETE FROM responses WHERE key = ?", [(key,) for key in evicted]
+        )
+        logger.debug(f"evicted {len(evicted)} responses from the HTTP cache")
+
+        self._size = self._read_size()
+
+    def stats(self) -> dict[str, int]:
+        """the hits and misses of the current process, and the content of the cache"""
+
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "size": size,
+        }
+
+
+_caches: dict[str, _SQLiteCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _get_cache(path: str, max_size: int, ttl: int | None) -> _SQLiteCache:
+    """returns the cache opened in the current process for the given file"""
+
+    with _caches_lock:
+
+        cache = _caches.get(path)
+
+        if cache is None:
+            cache = _caches[path] = _SQLiteCache(path, max_size=max_size, ttl=ttl)
+
+        return cache
+
+
+class SQLiteCacheStorage(hishel.BaseStorage):
+    """
+    Stores the HTTP responses compressed with zstd in a single SQLite file,
+    the least recently used responses are evicted when the file exceeds its max size.
+
+    Compared to `hishel.FileStorage` which writes one file per response,
+    the cache remains compact when tens of thousands of pages are downloaded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int,
+        ttl: int | None = None,
+        serializer: hishel.BaseSerializer | None = None,
+    ):
+        """
+        Args:
+            path (str): the path of the SQLite file
+            max_size (int): the maximum size of the compressed responses, in bytes
+            ttl (int | None, optional): the maximum number of seconds a response is kept. Defaults to None.
+            serializer (hishel.BaseSerializer | None, optional): Defaults to `hishel.JSONSerializer`.
+        """
+        super().__init__(serializer=serializer, ttl=ttl)
+        self._cache = _get_cache(path, max_size=max_size, ttl=ttl)
+
+    def _dumps(
+        self, response: Response, request: Request, metadata: hishel.Metadata
+    ) -> bytes:
+        data = self._serializer.dumps(
+            response=response, request=request, metadata=metadata
+        )
+        return data.encode() if isinstance(data, str) else data
+
+    def _loads(self, data: bytes) -> StoredResponse:
+        return self._serializer.loads(
+            data if self._serializer.is_binary else data.decode()
+        )
+
+    def store(
+        self,
+        key: str,
+        response: Response,
+        request: Request,
+        metadata: hishel.Metadata | None = None,
+    ) -> None:
+
+        metadata = metadata or hishel.Metadata(
+            cache_key=key,
+            created_at=datetime.datetime.now(datetime.timezone.utc),
+            number_of_uses=0,
+        )
+
+        self._cache.put(key, self._dumps(response, request, metadata))
+
+    def update_metadata(
+        self,
+        key: str,
+        response: Response,
+        request: Request,
+        metadata: hishel.Metadata,
+    ) -> None:
+        self.store(key, response, request, metadata)
+
+    def remove(self, key: str | Response) -> None:
+
+        if isinstance(key, Response):
+            key = tp.cast(str, key.extensions["cache_metadata"]["cache_key"])
+
+        self._cache.delete(key)
+
+    def retrieve(self, key: str) -> StoredResponse | None:
+
+        data = self._cache.get(key)
+
+        return self._loads(data) if data is not None else None
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+    def close(self) -> None:
+        """the SQLite connection is shared by the clients of the process, it remains open"""
+        pass
+
+
+class AsyncSQLiteCacheStorage(hishel.AsyncBaseStorage):
+    """
+    Same as `SQLiteCacheStorage`, the SQLite queries are run in a thread not to block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int,
+        ttl: int | None = None,
+        serializer: hishel.BaseSerializer | None = None,
+    ):
+        super().__init__(serializer=serializer, ttl=ttl)
+        self._storage = SQLiteCacheStorage(
+            path, max_size=max_size, ttl=ttl, serializer=serializer
+        )
+
+    async def store(
+        self,
+        key: str,
+        response: Response,
+        request: Request,
+        metadata: hishel.Metadata | None = None,
+    ) -> None:
+        await asyncio.to_thread(self._storage.store, key, response, request, metadata)
+
+    async def update_metadata(
+        self,
+        key: str,
+        response: Response,
+        request: Request,
+        metadata: hishel.Metadata,
+    ) -> None:
+        await asyncio.to_thread(
+            self._storage.update_metadata, key, response, request, metadata
+        )
+
+    async def remove(self, key: str | Response) -> None:
+        await asyncio.to_thread(self._storage.remove, key)
+
+    async def retrieve(self, key: str) -> StoredResponse | None:
+        return await asyncio.to_thread(self._storage.retrieve, key)
+
+    def stats(self) -> dict[str, int]:
+        return self._storage.stats()
+
+    async def aclose(self) -> None:
+        pass
+
+
+def create_cache_storage(settings: ScrapingSettings) -> hishel.BaseStorage:
+    """creates the storage of the HTTP cache declared in the settings"""
+
+    if settings.cache_backend == "file":
+        return hishel.FileStorage(
+            base_path=Path(settings.cache_dir),
+            ttl=settings.cache_expire_after,
+        )
+
+    return SQLiteCacheStorage(
+        path=(Path(settings.cache_dir) / SQLITE_CACHE_FILENAME).as_posix(),
+        max_size=settings.cache_max_size_mb * 1024 * 1024,
+        ttl=settings.cache_expire_after,
+    )
+
+
+def create_async_cache_storage(settings: ScrapingSettings) -> hishel.AsyncBaseStorage:
+    """same as `create_cache_storage`, for the async HTTP clients"""
+
+    if settings.cache_backend == "file":
+        return hishel.AsyncFileStorage(
+            base_path=Path(settings.cache_dir),
+            ttl=settings.cache_expire_after,
+        )
+
+    return AsyncSQLiteCacheStorage(
+        path=(Path(settings.cache_dir) / SQLITE_CACHE_FILENAME).as_posix(),
+        max_size=settings.cache_max_size_mb * 1024 * 1024,
+        ttl=settings.cache_expire_after,
+    )
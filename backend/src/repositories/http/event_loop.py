@@ -0,0 +1,83 @@
+import asyncio
+import atexit
+import os
+import threading
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+# the event loop running the coroutines of the synchronous callers of the process, in a daemon thread;
+# the loop outlives the tasks so that the resources bound to it (e.g. the connections pooled by `AsyncHttpClient`)
+# are reused from one task to the next. The loop cannot be used in a forked process, the process ID is stored along with it
+_loop: tuple[int, asyncio.AbstractEventLoop] | None = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop(create: bool = True) -> asyncio.AbstractEventLoop | None:
+    """returns the event loop of the current process, running in its own thread
+
+    Args:
+        create (bool, optional): when False, None is returned instead of starting the loop. Defaults to True.
+    """
+
+    global _loop
+
+    with _loop_lock:
+
+        if _loop is None or _loop[0] != os.getpid() or _loop[1].is_closed():
+
+            if not create:
+                return None
+
+            loop = asyncio.new_event_loop()
+
+            threading.Thread(
+                target=loop.run_forever,
+                name="event-loop",
+                daemon=True,
+            ).start()
+
+            _loop = (os.getpid(), loop)
+
+        return _loop[1]
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """runs the coroutine in the event loop of the process, and waits for its result
+
+    The coroutine runs in a copy of the context of the caller, e.g. the Prefect task run context,
+    so that it logs into the task run.
+
+    Raises:
+        RuntimeError: when called from a coroutine of the event loop itself, which would never return;
+            the coroutine must be awaited instead.
+    """
+
+    loop = get_event_loop()
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError(
+            "run_coroutine() cannot be called from the event loop of the process, await the coroutine instead"
+        )
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+@atexit.register
+def close_event_loop() -> None:
+    """stops the event loop of the current process"""
+
+    global _loop
+
+    with _loop_lock:
+
+        if _loop is not None and _loop[0] == os.getpid():
+            _loop[1].call_soon_threadsafe(_loop[1].stop)
+
+        _loop = None
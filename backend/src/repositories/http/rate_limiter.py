@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+import weakref
+
+from loguru import logger
+from prefect.client.orchestration import get_client
+from prefect.concurrency.asyncio import rate_limit as rate_limit_async
+from prefect.concurrency.sync import rate_limit
+from prefect.exceptions import ObjectNotFound
+
+from src.interfaces.rate_limiter import IRateLimiter
+from src.settings import ScrapingSettings
+
+# when the global rate limit cannot be read, the tokens are leased one by one
+# and the limit is read again after this delay (seconds)
+LEASE_SIZE_RETRY_DELAY = 60.0
+
+
+class _Bucket:
+    """the tokens leased by the current process from a global rate limit"""
+
+    # guards the tokens, it is never held while waiting for the global rate limit
+    lock: threading.Lock
+    # a single thread leases a block at a time, the others wait for its tokens
+    lease_lock: threading.Lock
+    # same as `lease_lock`, for the coroutines of each event loop
+    async_lease_locks: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, asyncio.Lock
+    ]
+    tokens: int
+    # the number of tokens leased at once,
+    # None until the global limit is read, 0 when there is no global limit
+    lease_size: int | None
+    # the time (see `time.monotonic`) after which the global limit is read again,
+    # None once it has been read
+    lease_size_expires_at: float | None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.lease_lock = threading.Lock()
+        self.async_lease_locks = weakref.WeakKeyDictionary()
+        self.tokens = 0
+        self.lease_size = None
+        self.lease_size_expires_at = None
+
+
+# buckets are shared by all the tasks running in the process
+_buckets: dict[str, _Bucket] = {}
+_buckets_lock = threading.Lock()
+
+
+class TokenBucketRateLimiter(IRateLimiter):
+    """
+    Process-local token bucket, which leases its tokens from a Prefect global rate limit by blocks
+    instead of calling the Prefect API before each request.
+
+    The bucket cannot be serialized, we cannot share it across tasks and store it as a class attribute,
+        thus the tokens are kept in a registry shared by all the tasks of the process.
+        The block size is capped by the limit of the global rate limit,
+        and the requests are not limited when the global rate limit does not exist.
+
+    Example:
+    ```python
+        rate_limiter = TokenBucketRateLimiter(settings=scraping_settings)
+
+        # the first call leases `rate_limit_block_size` tokens from the global limit,
+        # the next ones are served locally until the tokens run out
+        rate_limiter.acquire()
+    ```
+    """
+
+    settings: ScrapingSettings
+
+    def __init__(
+        self,
+        settings: ScrapingSettings,
+    ):
+        self.settings = settings
+
+    def _bucket(self) -> _Bucket:
+
+        with _buckets_lock:
+            return _buckets.setdefault(self.settings.rate_limit_name, _Bucket())
+
+    def _read_lease_size(self) -> int | None:
+        """reads the global rate limit, a block cannot exceed its limit
+
+        Returns:
+            int | None: the lease size, 0 when there is no global limit, None when the limit cannot be read
+        """
+
+        try:
+
+            with get_client(sync_client=True) as client:
+                limit = client.read_global_concurrency_limit_by_name(
+                    self.settings.rate_limit_name
+                ).limit
+
+            return max(1, min(self.settings.rate_limit_block_size, limit))
+
+        except ObjectNotFound:
+            logger.warning(
+                f"Rate limit '{self.settings.rate_limit_name}' not found, requests are not limited"
+            )
+            return 0
+
+        except Exception as e:
+            logger.error(
+                f"Error reading rate limit '{self.settings.rate_limit_name}', "
+                f"tokens are leased one by one for {LEASE_SIZE_RETRY_DELAY}s: {e}"
+            )
+            return None
+
+    def _is_lease_size_expired(self, bucket: _Bucket) -> bool:
+        """the global limit is read the first time, and again when it could not be read"""
+
+        with bucket.lock:
+            return bucket.lease_size is None or (
+                bucket.lease_size_expires_at is not None
+                and time.monotonic() >= bucket.lease_size_expires_at
+            )
+
+    def _set_lease_size(self, bucket: _Bucket, lease_size: int | None) -> None:
+
+        with bucket.lock:
+
+            if lease_size is None:
+                # the error may be transient, the tokens are leased one by one until the limit is read again
+                bucket.lease_size = 1
+                bucket.lease_size_expires_at = time.monotonic() + LEASE_SIZE_RETRY_DELAY
+
+            else:
+                bucket.lease_size = lease_size
+                bucket.lease_size_expires_at = None
+
+    def _try_consume(self, bucket: _Bucket, tokens: int) -> bool:
+        """consumes the tokens if available in the bucket"""
+
+        with bucket.lock:
+
+            if bucket.lease_size == 0:
+                return True
+
+            if bucket.lease_size is not None and bucket.tokens >= tokens:
+                bucket.tokens -= tokens
+                return True
+
+            return False
+
+    def _has_tokens(self, bucket: _Bucket, tokens: int) -> bool:
+
+        with bucket.lock:
+            return bucket.tokens >= tokens
+
+    def _refill(self, bucket: _Bucket) -> None:
+
+        with bucket.lock:
+            bucket.tokens += bucket.lease_size
+
+    def _async_lease_lock(self, bucket: _Bucket) -> asyncio.Lock:
+        """the lock of the running event loop, an `asyncio.Lock` cannot be shared across event loops"""
+
+        with bucket.lock:
+            return bucket.async_lease_locks.setdefault(
+                asyncio.get_running_loop(), asyncio.Lock()
+            )
+
+    def acquire(self, tokens: int = 1) -> None:
+
+        bucket = self._bucket()
+
+        if self._is_lease_size_expired(bucket):
+            self._set_lease_size(bucket, self._read_lease_size())
+
+        while not self._try_consume(bucket, tokens):
+
+            with bucket.lease_lock:
+
+                # the tokens may have been leased by another thread meanwhile
+                if not self._has_tokens(bucket, tokens):
+                    rate_limit(self.settings.rate_limit_name, occupy=bucket.lease_size)
+                    self._refill(bucket)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+
+        bucket = self._bucket()
+
+        if self._is_lease_size_expired(bucket):
+            self._set_lease_size(bucket, await asyncio.to_thread(self._read_lease_size))
+
+        while not self._try_consume(bucket, tokens):
+
+            # the coroutines wait for the block without holding a thread
+            async with self._async_lease_lock(bucket):
+
+                # the tokens may have been leased by another coroutine meanwhile
+                if not self._has_tokens(bucket, tokens):
+                    await rate_limit_async(
+                        self.settings.rate_limit_name, occupy=bucket.lease_size
+                    )
+                    self._refill(bucket)
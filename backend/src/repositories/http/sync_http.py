@@ -7,6 +7,8 @@ from loguru import logger
 
 from src.exceptions import HttpError
 from src.interfaces.http_client import IHttpClient
+from src.interfaces.rate_limiter import IRateLimiter
+from src.repositories.http.cache_storage import create_cache_storage
 from src.settings import ScrapingSettings
 
 
@@ -15,16 +17,25 @@ class SyncHttpClient(IHttpClient):
 
     The client cannot be serialized, we cannot share it across tasks and store it as a class attribute,
         thus we create a new client for each request.
-        As a consequence we manage the rate limiting at prefect level using concurrency limits.
+        As a consequence the rate limiting is delegated to the `rate_limiter`, which tokens are shared across tasks.
     """
 
     settings: ScrapingSettings
+    rate_limiter: IRateLimiter | None
 
     def __init__(
         self,
         settings: ScrapingSettings,
+        rate_limiter: IRateLimiter | None = None,
     ):
+        """
+        Args:
+            settings (ScrapingSettings): the scraping settings
+            rate_limiter (IRateLimiter | None, optional): when provided, a token is acquired before each request.
+                Defaults to None.
+        """
         self.settings = settings
+        self.rate_limiter = rate_limiter
 
     @contextmanager
     def client(self) -> Generator[httpx.Client, None, None]:
@@ -33,10 +44,7 @@ class SyncHttpClient(IHttpClient):
             pwd = self.settings.mediawiki_api_key
 
             _client = hishel.CacheClient(
-                storage=hishel.FileStorage(
-                    base_path=".crawler_cache",
-                    ttl=self.settings.cache_expire_after,
-                ),
+                storage=create_cache_storage(self.settings),
                 follow_redirects=True,
                 headers={
                     "User-Agent": self.settings.mediawiki_user_agent,
@@ -61,6 +69,9 @@ class SyncHttpClient(IHttpClient):
     ) -> dict | str:
         """Sends a GET request to the specified URL."""
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
         try:
 
             with self.client() as _client:
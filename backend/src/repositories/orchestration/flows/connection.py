@@ -12,9 +12,13 @@ from src.interfaces.storage import IRelationshipHandler, IStorageHandler
 from src.repositories.db.graph.mg_movie import MovieGraphRepository
 from src.repositories.db.graph.mg_person import PersonGraphRepository
 from src.repositories.db.redis.json import RedisJsonStorage
+from src.repositories.http.rate_limiter import TokenBucketRateLimiter
 from src.repositories.http.sync_http import SyncHttpClient
 from src.repositories.orchestration.tasks.race import wait_for_all
-from src.repositories.orchestration.tasks.task_relationship import execute_task
+from src.repositories.orchestration.tasks.task_relationship import (
+    execute_task,
+    related_fields,
+)
 from src.settings import AppSettings
 
 from .hooks import capture_crash_info
@@ -52,10 +56,15 @@ def connection_flow(
 
     tasks: list[PrefectFuture] = []
 
-    http_client = SyncHttpClient(settings=app_settings.scraping_settings)
+    http_client = SyncHttpClient(
+        settings=app_settings.scraping_settings,
+        rate_limiter=TokenBucketRateLimiter(settings=app_settings.scraping_settings),
+    )
 
     store = input_store or RedisJsonStorage[cls](
-        app_settings.storage_settings.redis_dsn
+        redis_dsn=app_settings.storage_settings.redis_dsn,
+        max_connections=app_settings.storage_settings.redis_max_connections,
+        batch_size=app_settings.storage_settings.redis_batch_size,
     )
 
     # where to store the relationships
@@ -69,7 +78,8 @@ def connection_flow(
         )
     )
 
-    for entity_id, entity in store.scan():
+    # only the fields required to discover the relationships are loaded
+    for entity_id, entity in store.scan(fields=related_fields(cls)):
         if not entity or not entity_id:
             logger.warning(f"Skipping empty entity or entity_id: '{entity_id}'")
             continue
@@ -91,6 +101,7 @@ def connection_flow(
                 entity=entity,
                 output_storage=db_storage,
                 http_client=http_client,
+                settings=app_settings.scraping_settings,
             )
         )
 
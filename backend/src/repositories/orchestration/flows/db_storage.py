@@ -7,10 +7,17 @@ from prefect.tasks import exponential_backoff
 
 from src.entities import get_entity_class
 from src.entities.movie import Movie
-from src.interfaces.storage import IRelationshipHandler, IStorageHandler
+from src.interfaces.storage import (
+    IBulkLoadableStorageHandler,
+    IRelationshipHandler,
+    IStorageHandler,
+)
 from src.repositories.db.graph.mg_movie import MovieGraphRepository
 from src.repositories.db.graph.mg_person import PersonGraphRepository
 from src.repositories.db.redis.json import RedisJsonStorage
+from src.repositories.orchestration.tasks.task_bulk_load import (
+    execute_task as execute_bulk_load_task,
+)
 from src.repositories.orchestration.tasks.task_storage import execute_task
 from src.repositories.search.meili_indexer import MeiliHandler
 from src.settings import AppSettings
@@ -28,12 +35,23 @@ def db_storage_flow(
     graph_store: IRelationshipHandler | None = None,
     search_store: IStorageHandler | None = None,
     refresh_cache: bool = False,
+    bulk_load: bool = False,
 ) -> None:
+    """
+    Args:
+        bulk_load (bool, optional): the entities are bulk loaded into the graph DB instead of being inserted by batches
+            (see `IBulkLoadableStorageHandler`); the graph DB must not contain any entity of the type yet,
+            otherwise the load fails with a `StorageError`. The storage mode of the graph DB being global,
+            two bulk loads must not run concurrently: this is a run-time parameter of a one-off run,
+            see `python main.py store --bulk-load` which loads the types in turn. Defaults to False.
+    """
 
     cls = get_entity_class(entity_type)
 
     json_store = json_store or RedisJsonStorage[cls](
-        redis_dsn=app_settings.storage_settings.redis_dsn
+        redis_dsn=app_settings.storage_settings.redis_dsn,
+        max_connections=app_settings.storage_settings.redis_max_connections,
+        batch_size=app_settings.storage_settings.redis_batch_size,
     )
 
     json_store.on_init()
@@ -52,21 +70,36 @@ def db_storage_flow(
 
     search_handler.on_init()
 
-    t = execute_task.with_options(
-        retries=app_settings.prefect_settings.task_retry_attempts,
-        retry_delay_seconds=exponential_backoff(
-            backoff_factor=app_settings.prefect_settings.task_retry_backoff_factor
-        ),
-        cache_expiration=timedelta(
-            hours=app_settings.prefect_settings.task_cache_expiration_hours
-        ),
-        timeout_seconds=1,  # fail fast if the task hangs
-        cache_key_fn=lambda *_: f"insert_task-json-graph-{entity_type}",
-        refresh_cache=app_settings.prefect_settings.cache_disabled or refresh_cache,
-    ).submit(
-        input_storage=json_store,
-        output_storage=graph_store,
-    )
+    if bulk_load:
+
+        if not isinstance(graph_store, IBulkLoadableStorageHandler):
+            raise ValueError(
+                f"The graph storage {graph_store.__class__.__name__} does not support bulk loads"
+            )
+
+        # no timeout nor cache, the load may take a while and must not be skipped
+        t = execute_bulk_load_task.submit(
+            input_storage=json_store,
+            output_storage=graph_store,
+        )
+
+    else:
+
+        t = execute_task.with_options(
+            retries=app_settings.prefect_settings.task_retry_attempts,
+            retry_delay_seconds=exponential_backoff(
+                backoff_factor=app_settings.prefect_settings.task_retry_backoff_factor
+            ),
+            cache_expiration=timedelta(
+                hours=app_settings.prefect_settings.task_cache_expiration_hours
+            ),
+            timeout_seconds=1,  # fail fast if the task hangs
+            cache_key_fn=lambda *_: f"insert_task-json-graph-{entity_type}",
+            refresh_cache=app_settings.prefect_settings.cache_disabled or refresh_cache,
+        ).submit(
+            input_storage=json_store,
+            output_storage=graph_store,
+        )
 
     # for all pages
     u = execute_task.with_options(
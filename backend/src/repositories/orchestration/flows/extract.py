@@ -41,11 +41,14 @@ def extract_entities_flow(
     html_store: IStorageHandler | None = None,
     json_store: IStorageHandler | None = None,
     refresh_cache: bool = False,
+    partition: int = 0,
+    num_partitions: int = 1,
 ) -> None:
     """
     Extract entities (Movie or Person) from HTML contents
 
-    If page_id is provided, only that specific page will be processed. If not, all pages in the HTML storage will be processed.
+    If page_id is provided, only that specific page will be processed. If not, all pages in the HTML storage will be processed,
+    or the pages of a partition of the storage, so that the extraction is split between flows running on different machines.
     Other params are injected for testing purposes.
 
     Args:
@@ -57,6 +60,8 @@ def extract_entities_flow(
         html_store (IStorageHandler | None, optional): Custom HTML storage handler, defaults to `RedisTextStorage`
         json_store (IStorageHandler | None, optional): Custom JSON storage handler, defaults to `RedisJsonStorage`
         refresh_cache (bool, optional): If True, forces re-processing of all pages by bypassing task cache. Defaults to False.
+        partition (int, optional): The partition of the HTML storage to process, see `RedisTextStorage.scan`. Defaults to 0.
+        num_partitions (int, optional): The number of partitions of the HTML storage. Defaults to 1 (process all pages).
     """
 
     logger = get_run_logger()
@@ -65,9 +70,26 @@ def extract_entities_flow(
 
     tasks: list[PrefectFuture] = []
 
-    html_store = RedisTextStorage[cls](app_settings.storage_settings.redis_dsn)
-    json_store = RedisJsonStorage[cls](app_settings.storage_settings.redis_dsn)
-    stats_collector = RedisStatsCollector(app_settings.stats_settings.redis_dsn)
+    html_store = RedisTextStorage[cls](
+        redis_dsn=app_settings.storage_settings.redis_dsn,
+        max_connections=app_settings.storage_settings.redis_max_connections,
+        batch_size=app_settings.storage_settings.redis_batch_size,
+        compression=app_settings.storage_settings.html_compression,
+        compression_level=app_settings.storage_settings.html_compression_level,
+        retention=app_settings.storage_settings.html_retention,
+        retention_ttl=app_settings.storage_settings.html_retention_ttl,
+        archive_directory=app_settings.storage_settings.html_archive_directory,
+    )
+    json_store = RedisJsonStorage[cls](
+        redis_dsn=app_settings.storage_settings.redis_dsn,
+        max_connections=app_settings.storage_settings.redis_max_connections,
+        batch_size=app_settings.storage_settings.redis_batch_size,
+    )
+    stats_collector = RedisStatsCollector(
+        redis_dsn=app_settings.stats_settings.redis_dsn,
+        max_connections=app_settings.stats_settings.redis_max_connections,
+        flush_interval=app_settings.stats_settings.flush_interval,
+    )
 
     html_store.on_init()
     stats_collector.on_init()
@@ -103,6 +125,7 @@ def extract_entities_flow(
                         content_id=page_id,
                         content=content,
                         output_storage=json_store,
+                        input_storage=html_store,
                         section_settings=app_settings.section_settings,
                         ml_settings=app_settings.ml_settings,
                         entity_type=cls,
@@ -134,7 +157,9 @@ def extract_entities_flow(
                 f"Acquired concurrency lock for 'resource-rate-limiting' after {acquisition_time:.2f} seconds"
             )
 
-            for content_id, content in html_store.scan():
+            for content_id, content in html_store.scan(
+                partition=partition, num_partitions=num_partitions
+            ):
                 if not content or not content_id:
                     logger.warning(
                         f"Skipping empty content or content_id: '{content_id}'"
@@ -159,6 +184,7 @@ def extract_entities_flow(
                         content_id=content_id,
                         content=content,
                         output_storage=json_store,
+                        input_storage=html_store,
                         ml_settings=app_settings.ml_settings,
                         section_settings=app_settings.section_settings,
                         entity_type=cls,
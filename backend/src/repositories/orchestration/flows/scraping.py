@@ -7,11 +7,15 @@ from prefect.task_runners import ConcurrentTaskRunner
 from prefect.tasks import exponential_backoff
 
 from src.entities import get_entity_class
+from src.entities.content import TableOfContents
 from src.repositories.db.redis.text import RedisTextStorage
-from src.repositories.http.sync_http import SyncHttpClient
+from src.repositories.frontier import RedisFrontier
+from src.repositories.http.async_http import AsyncHttpClient
+from src.repositories.http.rate_limiter import TokenBucketRateLimiter
 from src.repositories.orchestration.tasks.race import wait_for_all
 from src.repositories.orchestration.tasks.retry import is_http_task_retriable
 from src.repositories.orchestration.tasks.task_scraper import execute_task
+from src.repositories.page_registry import RedisPageRegistry
 from src.repositories.stats import RedisStatsCollector
 from src.settings import AppSettings
 
@@ -27,39 +31,77 @@ from .hooks import capture_crash_info
 )
 def scraping_flow(
     app_settings: AppSettings,
-    entity_type: Literal["Movie", "Person"],
+    entity_type: Literal["Movie", "Person"] | list[Literal["Movie", "Person"]],
 ) -> None:
+    """
+    Args:
+        entity_type (Literal["Movie", "Person"] | list[Literal["Movie", "Person"]]): the type(s) of the pages to scrape;
+            when several types are given, the tables of contents shared by these types are downloaded once.
+    """
 
-    http_client = SyncHttpClient(settings=app_settings.scraping_settings)
+    entity_types = [entity_type] if isinstance(entity_type, str) else entity_type
 
-    pages = [
-        p
-        for p in app_settings.scraping_settings.start_pages
-        if p.entity_type == entity_type
-    ]
+    # links of each page are downloaded concurrently over pooled connections
+    http_client = AsyncHttpClient(
+        settings=app_settings.scraping_settings,
+        rate_limiter=TokenBucketRateLimiter(settings=app_settings.scraping_settings),
+    )
+
+    # the same table of contents is configured once per selector,
+    # group them by page_id to download and parse each page once
+    pages: dict[str, list[TableOfContents]] = {}
 
-    # make them unique by page_id
-    pages = {p.page_id: p for p in pages}.values()
+    for p in app_settings.scraping_settings.start_pages:
+        if p.entity_type in entity_types:
+            pages.setdefault(p.page_id, []).append(p)
 
     tasks: list[PrefectFuture] = []
 
     stats_collector = RedisStatsCollector(
-        redis_dsn=app_settings.stats_settings.redis_dsn
+        redis_dsn=app_settings.stats_settings.redis_dsn,
+        max_connections=app_settings.stats_settings.redis_max_connections,
+        flush_interval=app_settings.stats_settings.flush_interval,
     )
     stats_collector.on_init()
 
-    for _, config in enumerate(pages):
+    # a page linked by several tables of contents is downloaded once
+    page_registry = RedisPageRegistry(
+        redis_dsn=app_settings.storage_settings.redis_dsn,
+        ttl=app_settings.scraping_settings.cache_expire_after,
+        max_connections=app_settings.storage_settings.redis_max_connections,
+    )
+
+    # an interrupted run resumes from the links not downloaded yet
+    frontier = RedisFrontier(
+        redis_dsn=app_settings.storage_settings.redis_dsn,
+        ttl=app_settings.scraping_settings.frontier_expire_after,
+        max_connections=app_settings.storage_settings.redis_max_connections,
+    )
+
+    html_stores: dict[str, RedisTextStorage] = {}
+
+    for entity_type in entity_types:
+
+        cls = get_entity_class(entity_type)
+
+        html_stores[entity_type] = RedisTextStorage[cls](
+            redis_dsn=app_settings.storage_settings.redis_dsn,
+            max_connections=app_settings.storage_settings.redis_max_connections,
+            batch_size=app_settings.storage_settings.redis_batch_size,
+            compression=app_settings.storage_settings.html_compression,
+            compression_level=app_settings.storage_settings.html_compression_level,
+        )
+        html_stores[entity_type].on_init()
 
-        cls = get_entity_class(config.entity_type)
+    for page_id, configs in pages.items():
 
-        html_store = RedisTextStorage[cls](
-            redis_dsn=app_settings.storage_settings.redis_dsn
+        cache_key = "-".join(
+            ["scraping", page_id, *sorted({c.entity_type for c in configs})]
         )
-        html_store.on_init()
 
         tasks.append(
             execute_task.with_options(
-                cache_key_fn=lambda *_: f"scraping-{config.page_id}",
+                cache_key_fn=lambda *_, key=cache_key: key,
                 retries=app_settings.prefect_settings.task_retry_attempts,
                 retry_delay_seconds=exponential_backoff(
                     backoff_factor=app_settings.prefect_settings.task_retry_backoff_factor
@@ -70,12 +112,14 @@ def scraping_flow(
                 retry_condition_fn=is_http_task_retriable,
                 refresh_cache=app_settings.prefect_settings.cache_disabled,
             ).submit(
-                page=config,
+                page=configs,
                 scraping_settings=app_settings.scraping_settings,
                 http_client=http_client,
-                storage_handler=html_store,
+                storage_handler=html_stores,
                 return_results=False,
                 stats_collector=stats_collector,
+                page_registry=page_registry,
+                frontier=frontier,
             )
         )
 
@@ -12,6 +12,14 @@ from src.exceptions import (
 )
 
 
+def is_http_error_retriable(e: Exception) -> bool:
+    """determine if a HTTP request failing with the given error may succeed when sent again"""
+
+    return (isinstance(e, HttpError) and e.status_code >= 429) or isinstance(
+        e, TimeoutError
+    )
+
+
 def is_http_task_retriable(
     task: Task[..., Any], task_run: TaskRun, state: State[Any]
 ) -> bool:
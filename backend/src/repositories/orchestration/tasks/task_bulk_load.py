@@ -0,0 +1,33 @@
+from logging import Logger
+
+from prefect import task
+
+from src.entities.composable import Composable
+from src.interfaces.storage import IBulkLoadableStorageHandler, IStorageHandler
+
+from .logger import get_logger
+
+
+@task(
+    name="Bulk Load Task",
+    description="Scans an input storage and bulk loads its entities into an empty output storage.",
+)
+def execute_task(
+    input_storage: IStorageHandler[Composable],
+    output_storage: IBulkLoadableStorageHandler[Composable],
+) -> int:
+    """the entities are streamed from the input storage, they are not held in memory
+
+    Returns:
+        int: the number of entities loaded
+    """
+
+    logger: Logger = get_logger()
+
+    count = output_storage.bulk_load(
+        contents=(content for _, content in input_storage.scan())
+    )
+
+    logger.info(f"Bulk loaded {count} entities")
+
+    return count
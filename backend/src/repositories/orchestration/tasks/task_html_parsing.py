@@ -13,7 +13,7 @@ from src.interfaces.analyzer import IContentAnalyzer
 from src.interfaces.nlp_processor import Processor
 from src.interfaces.resolver import ResolutionConfiguration
 from src.interfaces.stats import IStatsCollector, StatKey
-from src.interfaces.storage import IStorageHandler
+from src.interfaces.storage import IEvictableStorageHandler, IStorageHandler
 from src.repositories.html_parser.html_chopper import Html2TextSectionsChopper
 from src.repositories.html_parser.html_splitter import WikipediaAPIContentSplitter
 from src.repositories.html_parser.wikipedia_info_retriever import WikipediaParser
@@ -201,7 +201,13 @@ def execute_task(
     analyzer: IContentAnalyzer = None,
     search_processor: Processor = None,
     stats_collector: IStatsCollector = None,
+    input_storage: IStorageHandler[str] | None = None,
 ) -> None:
+    """extracts the entity of an HTML content and stores it into the `output_storage`
+
+    Once the entity is stored, the retention policy of the `input_storage` is applied to the HTML content, if any
+    (see `IEvictableStorageHandler`).
+    """
 
     flow_id = runtime.flow_run.id
 
@@ -245,9 +251,13 @@ def execute_task(
 
         if entity is not None:
             stats_collector.inc_value(StatKey.EXTRACTION_SUCCESS, flow_id=flow_id)
-            output_storage.insert_many(
+            saved = output_storage.insert_many(
                 [entity],
             )
+
+            # the storages which don't count the contents saved return None
+            if isinstance(input_storage, IEvictableStorageHandler) and saved != 0:
+                input_storage.evict(content_id)
         else:
             if stats_collector:
                 stats_collector.inc_value(StatKey.EXTRACTION_VOID, flow_id=flow_id)
@@ -260,3 +270,9 @@ def execute_task(
 
         # re-raise for Prefect to handle retries if needed
         raise
+
+    finally:
+
+        # the stats buffered by the task are written when it ends
+        if stats_collector:
+            stats_collector.flush(flow_id)
@@ -1,12 +1,12 @@
 from logging import Logger
 
 from prefect import task
-from prefect.concurrency.sync import rate_limit
 from prefect.events import emit_event
 
 from src.entities.composable import Composable
 from src.entities.movie import Movie
 from src.entities.relationship import (
+    BaseRelationship,
     LooseRelationship,
     PeopleRelationshipType,
     RelationshipType,
@@ -15,25 +15,43 @@ from src.entities.relationship import (
 from src.exceptions import RetrievalError
 from src.interfaces.http_client import IHttpClient
 from src.interfaces.storage import IRelationshipHandler
-from src.repositories.wikipedia import get_page_id, get_permalink
+from src.repositories.wikipedia import (
+    PermalinkResolution,
+    get_page_id,
+    resolve_permalinks,
+)
+from src.settings import ScrapingSettings
 
 from .logger import get_logger
 
+# the fields read by `_related_names`, the other fields of the entities need not be loaded
+RELATED_FIELDS: dict[type[Composable], list[str]] = {
+    Movie: [
+        "specifications.directed_by",
+        "specifications.written_by",
+        "specifications.music_by",
+        "specifications.special_effects_by",
+        "influences",
+    ],
+}
 
-def connect_by_name(
+
+def find_relationship(
     entity: Composable,
     name: str,
     relation: RelationshipType,
     storage: IRelationshipHandler,
     http_client: IHttpClient,
-) -> None:
-    """Connects an entity to another entity.
+    settings: ScrapingSettings,
+    resolution: PermalinkResolution | None = None,
+) -> BaseRelationship | None:
+    """Finds the relationship of an entity to another entity, without storing it.
 
     Several cases are handled:
-    1. If the related entity identified by its `name` exists on Wikipedia and in the storage, a StrongRelationship is created.
+    1. If the related entity identified by its `name` exists on Wikipedia and in the storage, a StrongRelationship is returned.
     2. If the related entity exists on Wikipedia but not in the storage, an event is emitted to extract the entity later
-         (e.g., via another task).
-    3. If the related entity does not exist on Wikipedia, a LooseRelationship is created.
+         (e.g., via another task), and None is returned.
+    3. If the related entity does not exist on Wikipedia, a LooseRelationship is returned.
 
     Args:
         entity (Composable): The source entity.
@@ -41,14 +59,36 @@ def connect_by_name(
         relation (RelationshipType): The type of relationship.
         storage (IRelationshipHandler): The storage handler for relationships.
         http_client (IHttpClient): The HTTP client for making requests.
+        settings (ScrapingSettings): The scraping settings.
+        resolution (PermalinkResolution | None, optional): the permalinks resolved beforehand for several names,
+            when the name is not part of it, its permalink is retrieved from Wikipedia. Defaults to None.
 
     Returns:
-        Relationship | None: The created relationship or None if unsuccessful.
+        BaseRelationship | None: The relationship or None if the related entity is not available yet.
     """
     logger: Logger = get_logger()
     try:
-        rate_limit("api-rate-limiting", occupy=1)
-        permalink = get_permalink(name=name, http_client=http_client)
+        if resolution is None or (
+            name not in resolution.permalinks and name not in resolution.missing
+        ):
+            resolution = resolve_permalinks(
+                names=[name], http_client=http_client, settings=settings
+            )
+
+        if name in resolution.missing:
+            # case 3:
+            # the entity does not exist on Wikipedia
+            return LooseRelationship(
+                from_entity=entity,
+                to_title=name,
+                relation_type=relation,
+            )
+
+        permalink = resolution.permalinks.get(name)
+
+        if permalink is None:
+            logger.warning(f"Invalid name provided: '{name}'")
+            return None
 
         # query the storage for the entity by its permalink
         results = storage.query(
@@ -57,37 +97,111 @@ def connect_by_name(
         )
 
         if results is not None and len(results) > 0:
-            storage.add_relationship(
-                relationship=StrongRelationship(
-                    from_entity=entity,
-                    to_entity=results[0],
-                    relation_type=relation,
-                )
-            )
-        else:
-            page_id = get_page_id(permalink=permalink)
-            emit_event(
-                event="extract.entity",
-                resource={"prefect.resource.id": page_id},
-                payload={"entity_type": storage.entity_type.__name__},
+            return StrongRelationship(
+                from_entity=entity,
+                to_entity=results[0],
+                relation_type=relation,
             )
 
+        page_id = get_page_id(permalink=permalink)
+        emit_event(
+            event="extract.entity",
+            resource={"prefect.resource.id": page_id},
+            payload={"entity_type": storage.entity_type.__name__},
+        )
+        return None
+
     except RetrievalError as e:
         if e.status_code == 404:
-            # case 1:
+            # case 3:
             # the entity does not exist on Wikipedia
-            storage.add_relationship(
-                relationship=LooseRelationship(
-                    from_entity=entity,
-                    to_title=name,
-                    relation_type=relation,
-                )
+            return LooseRelationship(
+                from_entity=entity,
+                to_title=name,
+                relation_type=relation,
             )
-        else:
-            # case 2:
-            logger.error(f"RetrievalError while connecting entity: {e}")
-            # re-raise the error or handle it as needed
-            raise
+
+        # case 2:
+        logger.error(f"RetrievalError while connecting entity: {e}")
+        # re-raise the error or handle it as needed
+        raise
+
+
+def connect_by_name(
+    entity: Composable,
+    name: str,
+    relation: RelationshipType,
+    storage: IRelationshipHandler,
+    http_client: IHttpClient,
+    settings: ScrapingSettings,
+    resolution: PermalinkResolution | None = None,
+) -> None:
+    """Connects an entity to another entity, see `find_relationship` for the cases handled.
+
+    Args:
+        entity (Composable): The source entity.
+        name (str): The name of the related entity.
+        relation (RelationshipType): The type of relationship.
+        storage (IRelationshipHandler): The storage handler for relationships.
+        http_client (IHttpClient): The HTTP client for making requests.
+        settings (ScrapingSettings): The scraping settings.
+        resolution (PermalinkResolution | None, optional): the permalinks resolved beforehand for several names.
+            Defaults to None.
+    """
+
+    relationship = find_relationship(
+        entity=entity,
+        name=name,
+        relation=relation,
+        storage=storage,
+        http_client=http_client,
+        settings=settings,
+        resolution=resolution,
+    )
+
+    if relationship is not None:
+        storage.add_relationship(relationship=relationship)
+
+
+def related_fields(entity_type: type[Composable]) -> list[str]:
+    """the fields of the entities of the given type required to discover their relationships,
+    to be used as a projection when loading them (see `RedisJsonStorage.scan`)
+    """
+
+    return RELATED_FIELDS.get(entity_type, [])
+
+
+def _related_names(entity: Composable) -> list[tuple[str, RelationshipType]]:
+    """the names of the persons related to the entity, with the type of their relationship"""
+
+    names: list[tuple[str, RelationshipType]] = []
+
+    if isinstance(entity, Movie):
+
+        specifications = entity.specifications
+
+        if specifications is not None:
+
+            # the persons that directed, wrote the script, composed the music of the film
+            for persons, relation in (
+                (specifications.directed_by, PeopleRelationshipType.DIRECTED_BY),
+                (specifications.written_by, PeopleRelationshipType.WRITTEN_BY),
+                (specifications.music_by, PeopleRelationshipType.COMPOSED_BY),
+            ):
+                for name in persons or []:
+                    names.append((name, relation))
+
+        # the persons that influenced the film
+        for influence in entity.influences or []:
+            for name in influence.persons or []:
+                names.append((name, PeopleRelationshipType.INFLUENCED_BY))
+
+        # the persons that did the special effects of the film
+        if specifications is not None:
+            for name in specifications.special_effects_by or []:
+                names.append((name, PeopleRelationshipType.SPECIAL_EFFECTS_BY))
+
+    return names
 
 
 @task(
@@ -97,6 +211,7 @@ def execute_task(
     entity: Composable,
     output_storage: IRelationshipHandler,
     http_client: IHttpClient,
+    settings: ScrapingSettings,
 ) -> Composable:
     """
     discovers relationships for a given entity and stores them in the graph database.
@@ -108,86 +223,41 @@ def execute_task(
         entity (Composable): The entity to analyze.
         output_storage (IRelationshipHandler): The storage handler to use for storing the relationships.
         http_client (IHttpClient): The HTTP client for making requests.
+        settings (ScrapingSettings): The scraping settings.
 
     """
 
-    if isinstance(entity, Movie):
-
-        if (
-            entity.specifications is not None
-            and entity.specifications.directed_by is not None
-        ):
-
-            for name in entity.specifications.directed_by:
+    names = _related_names(entity)
 
-                connect_by_name(
-                    entity=entity,
-                    name=name,
-                    relation=PeopleRelationshipType.DIRECTED_BY,
-                    storage=output_storage,
-                    http_client=http_client,
-                )
+    if not names:
+        return entity
 
-        # retrieve the persons that wrote the script of the film
-        if (
-            entity.specifications is not None
-            and entity.specifications.written_by is not None
-        ):
+    # the permalinks of all the names are retrieved at once
+    resolution = resolve_permalinks(
+        names=[name for name, _ in names],
+        http_client=http_client,
+        settings=settings,
+    )
 
-            for name in entity.specifications.written_by:
+    relationships: list[BaseRelationship] = []
 
-                connect_by_name(
-                    entity=entity,
-                    name=name,
-                    relation=PeopleRelationshipType.WRITTEN_BY,
-                    storage=output_storage,
-                    http_client=http_client,
-                )
+    for name, relation in names:
 
-        # retrieve the persons that composed the music of the film
-        if (
-            entity.specifications is not None
-            and entity.specifications.music_by is not None
-        ):
-
-            for name in entity.specifications.music_by:
-
-                connect_by_name(
-                    entity=entity,
-                    name=name,
-                    relation=PeopleRelationshipType.COMPOSED_BY,
-                    storage=output_storage,
-                    http_client=http_client,
-                )
-
-        # retrieve the persons that influenced the film
-        if entity.influences is not None and len(entity.influences) > 0:
-            for influence in entity.influences:
-                if influence.persons is not None and len(influence.persons) > 0:
-                    for name in influence.persons:
-
-                        connect_by_name(
-                            entity=entity,
-                            name=name,
-                            relation=PeopleRelationshipType.INFLUENCED_BY,
-                            storage=output_storage,
-                            http_client=http_client,
-                        )
-
-        # retrieve the persons that did the special effects of the film
-        if (
-            entity.specifications is not None
-            and entity.specifications.special_effects_by is not None
-        ):
+        relationship = find_relationship(
+            entity=entity,
+            name=name,
+            relation=relation,
+            storage=output_storage,
+            http_client=http_client,
+            settings=settings,
+            resolution=resolution,
+        )
 
-            for name in entity.specifications.special_effects_by:
+        if relationship is not None:
+            relationships.append(relationship)
 
-                connect_by_name(
-                    entity=entity,
-                    name=name,
-                    relation=PeopleRelationshipType.SPECIAL_EFFECTS_BY,
-                    storage=output_storage,
-                    http_client=http_client,
-                )
+    # the relationships of the entity are written at once
+    if relationships:
+        output_storage.add_relationships(relationships)
 
     return entity
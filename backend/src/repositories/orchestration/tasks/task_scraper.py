@@ -1,24 +1,106 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import inspect
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextvars import copy_context
 from logging import Logger
+from typing import Mapping, Sequence
 
 from prefect import runtime, task
-from prefect.concurrency.sync import rate_limit
 
 from src.entities.content import PageLink, TableOfContents
 from src.exceptions import HttpError
+from src.interfaces.frontier import IFrontier, LinkStatus
 from src.interfaces.http_client import IHttpClient
 from src.interfaces.info_retriever import IContentParser
+from src.interfaces.page_registry import IPageRegistry
 from src.interfaces.stats import IStatsCollector, StatKey
-from src.interfaces.storage import IStorageHandler
+from src.interfaces.storage import IStorageHandler, IVersionedStorageHandler
 from src.repositories.html_parser.wikipedia_info_retriever import WikipediaParser
-from src.repositories.wikipedia import download_page
+from src.repositories.http.cache_storage import track_cache_usage
+from src.repositories.http.event_loop import run_coroutine
+from src.repositories.wikipedia import download_page_async, get_revision_ids_async
 from src.settings import ScrapingSettings
 
 from .logger import get_logger
+from .retry import is_http_error_retriable
 
 
-def download_and_store(
+class _ThreadedHttpClient:
+    """sends the requests of a synchronous HTTP client in worker threads, so that they can be awaited"""
+
+    def __init__(self, http_client: IHttpClient, executor: Executor | None = None):
+        self._http_client = http_client
+        self._executor = executor
+
+    async def send(self, *args, **kwargs) -> dict | str:
+
+        # the request runs in a copy of the task context to log into the task run
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(
+                copy_context().run, self._http_client.send, *args, **kwargs
+            ),
+        )
+
+
+def _as_async_client(
+    http_client: IHttpClient, executor: Executor | None = None
+) -> IHttpClient:
+    """the scraping is asynchronous, the synchronous clients send their requests in the threads of the `executor`,
+    or of the default executor of the event loop
+    """
+
+    if inspect.iscoroutinefunction(http_client.send):
+        return http_client
+
+    return _ThreadedHttpClient(http_client, executor)
+
+
+def _retry_delay(attempt: int, scraping_settings: ScrapingSettings) -> float | None:
+    """the delay before retrying a download after the given failed attempt, None when no attempt is left"""
+
+    if attempt >= scraping_settings.link_retry_attempts:
+        return None
+
+    return scraping_settings.link_retry_backoff * 2**attempt
+
+
+async def _download_page_with_retries(
+    http_client: IHttpClient,
+    page_id: str,
+    scraping_settings: ScrapingSettings,
+) -> str | None:
+    """downloads the page, retrying on retriable HTTP errors"""
+
+    attempt = 0
+
+    while True:
+
+        try:
+            return await download_page_async(
+                http_client=http_client,
+                page_id=page_id,
+                settings=scraping_settings,
+            )
+
+        except (HttpError, TimeoutError) as e:
+
+            delay = _retry_delay(attempt, scraping_settings)
+
+            if delay is None or not is_http_error_retriable(e):
+                raise
+
+            get_logger().warning(
+                f"Failed to download '{page_id}' ({e}), retrying in {delay}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+async def download_and_store_async(
     http_client: IHttpClient,
     page_id: str,
     storage_handler: IStorageHandler,
@@ -26,33 +108,44 @@ def download_and_store(
     scraping_settings: ScrapingSettings,
     stats_collector: IStatsCollector | None = None,
     flow_id: str | None = None,
+    revision_id: int | None = None,
 ) -> str | None:
     """
     Helper function to download a page and update stats.
+
+    The download is retried on its own on retriable HTTP errors (see `ScrapingSettings.link_retry_attempts`),
+    the stats account for the final outcome of the page.
+
+    When the `revision_id` of the page is known, it is stored along with the content
+    so that the page is not downloaded again as long as it does not change.
+
+    The storage and the stats collector being synchronous, they are called in a worker thread
+    not to block the other downloads.
     """
 
-    try:
+    http_client = _as_async_client(http_client)
 
-        rate_limit("api-rate-limiting", occupy=1)
+    try:
 
-        html = download_page(
+        html = await _download_page_with_retries(
             http_client=http_client,
             page_id=page_id,
-            storage_handler=storage_handler,
-            return_content=return_content,
-            settings=scraping_settings,
+            scraping_settings=scraping_settings,
         )
 
         if stats_collector:
-            if html is not None:
-                stats_collector.inc_value(StatKey.SCRAPING_SUCCESS, flow_id=flow_id)
-            else:
-                stats_collector.inc_value(StatKey.SCRAPING_VOID, flow_id=flow_id)
+            await asyncio.to_thread(
+                stats_collector.inc_value,
+                StatKey.SCRAPING_SUCCESS if html is not None else StatKey.SCRAPING_VOID,
+                flow_id=flow_id,
+            )
 
         if html is not None and storage_handler is not None:
-            storage_handler.insert(
+            await asyncio.to_thread(
+                storage_handler.insert,
                 content_id=page_id,
                 content=html,
+                **({"revision_id": revision_id} if revision_id is not None else {}),
             )
 
         if return_content:
@@ -64,18 +157,166 @@ def download_and_store(
 
         if e.status_code == 404:
             if stats_collector:
-                stats_collector.inc_value(StatKey.SCRAPING_VOID, flow_id=flow_id)
+                await asyncio.to_thread(
+                    stats_collector.inc_value, StatKey.SCRAPING_VOID, flow_id=flow_id
+                )
             return None
         else:
             if stats_collector:
-                stats_collector.inc_value(StatKey.SCRAPING_FAILED, flow_id=flow_id)
+                await asyncio.to_thread(
+                    stats_collector.inc_value, StatKey.SCRAPING_FAILED, flow_id=flow_id
+                )
             # eventually retry or fail
             raise
 
 
-def extract_page_links(
+def download_and_store(
+    http_client: IHttpClient,
+    page_id: str,
+    storage_handler: IStorageHandler,
+    return_content: bool,
+    scraping_settings: ScrapingSettings,
+    stats_collector: IStatsCollector | None = None,
+    flow_id: str | None = None,
+    revision_id: int | None = None,
+) -> str | None:
+    """
+    Same as `download_and_store_async`, for synchronous callers.
+    """
+
+    return run_coroutine(
+        download_and_store_async(
+            http_client=http_client,
+            page_id=page_id,
+            storage_handler=storage_handler,
+            return_content=return_content,
+            scraping_settings=scraping_settings,
+            stats_collector=stats_collector,
+            flow_id=flow_id,
+            revision_id=revision_id,
+        )
+    )
+
+
+def _select_changed_links(
+    page_links: list[PageLink],
+    revisions: dict[str, int],
+    stored_revisions: dict[str, int],
+) -> list[PageLink]:
+    """retains the links which revision is unknown, or differs from the revision stored"""
+
+    return [
+        link
+        for link in page_links
+        if link.page_id not in revisions
+        or stored_revisions.get(link.page_id) != revisions[link.page_id]
+    ]
+
+
+async def discard_unchanged_links_async(
+    http_client: IHttpClient,
+    page_links: list[PageLink],
+    storage_handler: IStorageHandler,
+    scraping_settings: ScrapingSettings,
+    stats_collector: IStatsCollector | None = None,
+    flow_id: str | None = None,
+) -> tuple[list[PageLink], dict[str, int]]:
+    """
+    checks the latest revision of the linked pages on Wikipedia against the revision stored,
+    and discards the pages which did not change since they were stored.
+
+    The check is skipped when disabled in the settings, or when the storage does not keep track of revisions;
+    if the revisions cannot be retrieved, all the pages are kept.
+
+    Returns:
+        tuple[list[PageLink], dict[str, int]]: the links to download,
+            and the latest revision id of the linked pages
+    """
+
+    if (
+        not page_links
+        or not scraping_settings.skip_unchanged_pages
+        or not isinstance(storage_handler, IVersionedStorageHandler)
+    ):
+        return page_links, {}
+
+    logger: Logger = get_logger()
+
+    page_ids = [link.page_id for link in page_links]
+
+    try:
+
+        revisions = await get_revision_ids_async(
+            page_ids,
+            http_client=_as_async_client(http_client),
+            settings=scraping_settings,
+        )
+
+    except HttpError as e:
+        logger.warning(f"Revisions could not be checked, downloading all pages: {e}")
+        return page_links, {}
+
+    changed_links = _select_changed_links(
+        page_links,
+        revisions=revisions,
+        stored_revisions=await asyncio.to_thread(
+            storage_handler.select_revisions, page_ids
+        ),
+    )
+
+    if stats_collector and len(changed_links) < len(page_links):
+        await asyncio.to_thread(
+            stats_collector.inc_value,
+            StatKey.SCRAPING_UNCHANGED,
+            flow_id=flow_id,
+            count=len(page_links) - len(changed_links),
+        )
+
+    return changed_links, revisions
+
+
+def discard_unchanged_links(
+    http_client: IHttpClient,
+    page_links: list[PageLink],
+    storage_handler: IStorageHandler,
+    scraping_settings: ScrapingSettings,
+    stats_collector: IStatsCollector | None = None,
+    flow_id: str | None = None,
+) -> tuple[list[PageLink], dict[str, int]]:
+    """
+    Same as `discard_unchanged_links_async`, for synchronous callers.
+    """
+
+    return run_coroutine(
+        discard_unchanged_links_async(
+            http_client=http_client,
+            page_links=page_links,
+            storage_handler=storage_handler,
+            scraping_settings=scraping_settings,
+            stats_collector=stats_collector,
+            flow_id=flow_id,
+        )
+    )
+
+
+def _as_configs(
+    page: TableOfContents | Sequence[TableOfContents],
+) -> list[TableOfContents]:
+    """the configurations of a table of contents, which all share the same `page_id`"""
+
+    configs = [page] if isinstance(page, TableOfContents) else list(page)
+
+    if len({config.page_id for config in configs}) > 1:
+        raise ValueError(
+            f"The tables of contents must share the same page_id: {[c.page_id for c in configs]}"
+        )
+
+    return configs
+
+
+async def extract_page_links_async(
     http_client: IHttpClient,
-    config: TableOfContents,
+    config: TableOfContents | Sequence[TableOfContents],
     link_extractor: IContentParser,
     scraping_settings: ScrapingSettings,
 ) -> list[PageLink]:
@@ -83,7 +324,9 @@ def extract_page_links(
     downloads the HTML page and extracts the links from it.
 
     Args:
-        page (WikiTOCPageConfig): The configuration for the page to be downloaded.
+        config (TableOfContents | Sequence[TableOfContents]): The configuration(s) for the page to be downloaded;
+            when several configurations of the same page are given, the page is downloaded and parsed once,
+            and the links of every configuration are returned.
 
     Returns:
         list[PageLink]: A list of page links.
@@ -91,12 +334,11 @@ def extract_page_links(
 
     logger: Logger = get_logger()
 
-    rate_limit("api-rate-limiting", occupy=1)
+    configs = _as_configs(config)
 
-    html = download_page(
-        http_client=http_client,
-        page_id=config.page_id,
-        return_content=True,  # return the content
+    html = await download_page_async(
+        http_client=_as_async_client(http_client),
+        page_id=configs[0].page_id,
         settings=scraping_settings,
     )
 
@@ -107,7 +349,7 @@ def extract_page_links(
 
         _links = link_extractor.retrieve_inner_links(
             html_content=html,
-            config=config,
+            config=configs,
         )
 
         return _links
@@ -118,29 +360,401 @@ def extract_page_links(
         return []
 
 
+def extract_page_links(
+    http_client: IHttpClient,
+    config: TableOfContents | Sequence[TableOfContents],
+    link_extractor: IContentParser,
+    scraping_settings: ScrapingSettings,
+) -> list[PageLink]:
+    """
+    Same as `extract_page_links_async`, for synchronous callers.
+    """
+
+    return run_coroutine(
+        extract_page_links_async(
+            http_client=http_client,
+            config=config,
+            link_extractor=link_extractor,
+            scraping_settings=scraping_settings,
+        )
+    )
+
+
+def discard_seen_links(
+    page_registry: IPageRegistry | None,
+    page_links: list[PageLink],
+    stats_collector: IStatsCollector | None = None,
+    flow_id: str | None = None,
+) -> list[PageLink]:
+    """
+    discards the pages already downloaded by another task, in this flow run or within the TTL of the registry;
+    the pages returned are claimed in the registry and must be released if they cannot be downloaded.
+    """
+
+    if page_registry is None or not page_links:
+        return page_links
+
+    try:
+
+        claimed_links = page_registry.claim(page_links, flow_id=flow_id)
+
+    except Exception as e:
+        get_logger().warning(
+            f"Error reading the pages already downloaded, all the pages are kept: {e}"
+        )
+        return page_links
+
+    if stats_collector and len(claimed_links) < len(page_links):
+        stats_collector.inc_value(
+            StatKey.SCRAPING_DUPLICATE,
+            flow_id=flow_id,
+            count=len(page_links) - len(claimed_links),
+        )
+
+    return claimed_links
+
+
+def _take_over_links(
+    page_registry: IPageRegistry | None,
+    page_links: list[PageLink],
+    flow_id: str | None,
+) -> None:
+    """claims the links left pending by an interrupted scraping, whatever flow run claimed them"""
+
+    if page_registry is None or not page_links:
+        return
+
+    try:
+        page_registry.take_over(page_links, flow_id=flow_id)
+    except Exception as e:
+        get_logger().error(f"Error claiming {len(page_links)} pages: {e}")
+
+
+def _release_links(
+    page_registry: IPageRegistry | None,
+    page_links: list[PageLink],
+    flow_id: str | None,
+) -> None:
+    """releases the pages which could not be downloaded, so that the task can download them on retry"""
+
+    if page_registry is None or not page_links:
+        return
+
+    try:
+        page_registry.release(page_links, flow_id=flow_id)
+    except Exception as e:
+        get_logger().error(f"Error releasing {len(page_links)} pages: {e}")
+
+
+def _frontier_id(page: PageLink | Sequence[TableOfContents]) -> str | None:
+    """identifies the frontier of a table of contents by its page and entity types, None for a single page"""
+
+    if not isinstance(page, (TableOfContents, Sequence)):
+        return None
+
+    configs = _as_configs(page)
+
+    return "-".join([configs[0].page_id, *sorted({c.entity_type for c in configs})])
+
+
+def _load_frontier(
+    frontier: IFrontier | None,
+    frontier_id: str | None,
+    page_registry: IPageRegistry | None,
+    flow_id: str | None,
+) -> list[PageLink] | None:
+    """the links of an interrupted scraping of the table of contents which remain to be downloaded"""
+
+    if frontier is None or frontier_id is None:
+        return None
+
+    try:
+        page_links = frontier.load(frontier_id)
+    except Exception as e:
+        get_logger().error(
+            f"Error loading the frontier '{frontier_id}', the table of contents is scraped again: {e}"
+        )
+        return None
+
+    if page_links is not None:
+        get_logger().info(
+            f"Resuming '{frontier_id}' with {len(page_links)} links left to download"
+        )
+
+        # the interrupted scraping, of this flow run or of a crashed one, claimed these links
+        # without downloading them: they are claimed again so that this flow run downloads them
+        _take_over_links(page_registry, page_links, flow_id)
+
+    return page_links
+
+
+def _save_frontier(
+    frontier: IFrontier | None, frontier_id: str | None, page_links: list[PageLink]
+) -> None:
+    """the frontier is only used to resume the scraping, errors are logged and ignored"""
+
+    if frontier is None or frontier_id is None:
+        return
+
+    try:
+        frontier.save(frontier_id, page_links)
+    except Exception as e:
+        get_logger().error(f"Error saving the frontier '{frontier_id}': {e}")
+
+
+def _clear_frontier(frontier: IFrontier | None, frontier_id: str | None) -> None:
+    """the frontier is only used to resume the scraping, errors are logged and ignored"""
+
+    if frontier is None or frontier_id is None:
+        return
+
+    try:
+        frontier.clear(frontier_id)
+    except Exception as e:
+        get_logger().error(f"Error clearing the frontier '{frontier_id}': {e}")
+
+
+def _mark_links(
+    frontier: IFrontier | None,
+    frontier_id: str | None,
+    page_links: list[PageLink],
+    status: LinkStatus,
+) -> None:
+    """the status of the links is only used to resume the scraping, errors are logged and ignored"""
+
+    if frontier is None or frontier_id is None or not page_links:
+        return
+
+    try:
+        frontier.mark(frontier_id, page_links, status)
+    except Exception as e:
+        get_logger().error(f"Error marking {len(page_links)} links as {status}: {e}")
+
+
+def _mark_discarded_links(
+    frontier: IFrontier | None,
+    frontier_id: str | None,
+    page_links: list[PageLink],
+    kept_links: list[PageLink],
+) -> None:
+    """the links discarded as unchanged don't need to be downloaded;
+    the links claimed by another task are left pending, so that a resumed scraping downloads them
+    in case that task does not
+    """
+
+    kept_ids = {link.page_id for link in kept_links}
+
+    _mark_links(
+        frontier,
+        frontier_id,
+        [link for link in page_links if link.page_id not in kept_ids],
+        LinkStatus.DONE,
+    )
+
+
+def _group_by_storage(
+    page_links: list[PageLink],
+    storage_handler: IStorageHandler | Mapping[str, IStorageHandler],
+) -> list[tuple[IStorageHandler, list[PageLink]]]:
+    """groups the links by the storage handler of their entity type"""
+
+    if not isinstance(storage_handler, Mapping):
+        return [(storage_handler, page_links)] if page_links else []
+
+    groups: dict[str, list[PageLink]] = {}
+
+    for link in page_links:
+        groups.setdefault(link.entity_type, []).append(link)
+
+    for entity_type in groups.keys() - storage_handler.keys():
+        get_logger().warning(
+            f"No storage for entity type '{entity_type}', {len(groups[entity_type])} links are skipped"
+        )
+
+    return [
+        (storage_handler[entity_type], links)
+        for entity_type, links in groups.items()
+        if entity_type in storage_handler
+    ]
+
+
+async def _execute_async(
+    page: PageLink | Sequence[TableOfContents],
+    scraping_settings: ScrapingSettings,
+    http_client: IHttpClient,
+    storage_handler: IStorageHandler | Mapping[str, IStorageHandler],
+    link_extractor: IContentParser | None,
+    stats_collector: IStatsCollector | None,
+    flow_id: str | None,
+    page_registry: IPageRegistry | None = None,
+    frontier: IFrontier | None = None,
+) -> set[str | None]:
+    """
+    downloads all the links of the page at once; the concurrency is bounded by the asynchronous `http_client` itself,
+    or by the number of threads sending the requests of a synchronous client.
+    """
+
+    frontier_id = _frontier_id(page)
+
+    executor = None
+
+    if not inspect.iscoroutinefunction(http_client.send):
+        executor = ThreadPoolExecutor(max_workers=scraping_settings.max_concurrency)
+        http_client = _as_async_client(http_client, executor)
+
+    async def _download_and_store(
+        page_link: PageLink,
+        storage_handler: IStorageHandler,
+        revision_id: int | None,
+    ) -> str | None:
+        try:
+            content_id = await download_and_store_async(
+                http_client=http_client,
+                page_id=page_link.page_id,
+                storage_handler=storage_handler,
+                return_content=False,  # for memory constraints, return the content ID
+                scraping_settings=scraping_settings,
+                stats_collector=stats_collector,
+                flow_id=flow_id,
+                revision_id=revision_id,
+            )
+        except BaseException:
+            await asyncio.to_thread(_release_links, page_registry, [page_link], flow_id)
+            await asyncio.to_thread(
+                _mark_links, frontier, frontier_id, [page_link], LinkStatus.FAILED
+            )
+            raise
+
+        await asyncio.to_thread(
+            _mark_links,
+            frontier,
+            frontier_id,
+            [page_link],
+            LinkStatus.DONE if content_id is not None else LinkStatus.VOID,
+        )
+
+        return content_id
+
+    try:
+
+        # resume the scraping of the table of contents if it was interrupted,
+        # the links of the frontier are already claimed by this flow run
+        page_links = await asyncio.to_thread(
+            _load_frontier, frontier, frontier_id, page_registry, flow_id
+        )
+        is_resumed = page_links is not None
+
+        if page_links is None and isinstance(page, (TableOfContents, Sequence)):
+            page_links = await extract_page_links_async(
+                http_client=http_client,
+                config=page,
+                link_extractor=link_extractor,
+                scraping_settings=scraping_settings,
+            )
+            await asyncio.to_thread(_save_frontier, frontier, frontier_id, page_links)
+
+        elif page_links is None:
+            page_links = [page]
+
+        content_ids: set[str | None] = set()
+        errors: list[BaseException] = []
+
+        for _storage_handler, links in _group_by_storage(
+            [link for link in page_links if isinstance(link, PageLink)],
+            storage_handler,
+        ):
+
+            # don't download the pages already downloaded by other tasks
+            if not is_resumed:
+                links = await asyncio.to_thread(
+                    discard_seen_links,
+                    page_registry,
+                    links,
+                    stats_collector=stats_collector,
+                    flow_id=flow_id,
+                )
+
+            claimed_links = links
+
+            # don't download again the pages which did not change
+            links, revisions = await discard_unchanged_links_async(
+                http_client=http_client,
+                page_links=links,
+                storage_handler=_storage_handler,
+                scraping_settings=scraping_settings,
+                stats_collector=stats_collector,
+                flow_id=flow_id,
+            )
+
+            await asyncio.to_thread(
+                _mark_discarded_links, frontier, frontier_id, claimed_links, links
+            )
+
+            # a failing link does not interrupt the others, the first error is raised once they are all done
+            results = await asyncio.gather(
+                *[
+                    _download_and_store(
+                        page_link,
+                        storage_handler=_storage_handler,
+                        revision_id=revisions.get(page_link.page_id),
+                    )
+                    for page_link in links
+                ],
+                return_exceptions=True,
+            )
+
+            errors.extend(r for r in results if isinstance(r, BaseException))
+            content_ids.update(r for r in results if not isinstance(r, BaseException))
+
+        if errors:
+            raise errors[0]
+
+        # all the links are processed, the next scraping starts from the table of contents again
+        await asyncio.to_thread(_clear_frontier, frontier, frontier_id)
+
+        return content_ids
+
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _task_run_name() -> str:
+
+    page = runtime.task_run.parameters["page"]
+    page_id = page.page_id if isinstance(page, PageLink) else page[0].page_id
+
+    return f"execute_task-{page_id}"
+
+
 @task(
-    task_run_name="execute_task-{page.page_id}",
+    task_run_name=_task_run_name,
     tags=["scraping"],  # mark as scraping task
 )
 def execute_task(
-    page: PageLink,
+    page: PageLink | Sequence[TableOfContents],
     scraping_settings: ScrapingSettings,
     http_client: IHttpClient,
-    storage_handler: IStorageHandler,
+    storage_handler: IStorageHandler | Mapping[str, IStorageHandler],
     link_extractor: IContentParser | None = WikipediaParser(),
     return_results: bool = False,
     stats_collector: IStatsCollector | None = None,
+    page_registry: IPageRegistry | None = None,
+    frontier: IFrontier | None = None,
 ) -> list[str] | None:
     """
     Entry point to scrape a page and store its HTML content. This function
     runs the task to download the HTML content of a page and store it using the provided storage handler.
     - If the `page` is a `TableOfContents`, it will first extract the links from the table of contents
     and then download each linked page.
+    - If the `page` is a sequence of `TableOfContents` of the same page (e.g. one selector per entity type),
+    the table of contents is downloaded and parsed once, and the links of every selector are downloaded.
     - If the `page` is a `PageLink`, it will directly download the page.
 
     Args:
-        page (PageLink): The permalink to the page to be downloaded.
-        storage_handler (IStorageHandler): the storage handler to use for storing the content that is downloaded.
+        page (PageLink | Sequence[TableOfContents]): The permalink to the page to be downloaded.
+        storage_handler (IStorageHandler | Mapping[str, IStorageHandler]): the storage handler to use for storing the content that is downloaded,
+            or the storage handlers by entity type when the links target several entity types.
         link_extractor (IContentParser | None, optional): The link extractor to use for extracting links from a table of contents.
             Defaults to `WikipediaParser`.
         return_results (bool, optional): Defaults to False.
@@ -150,6 +764,14 @@ def execute_task(
             Defaults to None.
         scraping_settings (ScrapingSettings): The scraping settings to use for the scraping process.
         http_client (IHttpClient): The HTTP client to use for making requests.
+            The links are downloaded concurrently, over the connections of an asynchronous client (e.g. `AsyncHttpClient`)
+            or in up to `ScrapingSettings.max_concurrency` threads for a synchronous client.
+        page_registry (IPageRegistry | None, optional): The registry of the pages already downloaded,
+            shared by the tasks of the flow run so that a page linked by several tables of contents is downloaded once.
+            Defaults to None.
+        frontier (IFrontier | None, optional): Persists the links of the table of contents with their status,
+            so that an interrupted scraping resumes from the links not downloaded yet
+            instead of downloading the table of contents again. Defaults to None.
 
     Returns:
         list[str] | None: a list of `page_id` stored into the storage backend
@@ -158,34 +780,41 @@ def execute_task(
 
     flow_id = runtime.flow_run.id
 
-    if isinstance(page, TableOfContents):
-        # extract the links from the table of contents
-        page_links = extract_page_links(
-            http_client=http_client,
-            config=page,
-            link_extractor=link_extractor,
-            scraping_settings=scraping_settings,
-        )
-    else:
-        page_links = [page]
-
-    content_ids: set[str | None] = set()
+    with track_cache_usage() as cache_usage:
 
-    for page_link in page_links:
-        if isinstance(page_link, PageLink):
+        try:
 
-            content_ids.add(
-                download_and_store(
+            # the links are downloaded in the event loop of the process,
+            # so that the connections of an asynchronous client are kept alive from one task to the next
+            content_ids = run_coroutine(
+                _execute_async(
+                    page=page,
+                    scraping_settings=scraping_settings,
                     http_client=http_client,
-                    page_id=page_link.page_id,
                     storage_handler=storage_handler,
-                    return_content=False,  # for memory constraints, return the content ID
-                    scraping_settings=scraping_settings,
+                    link_extractor=link_extractor,
                     stats_collector=stats_collector,
                     flow_id=flow_id,
+                    page_registry=page_registry,
+                    frontier=frontier,
                 )
             )
 
+        finally:
+
+            if stats_collector:
+
+                # the responses of the task served by the HTTP cache, or downloaded
+                for key, count in (
+                    (StatKey.HTTP_CACHE_HIT, cache_usage["hits"]),
+                    (StatKey.HTTP_CACHE_MISS, cache_usage["misses"]),
+                ):
+                    if count:
+                        stats_collector.inc_value(key, flow_id=flow_id, count=count)
+
+                # the stats buffered by the task are written when it ends, even when it fails
+                stats_collector.flush(flow_id)
+
     # filter out None values
     content_ids = {cid for cid in content_ids if cid is not None}
 
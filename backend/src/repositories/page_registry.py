@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+
+from src.entities.content import PageLink
+from src.interfaces.page_registry import IPageRegistry
+from src.repositories.db.redis.pool import pooled_client
+
+
+class RedisPageRegistry(IPageRegistry):
+    """
+    Keeps track of the pages downloaded in Redis, with one key per page which expires after `ttl` seconds;
+    the pages are claimed atomically (`SET NX`) so that concurrent tasks never download the same page twice.
+    """
+
+    _key_prefix: str = "seen:"
+    redis_dsn: str
+    max_connections: int | None
+    ttl: int
+
+    def __init__(self, redis_dsn: str, ttl: int, max_connections: int | None = None):
+        """for serialization purposes, we store the dsn as a string not as a `RedisDsn` object
+
+        Args:
+            redis_dsn (str): the Redis DSN
+            ttl (int): the number of seconds a page is considered as downloaded,
+                e.g. the expiration time of the HTTP cache.
+            max_connections (int | None, optional): the size of the connection pool shared by the handlers
+                connecting to `redis_dsn` in the process. Defaults to None.
+        """
+        self.redis_dsn = redis_dsn
+        self.ttl = ttl
+        self.max_connections = max_connections
+
+    @contextmanager
+    def client(self):
+        with pooled_client(self.redis_dsn, self.max_connections) as _client:
+            yield _client
+
+    def _compose_key(self, page_link: PageLink) -> str:
+        return f"{self._key_prefix}{page_link.entity_type}:{page_link.page_id}"
+
+    def claim(self, page_links: list[PageLink], flow_id: str) -> list[PageLink]:
+
+        if not page_links:
+            return []
+
+        with self.client() as _client:
+
+            pipeline = _client.pipeline(transaction=False)
+
+            for page_link in page_links:
+                pipeline.set(
+                    self._compose_key(page_link), flow_id or "", nx=True, ex=self.ttl
+                )
+
+            claimed = pipeline.execute()
+
+        return [page_link for page_link, ok in zip(page_links, claimed) if ok]
+
+    def take_over(self, page_links: list[PageLink], flow_id: str) -> None:
+
+        if not page_links:
+            return
+
+        with self.client() as _client:
+
+            pipeline = _client.pipeline(transaction=False)
+
+            for page_link in page_links:
+                pipeline.set(self._compose_key(page_link), flow_id or "", ex=self.ttl)
+
+            pipeline.execute()
+
+    def release(self, page_links: list[PageLink], flow_id: str) -> None:
+
+        if not page_links:
+            return
+
+        with self.client() as _client:
+            # only the claims of the flow run are released, those of other flow runs expire with the TTL
+            _client.eval(
+                """
+                for i = 1, #KEYS do
+                    if redis.call('GET', KEYS[i]) == ARGV[1] then
+                        redis.call('DEL', KEYS[i])
+                    end
+                end
+                """,
+                len(page_links),
+                *[self._compose_key(page_link) for page_link in page_links],
+                flow_id or "",
+            )
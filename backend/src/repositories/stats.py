@@ -1,40 +1,72 @@
+import threading
+import time
 from contextlib import contextmanager
 
-import redis
 from loguru import logger
 
 from src.interfaces.stats import IStatsCollector, StatKey
+from src.repositories.db.redis.pool import pooled_client
+
+# the increments not flushed yet, by DSN and flow run, shared by the collectors of the process
+# as the collectors must remain serializable (see `RedisStatsCollector.flush`)
+# each increment is stored as (count, start)
+_buffers: dict[tuple[str, str], dict[str, tuple[int, int]]] = {}
+_last_flushes: dict[tuple[str, str], float] = {}
+_buffers_lock = threading.Lock()
 
 
 class RedisStatsCollector(IStatsCollector):
-    """A simple Redis stats collector implementation."""
+    """A simple Redis stats collector implementation.
+
+    The stats of a flow run are stored in a single hash `stats:<flow_id>`, one field per `StatKey`.
+    The increments are buffered by the process and flushed in a single round-trip (`HINCRBY`),
+    every `flush_interval` seconds, when the task ends (see `flush`) or when the stats are read.
+    """
 
     _key_prefix: str = "stats:"
     redis_dsn: str
+    max_connections: int | None
+    flush_interval: float
 
-    def __init__(self, redis_dsn: str):
-        """for serialization purposes, we store the dsn as a string not as a `RedisDsn` object"""
+    def __init__(
+        self,
+        redis_dsn: str,
+        max_connections: int | None = None,
+        flush_interval: float = 5.0,
+    ):
+        """for serialization purposes, we store the dsn as a string not as a `RedisDsn` object,
+        the connections are borrowed from a pool shared by the process (see `pooled_client`)
+
+        Args:
+            redis_dsn (str): the Redis DSN
+            max_connections (int | None, optional): the size of the connection pool. Defaults to None.
+            flush_interval (float, optional): the maximum duration the increments are buffered, in seconds.
+                0 to write each increment immediately. Defaults to 5.0.
+        """
         self.redis_dsn = redis_dsn
+        self.max_connections = max_connections
+        self.flush_interval = flush_interval
 
     @contextmanager
-    def client(self):
-        _client = redis.Redis.from_url(self.redis_dsn, decode_responses=True)
-        try:
+    def client(self, retry: bool = True):
+        with pooled_client(
+            self.redis_dsn, self.max_connections, retry=retry
+        ) as _client:
             yield _client
-        finally:
-            _client.close()
 
     def on_init(self):
         pass
 
-    def _compose_key(self, key: StatKey, flow_id: str) -> str:
-        return f"{self._key_prefix}{key}:{flow_id}"
+    def _compose_key(self, flow_id: str) -> str:
+        return f"{self._key_prefix}{flow_id}"
 
     def get_value(self, key: StatKey, flow_id: str, default: int | None = None) -> int:
 
+        self.flush(flow_id)
+
         with self.client() as _client:
 
-            val = _client.get(self._compose_key(key, flow_id)) or default
+            val = _client.hget(self._compose_key(flow_id), key)
             try:
                 if val is None:
                     return default
@@ -45,8 +77,12 @@ class RedisStatsCollector(IStatsCollector):
 
     def set_value(self, key: StatKey, flow_id: str, value: int) -> None:
 
+        # the increments buffered before are overridden
+        with _buffers_lock:
+            _buffers.get((self.redis_dsn, flow_id), {}).pop(key, None)
+
         with self.client() as _client:
-            _client.set(self._compose_key(key, flow_id), value)
+            _client.hset(self._compose_key(flow_id), key, value)
 
     def inc_value(
         self,
@@ -55,20 +91,99 @@ class RedisStatsCollector(IStatsCollector):
         count: int = 1,
         start: int = 0,
     ) -> None:
+        """buffers the increment, the buffer is flushed when it is older than `flush_interval`"""
 
-        with self.client() as _client:
+        buffer_key = (self.redis_dsn, flow_id)
+
+        with _buffers_lock:
+
+            increments = _buffers.setdefault(buffer_key, {})
+            buffered_count, buffered_start = increments.get(key, (0, start))
+            increments[key] = (buffered_count + count, buffered_start)
+
+            last_flush = _last_flushes.setdefault(buffer_key, time.monotonic())
+            should_flush = time.monotonic() - last_flush >= self.flush_interval
+
+        if should_flush:
+            self.flush(flow_id)
+
+    def flush(self, flow_id: str | None = None) -> None:
+        """writes the buffered increments in a single round-trip
+
+        Args:
+            flow_id (str | None, optional): the flow run whose increments are written.
+                Defaults to None, i.e. all the flow runs.
+        """
+
+        with _buffers_lock:
+
+            buffer_keys = [
+                buffer_key
+                for buffer_key in _buffers
+                if buffer_key[0] == self.redis_dsn
+                and (flow_id is None or buffer_key[1] == flow_id)
+            ]
+
+            pending = {
+                buffer_key: _buffers.pop(buffer_key) for buffer_key in buffer_keys
+            }
 
-            if not _client.exists(self._compose_key(key, flow_id)):
-                _client.set(self._compose_key(key, flow_id), start + count)
-            else:
-                _client.incr(self._compose_key(key, flow_id), count)
+            # the next increment starts a new interval
+            for buffer_key in buffer_keys:
+                _last_flushes.pop(buffer_key, None)
+
+        pending = {
+            buffer_key: increments
+            for buffer_key, increments in pending.items()
+            if increments
+        }
+
+        if not pending:
+            return
+
+        try:
+
+            # the increments are not sent again by the client when the connection is lost,
+            # the server may have counted them already (see `get_connection_pool`)
+            with self.client(retry=False) as _client:
+
+                pipe = _client.pipeline(transaction=False)
+
+                for (_, _flow_id), increments in pending.items():
+                    for key, (count, start) in increments.items():
+                        if start:
+                            pipe.hsetnx(self._compose_key(_flow_id), key, start)
+                        pipe.hincrby(self._compose_key(_flow_id), key, count)
+
+                pipe.execute()
+
+        except Exception as e:
+            logger.error(f"Error flushing stats, they will be flushed later: {e}")
+
+            # the increments are put back in the buffers
+            with _buffers_lock:
+                for buffer_key, increments in pending.items():
+                    buffer = _buffers.setdefault(buffer_key, {})
+                    for key, (count, start) in increments.items():
+                        buffered_count, _ = buffer.get(key, (0, start))
+                        buffer[key] = (buffered_count + count, start)
 
     def collect(self, flow_id: str) -> dict[str, int]:
+        """reads all the stats of the flow run in a single round-trip (`HGETALL`)"""
+
+        self.flush(flow_id)
+
+        with self.client() as _client:
+            values = _client.hgetall(self._compose_key(flow_id))
 
         d = {}
         for key in StatKey:
-            value = self.get_value(key, flow_id)
-            if value is not None and value > 0:
+            try:
+                value = int(values.get(key, 0))
+            except (ValueError, TypeError):
+                logger.error(f"Failed to convert value of key '{key}' to int")
+                continue
+            if value > 0:
                 d[key.name] = value
 
         return d
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import re
+from itertools import batched
+from typing import Sequence
+from urllib.parse import unquote
 
 from loguru import logger
-from pydantic import HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 from src.exceptions import RetrievalError
 from src.interfaces.http_client import IHttpClient
@@ -17,7 +21,8 @@ def download_page(
     **params,
 ) -> str:
     """
-    Pre-requisite: The class `http_client` provided must be synchronous (async not supported yet).
+    Pre-requisite: The class `http_client` provided must be synchronous,
+    use `download_page_async` with an asynchronous client.
 
     Args:
         http_client (IHttpClient): The HTTP client to use for making requests.
@@ -38,9 +43,264 @@ def download_page(
     )
 
 
+async def download_page_async(
+    http_client: IHttpClient,
+    page_id: str,
+    settings: ScrapingSettings,
+    **params,
+) -> str:
+    """
+    Same as `download_page`, for asynchronous HTTP clients like `AsyncHttpClient`
+    so that many pages can be downloaded concurrently over the same connections.
+
+    Args:
+        http_client (IHttpClient): The asynchronous HTTP client to use for making requests.
+        page_id (str): The page ID to download.
+        settings (Settings): The application settings.
+        **params: Additional parameters for the HTTP request.
+
+    Returns:
+        str: The HTML content of the downloaded page.
+    """
+
+    endpoint = f"{settings.mediawiki_base_url}/page/{page_id}/html"
+
+    return await http_client.send(
+        url=endpoint,
+        response_type="text",
+        params=params,
+    )
+
+
+# the MediaWiki Action API accepts at most 50 titles per query
+MAX_TITLES_PER_QUERY = 50
+
+
+def _revisions_query_params(page_ids: Sequence[str]) -> dict:
+    """builds the parameters of a MediaWiki query for the latest revision of the given pages"""
+
+    return {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "prop": "revisions",
+        "rvprop": "ids",
+        "redirects": 1,
+        "titles": "|".join(unquote(page_id) for page_id in page_ids),
+    }
+
+
+def _parse_revisions_query(page_ids: Sequence[str], response: dict) -> dict[str, int]:
+    """maps the given page IDs to the revision ids returned by the MediaWiki query,
+    following the title normalizations and the redirects applied by MediaWiki.
+    """
+
+    query = response.get("query", {})
+
+    normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+    redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+    revisions = {
+        page["title"]: page["revisions"][0]["revid"]
+        for page in query.get("pages", [])
+        if not page.get("missing") and page.get("revisions")
+    }
+
+    result = {}
+    for page_id in page_ids:
+        title = unquote(page_id)
+        title = normalized.get(title, title)
+        title = redirects.get(title, title)
+        if title in revisions:
+            result[page_id] = revisions[title]
+
+    return result
+
+
+def get_revision_ids(
+    page_ids: Sequence[str],
+    http_client: IHttpClient,
+    settings: ScrapingSettings,
+) -> dict[str, int]:
+    """
+    retrieves the latest revision id of the given pages, querying the MediaWiki Action API
+    for up to 50 pages at once.
+
+    Example:
+        >>> get_revision_ids(["Le_Voyage_dans_la_Lune", "NonExistingPage"], http_client=http_client, settings=settings)
+        # would be:
+        # {"Le_Voyage_dans_la_Lune": 219284763}
+
+    Args:
+        page_ids (Sequence[str]): the IDs of the pages, as found in the links of a table of contents.
+        http_client (IHttpClient): The HTTP client to use for making requests.
+        settings (ScrapingSettings): The scraping settings.
+
+    Returns:
+        dict[str, int]: the revision id of each page, pages not found on Wikipedia are omitted.
+
+    Raises:
+        HttpError
+    """
+
+    revisions = {}
+
+    for chunk in batched(page_ids, MAX_TITLES_PER_QUERY):
+
+        response = http_client.send(
+            url=settings.mediawiki_action_api_url,
+            params=_revisions_query_params(chunk),
+            response_type="json",
+        )
+
+        revisions.update(_parse_revisions_query(chunk, response))
+
+    return revisions
+
+
+async def get_revision_ids_async(
+    page_ids: Sequence[str],
+    http_client: IHttpClient,
+    settings: ScrapingSettings,
+) -> dict[str, int]:
+    """
+    Same as `get_revision_ids`, for asynchronous HTTP clients; the batches are queried concurrently.
+    """
+
+    chunks = list(batched(page_ids, MAX_TITLES_PER_QUERY))
+
+    responses = await asyncio.gather(
+        *[
+            http_client.send(
+                url=settings.mediawiki_action_api_url,
+                params=_revisions_query_params(chunk),
+                response_type="json",
+            )
+            for chunk in chunks
+        ]
+    )
+
+    revisions = {}
+
+    for chunk, response in zip(chunks, responses):
+        revisions.update(_parse_revisions_query(chunk, response))
+
+    return revisions
+
+
+class PermalinkResolution(BaseModel):
+    """the result of the resolution of several page names into permalinks"""
+
+    permalinks: dict[str, HttpUrl] = Field(
+        default_factory=dict,
+        description="The permalink of each name found on Wikipedia",
+    )
+    redirects: dict[str, str] = Field(
+        default_factory=dict,
+        description="The title of the target page, for each name redirected to another page",
+    )
+    missing: list[str] = Field(
+        default_factory=list,
+        description="The names which do not exist on Wikipedia",
+    )
+
+
+def _titles_query_params(names: Sequence[str]) -> dict:
+    """builds the parameters of a MediaWiki query for the URL of the given pages"""
+
+    return {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "prop": "info",
+        "inprop": "url",
+        "redirects": 1,
+        "titles": "|".join(names),
+    }
+
+
+def _parse_titles_query(
+    names: Sequence[str], response: dict, resolution: PermalinkResolution
+) -> None:
+    """adds the permalinks, redirects and missing pages of the MediaWiki query to the resolution,
+    following the title normalizations and the redirects applied by MediaWiki.
+    """
+
+    query = response.get("query", {})
+
+    normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+    redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+    urls = {
+        page["title"]: page["fullurl"]
+        for page in query.get("pages", [])
+        if not page.get("missing") and not page.get("invalid") and "fullurl" in page
+    }
+
+    for name in names:
+        title = normalized.get(name, name)
+
+        if title in redirects:
+            title = redirects[title]
+            resolution.redirects[name] = title
+
+        if title in urls:
+            resolution.permalinks[name] = HttpUrl(urls[title])
+        else:
+            resolution.missing.append(name)
+
+
+def resolve_permalinks(
+    names: Sequence[str],
+    http_client: IHttpClient,
+    settings: ScrapingSettings,
+) -> PermalinkResolution:
+    """
+    retrieves the permalinks of the given page names, querying the MediaWiki Action API
+    for up to 50 names at once.
+
+    Example:
+        >>> resolve_permalinks(["Georges Méliès", "NonExistingPage"], http_client=http_client, settings=settings)
+        # would be:
+        # PermalinkResolution(
+        #     permalinks={"Georges Méliès": HttpUrl("https://fr.wikipedia.org/wiki/Georges_M%C3%A9li%C3%A8s_(cin%C3%A9aste)")},
+        #     redirects={"Georges Méliès": "Georges Méliès (cinéaste)"},
+        #     missing=["NonExistingPage"],
+        # )
+
+    Args:
+        names (Sequence[str]): the names of the pages, duplicated and empty names are ignored.
+        http_client (IHttpClient): The HTTP client to use for making requests.
+        settings (ScrapingSettings): The scraping settings.
+
+    Returns:
+        PermalinkResolution: the permalinks, redirects and missing pages of the names.
+
+    Raises:
+        HttpError
+    """
+
+    resolution = PermalinkResolution()
+
+    unique_names = list(
+        dict.fromkeys(name for name in names if name is not None and name.strip())
+    )
+
+    for chunk in batched(unique_names, MAX_TITLES_PER_QUERY):
+
+        response = http_client.send(
+            url=settings.mediawiki_action_api_url,
+            params=_titles_query_params(chunk),
+            response_type="json",
+        )
+
+        _parse_titles_query(chunk, response, resolution)
+
+    return resolution
+
+
 def get_permalink(name: str, http_client: IHttpClient) -> HttpUrl | None:
     """
-    retrieves the permalink for a given Wikipedia page name.
+    retrieves the permalink for a given Wikipedia page name,
+    use `resolve_permalinks` to retrieve the permalinks of several names at once.
 
     Example:
         >>> get_permalink("Some Wikipedia Page", http_client=http_client)
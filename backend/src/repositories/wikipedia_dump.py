@@ -0,0 +1,152 @@
+import tarfile
+from pathlib import Path
+from typing import Generator, Mapping
+from urllib.parse import unquote
+
+import orjson
+from loguru import logger
+
+from src.entities.content import PageLink
+from src.repositories.db.redis.text import RedisTextStorage
+
+type DumpPage = tuple[str, str, int | None]
+
+
+def normalize_page_id(page_id: str) -> str:
+    """the page ID as written in the URLs of Wikipedia, i.e. unquoted and with underscores instead of spaces
+
+    Example:
+    ```python
+        normalize_page_id("Lucien Nonguet")
+        # 'Lucien_Nonguet'
+
+        normalize_page_id("Le_Voyage_dans_la_Lune_%281902%29")
+        # 'Le_Voyage_dans_la_Lune_(1902)'
+    ```
+    """
+    return unquote(page_id).strip().replace(" ", "_")
+
+
+def read_dump(path: str | Path) -> Generator[DumpPage, None, None]:
+    """
+    Streams the pages of a Wikimedia Enterprise HTML dump,
+    i.e. a tar.gz archive of NDJSON files where each line is an article.
+
+    The archive is read sequentially, one line at a time,
+    so that the memory used does not depend on the size of the dump.
+
+    Args:
+        path (str | Path): the path of the `.tar.gz` archive
+
+    Yields:
+        DumpPage: the normalized page ID, the HTML content and the revision ID of each article
+    """
+
+    with tarfile.open(path, mode="r|gz") as archive:
+
+        for member in archive:
+
+            if not member.isfile() or not member.name.endswith(".ndjson"):
+                continue
+
+            stream = archive.extractfile(member)
+
+            if stream is None:
+                continue
+
+            for line_number, line in enumerate(stream, start=1):
+
+                if not line.strip():
+                    continue
+
+                try:
+                    article = orjson.loads(line)
+
+                    html = (article.get("article_body") or {}).get("html")
+
+                    if not html or not article.get("name"):
+                        continue
+
+                    revision_id = (article.get("version") or {}).get("identifier")
+
+                    yield (
+                        normalize_page_id(article["name"]),
+                        html,
+                        int(revision_id) if revision_id is not None else None,
+                    )
+
+                except Exception as e:
+                    logger.warning(
+                        f"Skipping line {line_number} of '{member.name}': {e}"
+                    )
+
+
+def ingest_dump(
+    path: str | Path,
+    page_links: list[PageLink],
+    html_stores: Mapping[str, RedisTextStorage],
+    batch_size: int = 200,
+) -> int:
+    """
+    Loads the pages of the dump which are referenced by the given links into the storages of their entity type.
+
+    The pages are written by batches of `batch_size` pages per round-trip,
+    only the current batch is kept in memory.
+
+    Args:
+        path (str | Path): the path of the `.tar.gz` archive
+        page_links (list[PageLink]): the pages to load, the other pages of the dump are skipped
+        html_stores (Mapping[str, RedisTextStorage]): the storage of each entity type
+        batch_size (int, optional): the number of pages written at once. Defaults to 200.
+
+    Returns:
+        int: the number of pages stored
+    """
+
+    # the pages are stored under the ID of the link, which may be quoted differently in the dump
+    targets: dict[str, list[PageLink]] = {}
+
+    for link in page_links:
+        targets.setdefault(normalize_page_id(link.page_id), []).append(link)
+
+    batches: dict[str, tuple[list[str], list[str], list[int | None]]] = {
+        entity_type: ([], [], []) for entity_type in html_stores
+    }
+
+    stored = 0
+
+    def _flush(entity_type: str) -> int:
+        contents, content_ids, revision_ids = batches[entity_type]
+
+        if not contents:
+            return 0
+
+        batches[entity_type] = ([], [], [])
+
+        return html_stores[entity_type].insert_many(
+            contents=contents,
+            content_ids=content_ids,
+            revision_ids=revision_ids,
+        )
+
+    for page_id, html, revision_id in read_dump(path):
+
+        for link in targets.get(page_id, []):
+
+            if link.entity_type not in html_stores:
+                continue
+
+            contents, content_ids, revision_ids = batches[link.entity_type]
+            contents.append(html)
+            content_ids.append(link.page_id)
+            revision_ids.append(revision_id)
+
+            if len(contents) >= batch_size:
+                stored += _flush(link.entity_type)
+
+    for entity_type in html_stores:
+        stored += _flush(entity_type)
+
+    logger.info(f"Loaded {stored} pages out of {len(page_links)} links from '{path}'")
+
+    return stored
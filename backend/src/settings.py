@@ -1,7 +1,7 @@
 from pathlib import Path
-from typing import Self
+from typing import Literal, Self
 
-from pydantic import Field, SecretStr, model_validator
+from pydantic import Field, SecretStr, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic_yaml import parse_yaml_raw_as
 
@@ -67,6 +67,46 @@ class StorageSettings(BaseSettings):
         """,
     )
 
+    graphdb_max_connections: int = Field(
+        default=50,
+        gt=0,
+        description="""
+            The maximum number of connections opened to `graphdb_uri` by each process,
+            shared by all the graph repositories of the process.
+        """,
+    )
+    graphdb_liveness_check_timeout: float | None = Field(
+        default=60,
+        ge=0,
+        description="""
+            The number of seconds a pooled connection to `graphdb_uri` may stay idle
+            before it is checked when borrowed, None to never check it.
+        """,
+    )
+
+    graphdb_staging_directory: str = Field(
+        default=Path("./data/graph-staging").as_posix(),
+        description="""
+            The directory of the CSV files staged by the bulk load of the graph DB (`python main.py store --bulk-load`).
+
+            NB: this field is not declared as `Path` because we need it to be serializable by Prefect.
+        """,
+    )
+    graphdb_server_staging_directory: str | None = Field(
+        default=None,
+        description="""
+            The path of `graphdb_staging_directory` as seen by the graph DB server, e.g. a volume of its container.
+            None when the server runs on the same host.
+        """,
+    )
+    graphdb_bulk_load_chunk_size: int = Field(
+        default=100_000,
+        gt=0,
+        description="""
+            The number of nodes of each staging file, each file is loaded by a single query.
+        """,
+    )
+
     redis_dsn: str = Field(
         default="redis://localhost:6379/0",
         description="""
@@ -77,6 +117,66 @@ class StorageSettings(BaseSettings):
             NB: this field is not declared as `RedisDsn` because we need it to be serializable by Prefect.
         """,
     )
+    redis_max_connections: int = Field(
+        default=50,
+        gt=0,
+        description="""
+            The maximum number of connections opened to `redis_dsn` by each process,
+            shared by all the storage handlers of the process.
+        """,
+    )
+    redis_batch_size: int = Field(
+        default=500,
+        gt=0,
+        description="""
+            The number of contents written to Redis in a single round-trip by the bulk operations.
+        """,
+    )
+    html_compression: Literal["zstd"] | None = Field(
+        default=None,
+        description="""
+            The compression of the HTML contents written to Redis, None to store them uncompressed.
+            The contents are read whatever their compression, use `python main.py compress-html`
+            to train the compression dictionary and compress the contents already stored.
+        """,
+    )
+    html_compression_level: int = Field(
+        default=3,
+        ge=1,
+        le=22,
+        description="The zstd compression level of the HTML contents",
+    )
+    html_retention: Literal["ttl", "archive"] | None = Field(
+        default=None,
+        description="""
+            What happens to the HTML contents in Redis once their entities are extracted:
+            - None: they are kept in Redis
+            - "ttl": they expire after `html_retention_ttl` seconds
+            - "archive": they are moved to a compressed archive in `html_archive_directory`,
+                where they are read from when extracted again
+        """,
+    )
+    html_retention_ttl: int = Field(
+        default=7 * 24 * 3600,
+        gt=0,
+        description="The duration the extracted HTML contents are kept in Redis when `html_retention` is 'ttl', in seconds",
+    )
+    html_archive_directory: str = Field(
+        default=(
+            Path.home() / ".local" / "share" / "cinefeel" / "html-archive"
+        ).as_posix(),
+        description="""
+            The directory of the local archive of the HTML contents, see `html_retention`.
+            It is resolved as an absolute path so that the archive does not depend on the working directory of the Prefect worker.
+
+            NB: this field is not declared as `Path` because we need it to be serializable by Prefect.
+        """,
+    )
+
+    @field_validator("html_archive_directory", mode="after")
+    @classmethod
+    def resolve_html_archive_directory(cls, value: str) -> str:
+        return Path(value).expanduser().resolve().as_posix()
 
 
 class StatsSettings(BaseSettings):
@@ -96,6 +196,22 @@ class StatsSettings(BaseSettings):
             NB: this field is not declared as `RedisDsn` because we need it to be serializable by Prefect.
         """,
     )
+    redis_max_connections: int = Field(
+        default=10,
+        gt=0,
+        description="""
+            The maximum number of connections opened to `redis_dsn` by each process,
+            shared by all the stats collectors of the process.
+        """,
+    )
+    flush_interval: float = Field(
+        default=5.0,
+        ge=0,
+        description="""
+            The maximum duration the stats are buffered by each process before being written to `redis_dsn`, in seconds.
+            0 to write each value immediately.
+        """,
+    )
 
 
 class MLSettings(BaseSettings):
@@ -239,6 +355,31 @@ class ScrapingSettings(BaseSettings):
         default=60 * 60 * 24,
         description="The expiration time of the cache in seconds",
     )
+    cache_backend: Literal["sqlite", "file"] = Field(
+        default="sqlite",
+        description="""
+            The storage of the HTTP cache:
+            - `sqlite` keeps the compressed responses in a single SQLite file, bounded by `cache_max_size_mb`
+            - `file` keeps one file per response, without size limit
+        """,
+    )
+    cache_dir: str = Field(
+        default=(Path.home() / ".cache" / "cinefeel" / "http").as_posix(),
+        description="""
+            The directory of the HTTP cache, resolved as an absolute path
+            so that the cache does not depend on the working directory of the Prefect worker.
+
+            NB: this field is not declared as `Path` because we need it to be serializable by Prefect.
+        """,
+    )
+    cache_max_size_mb: int = Field(
+        default=1024,
+        ge=1,
+        description="""
+            The maximum size of the `sqlite` HTTP cache in megabytes,
+            the least recently used responses are evicted beyond this size.
+        """,
+    )
     start_pages: list[TableOfContents] | None = Field(
         None,
         description="Will be set through the start pages config file",
@@ -260,6 +401,43 @@ class ScrapingSettings(BaseSettings):
         default=10,
         description="The timeout for each request in seconds",
     )
+    frontier_expire_after: int = Field(
+        default=60 * 60 * 24 * 7,
+        description="""
+            The expiration time in seconds of the links saved while scraping a table of contents,
+            used to resume an interrupted scraping; beyond, the table of contents is downloaded again.
+        """,
+    )
+    link_retry_attempts: int = Field(
+        default=2,
+        ge=0,
+        description="""
+            The number of retry attempts for each page linked by a table of contents,
+            when the download fails with a retriable HTTP error (429, 5xx, timeout).
+            Beyond, the error fails the scraping task which is retried as a whole.
+        """,
+    )
+    link_retry_backoff: float = Field(
+        default=1.0,
+        ge=0,
+        description="The delay in seconds before the first retry of a page, doubled on each attempt",
+    )
+    rate_limit_name: str = Field(
+        default="api-rate-limiting",
+        description="""
+            The name of the Prefect global concurrency limit (with slot decay)
+            used to limit the rate of the requests sent to the Wikipedia API.
+        """,
+    )
+    rate_limit_block_size: int = Field(
+        default=5,
+        ge=1,
+        description="""
+            The number of tokens leased at once from the global rate limit by each process,
+            tokens are then consumed locally without calling the Prefect API.
+            The block size is capped by the limit of the global rate limit.
+        """,
+    )
     mediawiki_api_key: str = Field(
         default="",
         description="""
@@ -275,6 +453,33 @@ class ScrapingSettings(BaseSettings):
         default="Cinefeel",
         description="The user agent to use for the Wikipedia API",
     )
+    mediawiki_action_api_url: str = Field(
+        default="https://fr.wikipedia.org/w/api.php",
+        description="""
+            The URL of the MediaWiki Action API, used for batch queries on several pages at once;
+            see https://www.mediawiki.org/wiki/API:Query
+        """,
+    )
+    skip_unchanged_pages: bool = Field(
+        default=True,
+        description="""
+            If True, the revision of the pages is checked before downloading them,
+            and the pages which did not change since they were stored are not downloaded again.
+        """,
+    )
+    dump_batch_size: int = Field(
+        default=200,
+        gt=0,
+        description="""
+            When ingesting a Wikimedia HTML dump, the number of pages written to the storage in a single round-trip.
+            Only one batch of pages is held in memory at a time.
+        """,
+    )
+
+    @field_validator("cache_dir", mode="after")
+    @classmethod
+    def resolve_cache_dir(cls, value: str) -> str:
+        return Path(value).expanduser().resolve().as_posix()
 
     @model_validator(mode="after")
     def on_after_init(self) -> Self:
@@ -0,0 +1,60 @@
+from loguru import logger
+
+from src.entities.movie import Movie
+from src.entities.person import Person
+from src.repositories.db.redis.text import RedisTextStorage
+from src.settings import AppSettings
+
+from .uc_types import EntityType
+
+
+class HtmlCompressionUseCase:
+    """
+    Trains the zstd dictionary of the HTML contents stored in Redis,
+    and compresses again the contents stored before, so that they are compressed with that dictionary.
+
+    The new contents are compressed only when `StorageSettings.html_compression` is enabled.
+    """
+
+    _app_settings: AppSettings
+    _types: list[EntityType]
+
+    def __init__(
+        self,
+        app_settings: AppSettings,
+        types: list[EntityType],
+    ):
+        self._app_settings = app_settings
+        self._types = types
+
+    def execute(self) -> dict[str, int]:
+
+        entity_types = []
+        if "movies" in self._types:
+            entity_types.append(Movie)
+
+        if "persons" in self._types:
+            entity_types.append(Person)
+
+        if self._app_settings.storage_settings.html_compression is None:
+            logger.warning(
+                "The HTML contents are compressed, but the compression of the new contents is not enabled "
+                "(see `StorageSettings.html_compression`)"
+            )
+
+        compressed = {}
+
+        for cls in entity_types:
+
+            storage = RedisTextStorage[cls](
+                redis_dsn=self._app_settings.storage_settings.redis_dsn,
+                max_connections=self._app_settings.storage_settings.redis_max_connections,
+                batch_size=self._app_settings.storage_settings.redis_batch_size,
+                compression="zstd",
+                compression_level=self._app_settings.storage_settings.html_compression_level,
+            )
+
+            storage.train_dictionary()
+            compressed[cls.__name__] = storage.recompress()
+
+        return compressed
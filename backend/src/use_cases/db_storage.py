@@ -10,21 +10,31 @@ from .uc_types import EntityType
 
 
 class DBStorageUseCase:
-    """Handles the storage of entity data into the database."""
+    """Handles the storage of entity data into the database.
+
+    The bulk load is a one-off: it is run before the deployments are created,
+    which then insert the entities by batches on each run.
+    """
 
     _app_settings: AppSettings
     _types: list[EntityType]
+    _bulk_load: bool
 
     def __init__(
         self,
         app_settings: AppSettings,
         types: list[EntityType],
+        bulk_load: bool = False,
     ):
         self._app_settings = app_settings
         self._types = types
+        self._bulk_load = bulk_load
 
     def execute(self):
 
+        if self._bulk_load:
+            self._execute_bulk_load()
+
         _flows = []
         if "movies" in self._types:
 
@@ -76,3 +86,18 @@ class DBStorageUseCase:
             *_flows,
             work_pool_name="local-processes",
         )
+
+    def _execute_bulk_load(self):
+        """bulk loads the entities of each type into the graph DB, one type after the other:
+        the storage mode of the graph DB is global, two loads must not switch it concurrently
+        """
+
+        from src.repositories.orchestration.flows.db_storage import db_storage_flow
+
+        for cls, _type in ((Movie, "movies"), (Person, "persons")):
+            if _type in self._types:
+                db_storage_flow(
+                    app_settings=self._app_settings,
+                    entity_type=cls.__name__,
+                    bulk_load=True,
+                )
@@ -16,13 +16,36 @@ class EntityExtractionUseCase:
 
     _types: list[EntityType]
 
+    _partition: int
+    _num_partitions: int
+
     def __init__(
         self,
         app_settings: AppSettings,
         types: list[EntityType],
+        partition: int = 0,
+        num_partitions: int = 1,
     ):
+        """
+        Args:
+            app_settings (AppSettings): the application settings
+            types (list[EntityType]): the types of entities to extract
+            partition (int, optional): the partition of the HTML contents extracted by the deployments,
+                so that the extraction is split between machines. Defaults to 0.
+            num_partitions (int, optional): the number of partitions. Defaults to 1 (all the contents).
+        """
         self._app_settings = app_settings
         self._types = types
+        self._partition = partition
+        self._num_partitions = num_partitions
+
+    def _deployment_name(self, name: str) -> str:
+        """each partition is deployed separately"""
+
+        if self._num_partitions == 1:
+            return name
+
+        return f"{name}_{self._partition}_of_{self._num_partitions}"
 
     def execute(self):
 
@@ -35,11 +58,13 @@ class EntityExtractionUseCase:
                     / "repositories/orchestration/flows",
                     entrypoint="extract.py:extract_entities_flow",
                 ).to_deployment(
-                    name="movies_extraction",
+                    name=self._deployment_name("movies_extraction"),
                     description="Extracts movies from HTML content.",
                     parameters={
                         "app_settings": self._app_settings,
                         "entity_type": Movie.__name__,
+                        "partition": self._partition,
+                        "num_partitions": self._num_partitions,
                     },
                     job_variables={
                         "working_dir": Path(__file__)
@@ -58,11 +83,13 @@ class EntityExtractionUseCase:
                     / "repositories/orchestration/flows",
                     entrypoint="extract.py:extract_entities_flow",
                 ).to_deployment(
-                    name="persons_extraction",
+                    name=self._deployment_name("persons_extraction"),
                     description="Extracts persons from HTML content.",
                     parameters={
                         "app_settings": self._app_settings,
                         "entity_type": Person.__name__,
+                        "partition": self._partition,
+                        "num_partitions": self._num_partitions,
                     },
                     job_variables={
                         "working_dir": Path(__file__)
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from loguru import logger
+
+from src.entities.content import PageLink, TableOfContents
+from src.entities.movie import Movie
+from src.entities.person import Person
+from src.exceptions import HttpError
+from src.repositories.db.redis.text import RedisTextStorage
+from src.repositories.html_parser.wikipedia_info_retriever import WikipediaParser
+from src.repositories.http.sync_http import SyncHttpClient
+from src.repositories.orchestration.tasks.task_scraper import extract_page_links
+from src.repositories.wikipedia_dump import ingest_dump
+from src.settings import AppSettings
+
+from .uc_types import EntityType
+
+
+class DumpIngestionUseCase:
+    """
+    Loads the pages linked by the tables of contents from a Wikimedia HTML dump,
+    instead of downloading them one by one from the Wikipedia API.
+
+    Only the tables of contents are downloaded, the dump is read locally.
+    """
+
+    _app_settings: AppSettings
+    _types: list[EntityType]
+    _dump_path: Path
+
+    def __init__(
+        self,
+        app_settings: AppSettings,
+        types: list[EntityType],
+        dump_path: Path,
+    ):
+        self._app_settings = app_settings
+        self._types = types
+        self._dump_path = dump_path
+
+    def execute(self) -> int:
+
+        entity_types = []
+        if "movies" in self._types:
+            entity_types.append(Movie)
+
+        if "persons" in self._types:
+            entity_types.append(Person)
+
+        html_stores: dict[str, RedisTextStorage] = {}
+
+        for cls in entity_types:
+            html_stores[cls.__name__] = RedisTextStorage[cls](
+                redis_dsn=self._app_settings.storage_settings.redis_dsn,
+                max_connections=self._app_settings.storage_settings.redis_max_connections,
+                batch_size=self._app_settings.storage_settings.redis_batch_size,
+                compression=self._app_settings.storage_settings.html_compression,
+                compression_level=self._app_settings.storage_settings.html_compression_level,
+            )
+            html_stores[cls.__name__].on_init()
+
+        # the same table of contents is configured once per selector,
+        # group them by page_id to download and parse each page once
+        pages: dict[str, list[TableOfContents]] = {}
+
+        for p in self._app_settings.scraping_settings.start_pages:
+            if p.entity_type in html_stores:
+                pages.setdefault(p.page_id, []).append(p)
+
+        http_client = SyncHttpClient(settings=self._app_settings.scraping_settings)
+
+        page_links: list[PageLink] = []
+
+        for page_id, configs in pages.items():
+
+            # a table of contents which cannot be downloaded does not prevent loading the others
+            try:
+                page_links.extend(
+                    extract_page_links(
+                        http_client=http_client,
+                        config=configs,
+                        link_extractor=WikipediaParser(),
+                        scraping_settings=self._app_settings.scraping_settings,
+                    )
+                )
+
+            except HttpError as e:
+                logger.error(f"Table of contents '{page_id}' skipped: {e}")
+
+        logger.info(f"Found {len(page_links)} links in {len(pages)} tables of contents")
+
+        return ingest_dump(
+            path=self._dump_path,
+            page_links=page_links,
+            html_stores=html_stores,
+            batch_size=self._app_settings.scraping_settings.dump_batch_size,
+        )
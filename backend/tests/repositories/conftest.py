@@ -255,6 +255,8 @@ def test_settings(launch_memgraph):  #
             scraping_settings=ScrapingSettings(
                 _env_file=None,
                 config_file=path.as_posix(),
+                cache_dir=(Path(tmpdir) / "http-cache").as_posix(),
+                link_retry_backoff=0,
             ),
             ml_settings=MLSettings(
                 _env_file=None,
@@ -0,0 +1,117 @@
+import csv
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from src.entities.movie import Movie
+from src.exceptions import StorageError
+from src.repositories.db.graph import driver
+from src.repositories.db.graph.bulk import write_staging_files
+from src.repositories.db.graph.mg_movie import MovieGraphRepository
+from src.settings import StorageSettings
+
+
+@pytest.fixture
+def mock_driver(monkeypatch):
+    """the driver is mocked so that no graph DB is required"""
+
+    _driver = MagicMock()
+    _driver.execute_query.return_value = ([{"count": 0}], None, None)
+
+    session = _driver.session.return_value
+    session.__enter__.return_value = session
+    session.run.return_value.single.return_value = {"count": 2}
+
+    monkeypatch.setattr(driver.GraphDatabase, "driver", lambda *_, **__: _driver)
+
+    driver._drivers.clear()
+    yield _driver
+    driver._drivers.clear()
+
+
+def test_staging_files_are_chunked_and_deduplicated(tmp_path):
+
+    # given
+    rows = [{"uid": f"uid-{i % 5}", "title": f"title {i}"} for i in range(10)]
+
+    # when
+    paths = write_staging_files(rows, tmp_path, prefix="Movie", chunk_size=2)
+
+    # then
+    # the files holding superseded rows only are removed
+    assert [path.name for path in paths] == [
+        "Movie-00003.csv",
+        "Movie-00004.csv",
+        "Movie-00005.csv",
+    ]
+    assert sorted(tmp_path.iterdir()) == paths
+
+    loaded = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as staging_file:
+            loaded.extend(csv.DictReader(staging_file))
+
+    # the last row of each uid is kept, like an update by `insert_many`;
+    # the nested properties are stored as JSON
+    assert [row["uid"] for row in loaded] == [f"uid-{i}" for i in range(5)]
+    assert orjson.loads(loaded[0]["doc"]) == {"uid": "uid-0", "title": "title 5"}
+
+
+def test_bulk_load_restores_the_transactional_mode(
+    mock_driver, tmp_path, test_film: Movie
+):
+
+    # given
+    repository = MovieGraphRepository(
+        StorageSettings(
+            graphdb_staging_directory=tmp_path.as_posix(),
+            graphdb_server_staging_directory="/var/lib/memgraph/staging",
+            graphdb_bulk_load_chunk_size=1,
+        )
+    )
+
+    other_film = test_film.model_copy(update={"title": "Other"})
+    other_film = Movie.model_validate(other_film.model_dump())
+
+    # when
+    count = repository.bulk_load(iter([test_film, other_film]))
+
+    # then
+    session = mock_driver.session.return_value
+    queries = [c.args[0].strip() for c in session.run.call_args_list]
+
+    assert queries[0] == "STORAGE MODE IN_MEMORY_ANALYTICAL;"
+
+    loads = [q for q in queries if q.startswith("LOAD CSV")]
+    assert len(loads) == 2
+    assert '"/var/lib/memgraph/staging/Movie-00001.csv"' in loads[0]
+
+    assert "STORAGE MODE IN_MEMORY_TRANSACTIONAL;" in queries
+    assert queries.index("STORAGE MODE IN_MEMORY_TRANSACTIONAL;") > queries.index(
+        loads[-1]
+    )
+
+    # the indexes are restored
+    assert "CREATE INDEX ON :Movie(uid);" in queries
+
+    # the staging files are removed
+    assert count == 4
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bulk_load_refuses_a_populated_db(mock_driver, tmp_path, test_film: Movie):
+
+    # given
+    mock_driver.execute_query.return_value = ([{"count": 1}], None, None)
+
+    repository = MovieGraphRepository(
+        StorageSettings(graphdb_staging_directory=tmp_path.as_posix())
+    )
+
+    # when
+    with pytest.raises(StorageError):
+        repository.bulk_load([test_film])
+
+    # then
+    mock_driver.session.assert_not_called()
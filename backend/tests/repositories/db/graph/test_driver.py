@@ -0,0 +1,100 @@
+import pickle
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.repositories.db.graph import driver
+from src.repositories.db.graph.mg_movie import MovieGraphRepository
+from src.repositories.db.graph.mg_person import PersonGraphRepository
+from src.settings import StorageSettings
+
+
+@pytest.fixture(autouse=True)
+def mock_driver(monkeypatch):
+    """drivers are shared by the process, each test starts without driver,
+    the driver factory is mocked so that no graph DB is required
+    """
+
+    factory = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+    monkeypatch.setattr(driver.GraphDatabase, "driver", factory)
+
+    driver._drivers.clear()
+    yield factory
+    driver._drivers.clear()
+
+
+def test_repositories_share_the_driver_of_a_uri(mock_driver):
+
+    # given
+    settings = StorageSettings(graphdb_uri="bolt://localhost:7687/memgraph")
+
+    movie_repository = MovieGraphRepository(settings)
+    person_repository = PersonGraphRepository(settings)
+
+    # when
+    drivers = []
+    for repository in (movie_repository, person_repository, movie_repository):
+        with repository.client() as _client:
+            drivers.append(_client)
+
+    # then
+    assert mock_driver.call_count == 1
+    assert drivers[0] is drivers[1] is drivers[2]
+
+    # the connectivity is verified once, and the driver is not closed after use
+    drivers[0].verify_connectivity.assert_called_once()
+    drivers[0].close.assert_not_called()
+
+    kwargs = mock_driver.call_args.kwargs
+    assert kwargs["max_connection_pool_size"] == settings.graphdb_max_connections
+    assert kwargs["liveness_check_timeout"] == settings.graphdb_liveness_check_timeout
+
+
+def test_driver_is_not_cached_when_unreachable(mock_driver):
+
+    # given
+    unreachable = MagicMock()
+    unreachable.verify_connectivity.side_effect = ConnectionError()
+    mock_driver.side_effect = [unreachable, MagicMock()]
+
+    # when
+    with pytest.raises(ConnectionError):
+        driver.get_driver("bolt://localhost:7687/memgraph")
+
+    # then
+    unreachable.close.assert_called_once()
+    assert driver.get_driver("bolt://localhost:7687/memgraph") is not unreachable
+
+
+def test_repository_reconnects_when_unpickled(mock_driver):
+
+    # given
+    repository = MovieGraphRepository(
+        StorageSettings(graphdb_uri="bolt://localhost:7687/memgraph")
+    )
+
+    with repository.client() as _client:
+        pass
+
+    # when
+    # the repository is pickled by Prefect, e.g. when passed to a task,
+    # the driver is not pickled along with it
+    repository = pickle.loads(pickle.dumps(repository))
+    driver._drivers.clear()
+
+    with repository.client() as _other_client:
+        pass
+
+    # then
+    assert mock_driver.call_count == 2
+    assert _other_client is not _client
+
+
+def test_driver_is_keyed_by_pool_settings(mock_driver):
+
+    # when
+    first = driver.get_driver("bolt://localhost:7687/memgraph", max_connections=5)
+    second = driver.get_driver("bolt://localhost:7687/memgraph", max_connections=10)
+
+    # then
+    assert first is not second
@@ -1,5 +1,6 @@
 import uuid
 
+import pytest
 from neo4j import GraphDatabase
 from neo4j.graph import Node
 
@@ -31,7 +32,7 @@ def test_insert_a_film(
     count = test_film_graphdb.insert_many([test_film])
 
     # then
-    assert count == 1  # Only one film should be inserted
+    assert count.total == 1  # Only one film should be inserted
 
     # select the film to verify its type
     records, _, _ = test_memgraph_client.execute_query(
@@ -102,7 +103,7 @@ def test_insert_several_films(
     count = test_film_graphdb.insert_many([test_film, other_film])
 
     # then
-    assert count == 2  # Two films should be inserted
+    assert count.total == 2  # Two films should be inserted
 
     # tear down the database
     test_memgraph_client.execute_query("MATCH (n:Movie) DETACH DELETE n")
@@ -125,7 +126,7 @@ def test_update_a_film(
     c = test_film_graphdb.insert_many([updated_film])
 
     # then
-    assert c == 1  # Only one film should be updated
+    assert c.total == 1  # Only one film should be updated
     # check if the film was updated
     records, _, _ = test_memgraph_client.execute_query(
         f"""
@@ -141,6 +142,33 @@ def test_update_a_film(
     test_memgraph_client.execute_query("MATCH (n:Movie) DETACH DELETE n")
 
 
+def test_insert_unchanged_film(
+    test_memgraph_client: GraphDatabase,
+    test_film_graphdb: MovieGraphRepository,
+    test_film: Movie,
+):
+    """a film identical to the stored one is not written again"""
+
+    # given
+    test_memgraph_client.execute_query("MATCH (n:Movie) DETACH DELETE n")
+    test_film_graphdb.insert_many([test_film])
+
+    dict_film = test_film.model_dump()
+    dict_film["title"] = f"{test_film.title} Copy"
+
+    other_film = Movie(**dict_film)
+
+    # when
+    counts = test_film_graphdb.insert_many([test_film, other_film])
+
+    # then
+    assert counts.total == 2
+    assert (counts.created, counts.updated, counts.unchanged) == (1, 0, 1)
+
+    # tear down the database
+    test_memgraph_client.execute_query("MATCH (n:Movie) DETACH DELETE n")
+
+
 def test_insert_film_deduplication(
     test_memgraph_client: GraphDatabase,
     test_film_graphdb: MovieGraphRepository,
@@ -154,7 +182,7 @@ def test_insert_film_deduplication(
 
     # This should not create a duplicate entry
     # then
-    assert count == 1  # Only one film should be inserted
+    assert count.total == 1  # Only one film should be inserted
 
     # tear down the database
     test_memgraph_client.execute_query("MATCH (n:Movie) DETACH DELETE n")
@@ -296,6 +324,58 @@ def test_add_relationship_to_film(
     test_memgraph_client.execute_query("MATCH (n:Movie), (m:Person) DETACH DELETE n, m")
 
 
+def test_add_relationships_at_once(
+    test_memgraph_client: GraphDatabase,
+    test_film_graphdb: MovieGraphRepository,
+    test_person_graphdb: PersonGraphRepository,
+    test_film: Movie,
+    test_person: Person,
+):
+    # given
+    test_memgraph_client.execute_query("MATCH (n:Movie), (m:Person) DETACH DELETE n, m")
+    test_memgraph_client.execute_query("MATCH (n:Unknown) DETACH DELETE n")
+
+    test_film_graphdb.insert_many([test_film])
+    test_person_graphdb.insert_many([test_person])
+
+    # when
+    test_film_graphdb.add_relationships(
+        [
+            StrongRelationship(
+                from_entity=test_film,
+                to_entity=test_person,
+                relation_type=PeopleRelationshipType.DIRECTED_BY,
+            ),
+            LooseRelationship(
+                from_entity=test_film,
+                to_title="Not on Wikipedia",
+                relation_type=PeopleRelationshipType.COMPOSED_BY,
+            ),
+            LooseRelationship(
+                from_entity=test_film,
+                to_title="Not on Wikipedia",
+                relation_type=PeopleRelationshipType.WRITTEN_BY,
+            ),
+        ]
+    )
+
+    # then
+    related = test_film_graphdb.get_related(test_film)
+
+    assert len(related) == 3
+
+    # a single loose node is merged for the title
+    results, _, _ = test_memgraph_client.execute_query(
+        "MATCH (n:Unknown {title: $title}) RETURN n",
+        title="Not on Wikipedia",
+    )
+
+    assert len(results) == 1
+
+    test_memgraph_client.execute_query("MATCH (n:Movie), (m:Person) DETACH DELETE n, m")
+    test_memgraph_client.execute_query("MATCH (n:Unknown) DETACH DELETE n")
+
+
 def test_select_film(
     test_film_graphdb: MovieGraphRepository,
     test_memgraph_client: GraphDatabase,
@@ -561,6 +641,38 @@ def test_graph_scan(
     test_memgraph_client.execute_query("MATCH (n:Movie), (m:Person) DETACH DELETE n, m")
 
 
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_graph_scan_by_pages(
+    test_film_graphdb: MovieGraphRepository,
+    test_memgraph_client: GraphDatabase,
+    test_film: Movie,
+    prefetch: bool,
+):
+
+    # given
+    test_memgraph_client.execute_query("MATCH (n:Movie), (m:Person) DETACH DELETE n, m")
+
+    films = [test_film]
+
+    for i in range(5):
+        film_copy = test_film.model_copy(deep=True)
+        film_copy.title = f"Inception Copy {i}"
+        films.append(film_copy)
+
+    test_film_graphdb.insert_many(films)
+
+    # when
+    # the last page is not full
+    results = list(test_film_graphdb.scan(page_size=4, prefetch=prefetch))
+
+    # then
+    uids = [uid for uid, _ in results]
+
+    assert uids == sorted(film.uid for film in films)
+
+    test_memgraph_client.execute_query("MATCH (n:Movie), (m:Person) DETACH DELETE n, m")
+
+
 def test_query_graph_by_permalink(
     test_film_graphdb: MovieGraphRepository,
     test_memgraph_client: GraphDatabase,
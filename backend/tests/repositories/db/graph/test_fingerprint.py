@@ -0,0 +1,85 @@
+import pickle
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import HttpUrl
+
+from src.entities.movie import Movie
+from src.repositories.db.graph import driver
+from src.repositories.db.graph.mg_core import (
+    FINGERPRINT_PROPERTY,
+    InsertCounts,
+)
+from src.repositories.db.graph.mg_movie import MovieGraphRepository
+from src.settings import StorageSettings
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """the driver is mocked so that no graph DB is required"""
+
+    _driver = MagicMock()
+
+    session = _driver.session.return_value
+    session.__enter__.return_value = session
+
+    monkeypatch.setattr(driver.GraphDatabase, "driver", lambda *_, **__: _driver)
+
+    driver._drivers.clear()
+    yield session
+    driver._drivers.clear()
+
+
+def test_fingerprint_changes_with_the_properties(test_film: Movie):
+
+    # given
+    repository = MovieGraphRepository(StorageSettings())
+
+    updated_film = test_film.model_copy(
+        update={"permalink": HttpUrl("https://en.wikipedia.org/wiki/Other")}
+    )
+
+    # when
+    fingerprints = [
+        repository._to_row(film)[FINGERPRINT_PROPERTY]
+        for film in (test_film, test_film.model_copy(deep=True), updated_film)
+    ]
+
+    # then
+    assert fingerprints[0] == fingerprints[1]
+    assert fingerprints[0] != fingerprints[2]
+
+
+def test_insert_many_counts_by_status(mock_session, test_film: Movie):
+
+    # given
+    mock_session.run.return_value = [
+        {"status": "created", "count": 2},
+        {"status": "unchanged", "count": 3},
+    ]
+
+    repository = MovieGraphRepository(StorageSettings())
+
+    # when
+    counts = repository.insert_many([test_film])
+
+    # then
+    assert counts == InsertCounts(created=2, updated=0, unchanged=3)
+    assert counts.total == 5
+
+    # the fingerprints are sent along with the properties
+    rows = mock_session.run.call_args.kwargs["parameters"]["rows"]
+    assert FINGERPRINT_PROPERTY in rows[0]
+
+
+def test_insert_counts_are_serializable():
+
+    # given
+    counts = InsertCounts(created=1, updated=2, unchanged=3)
+
+    # when
+    counts = pickle.loads(pickle.dumps(counts))
+
+    # then
+    assert counts == InsertCounts(created=1, updated=2, unchanged=3)
+    assert counts.total == 6
@@ -21,7 +21,7 @@ def test_insert_a_person(
     count = test_person_graphdb.insert_many([test_person])
 
     # then
-    assert count == 1  # Only one person should be inserted
+    assert count.total == 1  # Only one person should be inserted
 
     # select the person to verify its type
     records, _, _ = test_memgraph_client.execute_query(
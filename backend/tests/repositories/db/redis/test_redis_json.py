@@ -4,7 +4,10 @@ import orjson
 import pytest
 import redis
 from pydantic import HttpUrl
+from pytest_mock import MockerFixture
 from redis.commands.json.path import Path
+from redis.commands.search.aggregation import AggregateResult, Cursor
+from redis.commands.search.commands import SearchCommands
 
 from src.entities.movie import Movie
 from src.repositories.db.redis.json import RedisJsonStorage
@@ -81,7 +84,6 @@ def test_redis_json_scan_film(test_film: Movie, test_settings: AppSettings):
     # given
 
     storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
-    storage.on_init()
 
     test_film_1 = test_film.model_copy(deep=True)
     test_film_1.title = test_film_1.title + " 1"
@@ -102,6 +104,9 @@ def test_redis_json_scan_film(test_film: Movie, test_settings: AppSettings):
         test_film.model_dump(mode="json"),
     )
 
+    # the documents stored before the storage maintained its index are indexed once
+    storage.on_init()
+
     # Now scan it
     scanned_content = list(storage.scan())
 
@@ -122,13 +127,170 @@ def test_redis_json_scan_film(test_film: Movie, test_settings: AppSettings):
     ), "All scanned items should be Film instances"
 
 
+def test_redis_json_scan_by_batches(
+    mocker: MockerFixture, test_film: Movie, test_settings: AppSettings
+):
+    """the contents are loaded by batches, not one by one"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    films = [
+        test_film.model_copy(update={"uid": f"{test_film.uid}-{i}"}) for i in range(12)
+    ]
+    storage.insert_many(films)
+
+    get = mocker.spy(redis.commands.json.JSON, "get")
+    mget = mocker.spy(redis.commands.json.JSON, "mget")
+
+    # when
+    scanned = list(storage.scan(count=5, batch_size=4))
+
+    # then
+    assert sorted(uid for uid, _ in scanned) == sorted(film.uid for film in films)
+    assert get.call_count == 0
+    assert 3 <= mget.call_count <= 12
+
+
+def test_redis_json_scan_partitions(
+    mocker: MockerFixture, test_film: Movie, test_settings: AppSettings
+):
+    """the partitions are disjoint and cover all the documents, without scanning the keyspace"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.on_init()
+
+    films = [
+        test_film.model_copy(update={"uid": f"{test_film.uid}-{i}"}) for i in range(30)
+    ]
+    storage.insert_many(films)
+
+    scan = mocker.spy(redis.Redis, "scan")
+
+    # when
+    partitions = [
+        [uid for uid, _ in storage.scan(partition=i, num_partitions=2)]
+        for i in range(2)
+    ]
+
+    # then
+    assert sorted(sum(partitions, [])) == sorted(film.uid for film in films)
+    assert all(partitions), "each partition should get some documents"
+    assert scan.call_count == 0
+
+
+def test_redis_json_delete(test_film: Movie, test_settings: AppSettings):
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert(test_film.uid, test_film)
+
+    # when
+    storage.delete(test_film.uid)
+
+    # then
+    assert storage.select(test_film.uid) is None
+    assert list(storage.scan()) == []
+
+
+def test_redis_json_select_fields(test_film: Movie, test_settings: AppSettings):
+    """only the projected fields are loaded, the entity is not validated"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert(test_film.uid, test_film)
+
+    # when
+    movie = storage.select(
+        test_film.uid, fields=["specifications.written_by", "influences"]
+    )
+
+    # then
+    assert isinstance(movie, Movie)
+    assert movie.uid == test_film.uid
+    assert movie.title == test_film.title
+    assert movie.specifications.written_by == ["Christopher Nolan"]
+    assert movie.specifications.directed_by is None
+    assert movie.influences[0].persons == ["Christopher Nolan"]
+    assert movie.actors is None, "the fields not projected are not loaded"
+    assert movie.media is None
+    assert storage.select("Movie:unknown", fields=["influences"]) is None
+
+
+def test_redis_json_scan_fields(
+    mocker: MockerFixture, test_film: Movie, test_settings: AppSettings
+):
+    """the projection is loaded by batches, the entities are not validated"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    films = [
+        test_film.model_copy(update={"uid": f"{test_film.uid}-{i}"}) for i in range(6)
+    ]
+    storage.insert_many(films)
+
+    validate = mocker.spy(Movie, "model_validate")
+
+    # when
+    scanned = list(storage.scan(batch_size=4, fields=["specifications.written_by"]))
+
+    # then
+    assert sorted(uid for uid, _ in scanned) == sorted(film.uid for film in films)
+    assert all(
+        movie.specifications.written_by == ["Christopher Nolan"]
+        and movie.actors is None
+        for _, movie in scanned
+    )
+    assert validate.call_count == 0
+
+
+def test_redis_json_stream(
+    mocker: MockerFixture, test_film: Movie, test_settings: AppSettings
+):
+    """the documents are streamed by chunks, following the cursor until it is exhausted"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage._index_name = "Movie:idx"
+
+    films = [
+        test_film.model_copy(
+            update={"uid": f"{test_film.uid}-{i}", "title": f"{test_film.title} {i}"}
+        )
+        for i in range(5)
+    ]
+    storage.insert_many(films)
+
+    # the cursor returns the keys by chunks of 2
+    pages = [
+        AggregateResult(
+            rows=[["__key", film.uid] for film in films[i : i + 2]],
+            cursor=Cursor(0 if i + 2 >= len(films) else 42),
+            schema=None,
+        )
+        for i in range(0, len(films), 2)
+    ]
+    aggregate = mocker.patch.object(SearchCommands, "aggregate", side_effect=pages)
+
+    # when
+    chunks = list(storage.stream(chunk_size=2))
+
+    # then
+    assert [[movie.uid for movie in chunk] for chunk in chunks] == [
+        [film.uid for film in films[i : i + 2]] for i in range(0, len(films), 2)
+    ]
+    assert aggregate.call_count == 3
+    assert "WITHCURSOR" in aggregate.call_args_list[0].args[0].build_args()
+
+
 def test_redis_json_query_by_permalink(test_film: Movie, test_settings: AppSettings):
     """Test the query method of RedisStorage."""
 
     # given
 
     storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
-    storage.on_init()
 
     test_film_1 = test_film.model_copy(deep=True)
     test_film_1.title = test_film_1.title + " 1"
@@ -188,7 +350,6 @@ def test_redis_json_query_after(test_film: Movie, test_settings: AppSettings):
 
     # given
     storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
-    storage.on_init()
 
     test_film_1 = test_film.model_copy(deep=True)
     test_film_1.title = test_film_1.title + " 1"
@@ -256,6 +417,142 @@ def test_redis_json_insert_many(test_film: Movie, test_settings: AppSettings):
     ), "Title should match the inserted film"
 
 
+def test_redis_json_insert_many_by_batches(
+    mocker: MockerFixture, test_film: Movie, test_settings: AppSettings
+):
+    """a content which cannot be saved does not prevent the others from being saved"""
+
+    # given
+    storage = RedisJsonStorage[Movie](
+        str(test_settings.storage_settings.redis_dsn), batch_size=2
+    )
+
+    films = [
+        test_film.model_copy(update={"uid": f"{test_film.uid}-{i}"}) for i in range(5)
+    ]
+
+    # the third film cannot be serialized
+    dump = storage._dump
+
+    def _dump(content: Movie) -> dict:
+        if content.uid == films[2].uid:
+            raise ValueError("not serializable")
+        return dump(content)
+
+    mocker.patch.object(storage, "_dump", side_effect=_dump)
+
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+
+    # when
+    saved = storage.insert_many(films)
+
+    # then
+    assert saved == 4
+    assert r.exists(films[2].uid) == 0
+    for film in films[:2] + films[3:]:
+        assert r.json().get(film.uid, Path.root_path())["uid"] == film.uid
+
+
+def test_redis_json_index_is_not_rebuilt_when_schema_is_unchanged(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.set(storage._get_schema_key(), storage._schema_fingerprint())
+
+    ft = mocker.spy(redis.Redis, "ft")
+
+    # when
+    storage.on_init()
+
+    # then
+    ft.assert_not_called()
+    assert storage._index_name == "Movie:idx"
+
+
+def test_redis_json_index_is_built_by_a_single_process(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+    """a process does not build the index while another process builds it"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.set(storage._get_lock_key(), "another-process")
+
+    # the previous index is queried meanwhile
+    mocker.patch.object(storage, "_current_index", return_value="Movie:idx:previous")
+    build_index = mocker.patch.object(storage, "_build_index")
+
+    # when
+    storage.on_init()
+
+    # then
+    build_index.assert_not_called()
+    assert r.get(storage._get_lock_key()) == "another-process"
+
+
+def test_redis_json_index_is_awaited_when_built_by_another_process(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+    """without previous index, the queries would fail until the index built by another process is available"""
+
+    # given
+    storage = RedisJsonStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.set(storage._get_lock_key(), "another-process")
+
+    mocker.patch.object(storage, "_current_index", return_value=None)
+    build_index = mocker.patch.object(storage, "_build_index")
+
+    # the other process completes the build while this one waits
+    def _build_by_another_process(_seconds):
+        r.set(storage._get_schema_key(), storage._schema_fingerprint())
+        r.delete(storage._get_lock_key())
+
+    sleep = mocker.patch(
+        "src.repositories.db.redis.json.time.sleep",
+        side_effect=_build_by_another_process,
+    )
+
+    # when
+    storage.on_init()
+
+    # then
+    sleep.assert_called_once()
+    build_index.assert_not_called()
+
+
+def test_redis_json_schema_fingerprint():
+
+    # given
+    from src.entities.person import Person
+
+    # when
+    movie_fingerprint = RedisJsonStorage[Movie]("redis://")._schema_fingerprint()
+
+    # then
+    assert (
+        movie_fingerprint == RedisJsonStorage[Movie]("redis://")._schema_fingerprint()
+    )
+    assert (
+        movie_fingerprint != RedisJsonStorage[Person]("redis://")._schema_fingerprint()
+    )
+
+
 def test_redis_json_is_json_serializable(test_settings: AppSettings):
     """serialization is required for Prefect storage serializers"""
 
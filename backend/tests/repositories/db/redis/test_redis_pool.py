@@ -0,0 +1,137 @@
+import pickle
+
+import pytest
+import redis
+
+from src.entities.movie import Movie
+from src.entities.person import Person
+from src.repositories.db.redis.json import RedisJsonStorage
+from src.repositories.db.redis.text import RedisTextStorage
+from src.repositories.stats import RedisStatsCollector
+from src.settings import AppSettings
+
+
+@pytest.fixture(scope="function", autouse=True)
+def cleanup_redis(test_settings: AppSettings):
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.flushdb()
+    yield
+    r.flushdb()
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """pools are shared by the process, each test starts without pool"""
+
+    from src.repositories.db.redis import pool
+
+    pool._pools.clear()
+    yield
+    pool._pools.clear()
+
+
+def test_handlers_share_the_pool_of_a_dsn(test_settings: AppSettings):
+
+    # given
+    from src.repositories.db.redis.pool import get_connection_pool
+
+    redis_dsn = test_settings.storage_settings.redis_dsn
+
+    movie_storage = RedisJsonStorage[Movie](redis_dsn, max_connections=5)
+    person_storage = RedisJsonStorage[Person](redis_dsn, max_connections=5)
+
+    # when
+    for storage in (movie_storage, person_storage):
+        with storage.client() as _client:
+            _client.set("key", "value")
+            _client.get("key")
+
+    # then
+    pool = get_connection_pool(redis_dsn, max_connections=5)
+
+    # the connection is released to the pool after each operation, and reused by the next one
+    assert len([c for c in pool._connections if c is not None]) == 1
+
+
+def test_text_storage_reads_bytes(test_settings: AppSettings):
+    """the text storage has its own pool, which responses are not decoded"""
+
+    # given
+    storage = RedisTextStorage[Movie](test_settings.storage_settings.redis_dsn)
+
+    # when
+    with storage.client() as _client:
+        _client.set("key", "value")
+        value = _client.get("key")
+
+    # then
+    assert value == b"value"
+
+
+def test_handlers_reconnect_after_pickling(test_settings: AppSettings):
+    """Prefect may pickle the handlers to send them to other processes"""
+
+    # given
+    stats_collector = RedisStatsCollector(
+        test_settings.stats_settings.redis_dsn, max_connections=2
+    )
+    stats_collector.set_value("test_key", "flow", 1)
+
+    # when
+    restored = pickle.loads(pickle.dumps(stats_collector))
+
+    # then
+    assert restored.get_value("test_key", "flow") == 1
+
+
+def test_clients_wait_for_a_connection(test_settings: AppSettings):
+    """the pool never opens more connections than its size"""
+
+    # given
+    from src.repositories.db.redis.pool import get_connection_pool, pooled_client
+
+    redis_dsn = test_settings.storage_settings.redis_dsn
+
+    pool = get_connection_pool(redis_dsn, max_connections=1)
+    pool.timeout = 0.1
+
+    # the single connection of the pool is in use
+    connection = pool.get_connection()
+
+    try:
+        # when / then
+        with pooled_client(redis_dsn, max_connections=1) as _client:
+            with pytest.raises(redis.ConnectionError):
+                _client.ping()
+
+    finally:
+        pool.release(connection)
+
+
+def test_stats_are_flushed_without_retry(test_settings: AppSettings):
+    """the increments are not idempotent, they must not be sent twice"""
+
+    # given
+    from src.repositories.db.redis.pool import get_connection_pool
+
+    redis_dsn = test_settings.stats_settings.redis_dsn
+
+    stats_collector = RedisStatsCollector(redis_dsn, max_connections=2)
+    stats_collector.set_value("test_key", "flow-without-retry", 0)
+    stats_collector.inc_value("test_key", "flow-without-retry")
+
+    # when
+    stats_collector.flush("flow-without-retry")
+
+    # then
+    pool = get_connection_pool(redis_dsn, max_connections=2, retry=False)
+    connection = pool.get_connection()
+
+    try:
+        assert connection.retry.get_retries() == 0
+    finally:
+        pool.release(connection)
+
+    assert stats_collector.get_value("test_key", "flow-without-retry") == 1
@@ -1,6 +1,7 @@
 import orjson
 import pytest
 import redis
+from pytest_mock import MockerFixture
 
 from src.entities.movie import Movie
 from src.entities.person import Person
@@ -128,6 +129,129 @@ def test_redis_text_scan_with_namespace(test_settings: AppSettings):
     ), f"Expected '{content_id_2}' to be scanned"
 
 
+def test_redis_text_scan_by_batches(mocker: MockerFixture, test_settings: AppSettings):
+    """the contents are loaded by batches, not one by one"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert_many(
+        contents=[f"<html>{i}</html>" for i in range(12)],
+        content_ids=[f"content_{i}" for i in range(12)],
+    )
+
+    get = mocker.spy(redis.Redis, "get")
+    mget = mocker.spy(redis.Redis, "mget")
+
+    # when
+    scanned = list(storage.scan(count=5, batch_size=4))
+
+    # then
+    assert sorted(scanned) == sorted(
+        (f"content_{i}", f"<html>{i}</html>") for i in range(12)
+    )
+    assert get.call_count == 0
+    assert 3 <= mget.call_count <= 12
+
+
+def test_redis_text_scan_partitions(mocker: MockerFixture, test_settings: AppSettings):
+    """the partitions are disjoint and cover all the contents, without scanning the keyspace"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.on_init()
+    storage.insert_many(
+        contents=[f"<html>{i}</html>" for i in range(50)],
+        content_ids=[f"content_{i}" for i in range(50)],
+    )
+    RedisTextStorage[Person](str(test_settings.storage_settings.redis_dsn)).insert(
+        "content_person", "<html>person</html>"
+    )
+
+    scan = mocker.spy(redis.Redis, "scan")
+
+    # when
+    partitions = [
+        [content_id for content_id, _ in storage.scan(partition=i, num_partitions=3)]
+        for i in range(3)
+    ]
+
+    # then
+    assert sorted(sum(partitions, [])) == sorted(f"content_{i}" for i in range(50))
+    assert all(partitions), "each partition should get some contents"
+    assert scan.call_count == 0
+
+
+def test_redis_text_scan_invalid_partition(test_settings: AppSettings):
+
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    with pytest.raises(ValueError):
+        list(storage.scan(partition=3, num_partitions=3))
+
+
+def test_redis_text_on_init_indexes_stored_contents(test_settings: AppSettings):
+    """the contents stored before their IDs were indexed are indexed once"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.set(storage._get_key("content_1"), "<html>1</html>")
+    r.set(storage._get_key("content_2"), "<html>2</html>")
+
+    # when
+    storage.on_init()
+    storage.insert("content_3", "<html>3</html>")
+
+    # then
+    assert r.zcard(storage._get_ids_key()) == 3
+    assert sorted(storage.scan(num_partitions=1)) == [
+        ("content_1", "<html>1</html>"),
+        ("content_2", "<html>2</html>"),
+        ("content_3", "<html>3</html>"),
+    ]
+
+
+def test_redis_text_scan_before_the_ids_are_indexed(test_settings: AppSettings):
+    """the contents stored before their IDs were indexed are scanned until they are indexed"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.set(storage._get_key("content_1"), "<html>1</html>")
+
+    # when
+    # the index exists, but does not hold the contents stored before it
+    storage.insert("content_2", "<html>2</html>")
+
+    # then
+    assert sorted(storage.scan()) == [
+        ("content_1", "<html>1</html>"),
+        ("content_2", "<html>2</html>"),
+    ]
+
+
+def test_redis_text_delete(test_settings: AppSettings):
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert("content_1", "<html>1</html>", revision_id=1)
+    storage.insert("content_2", "<html>2</html>", revision_id=2)
+
+    # when
+    storage.delete("content_1")
+
+    # then
+    assert storage.select("content_1") is None
+    assert storage.select_revisions(["content_1", "content_2"]) == {"content_2": 2}
+    assert list(storage.scan()) == [("content_2", "<html>2</html>")]
+
+
 def test_redis_text_insert_overwrite(test_settings: AppSettings):
     """Test that inserting content with an existing ID overwrites the previous content."""
 
@@ -153,6 +277,245 @@ def test_redis_text_insert_overwrite(test_settings: AppSettings):
     ), f"Expected '{updated_content}', but got '{retrieved_content}'"
 
 
+def test_redis_text_insert_with_revision(test_settings: AppSettings):
+    """the revision is stored along with the content, and is discarded when the content is replaced without revision"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+
+    # when
+    storage.insert("content_1", "<html>1</html>", revision_id=100)
+    storage.insert("content_2", "<html>2</html>", revision_id=200)
+    storage.insert("content_2", "<html>2 bis</html>")
+
+    # then
+    assert storage.select_revisions(["content_1", "content_2", "content_3"]) == {
+        "content_1": 100
+    }
+    assert storage.select("content_2") == "<html>2 bis</html>"
+
+
+def test_redis_text_insert_many(test_settings: AppSettings):
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert("content_2", "<html>2</html>", revision_id=200)
+
+    # when
+    storage.insert_many(
+        contents=["<html>1</html>", "<html>2 bis</html>"],
+        content_ids=["content_1", "content_2"],
+        revision_ids=[100, None],
+    )
+
+    # then
+    assert storage.select("content_1") == "<html>1</html>"
+    assert storage.select("content_2") == "<html>2 bis</html>"
+    assert storage.select_revisions(["content_1", "content_2"]) == {"content_1": 100}
+
+
+def test_redis_text_insert_many_by_batches(test_settings: AppSettings):
+
+    # given
+    storage = RedisTextStorage[Movie](
+        str(test_settings.storage_settings.redis_dsn), batch_size=2
+    )
+
+    # when
+    saved = storage.insert_many(
+        contents=[f"<html>{i}</html>" for i in range(5)],
+        content_ids=[f"content_{i}" for i in range(5)],
+        revision_ids=list(range(5)),
+    )
+
+    # then
+    assert saved == 5
+    assert storage.select("content_4") == "<html>4</html>"
+    assert storage.select_revisions(["content_0", "content_4"]) == {
+        "content_0": 0,
+        "content_4": 4,
+    }
+
+
+def test_redis_text_scan_ignores_revisions(test_settings: AppSettings):
+    """the revisions are not scanned as contents"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert("content_1", "<html>1</html>", revision_id=100)
+
+    # when
+    scanned_content = list(storage.scan())
+
+    # then
+    assert scanned_content == [("content_1", "<html>1</html>")]
+
+
+def _html_page(i: int) -> str:
+    """a page as redundant as the HTML of Wikipedia"""
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'/>"
+        f"<title>Film {i}</title></head><body><section data-mw-section-id='0'>"
+        f"<p>Le Film {i} est un film muet français réalisé en {1900 + i % 30}.</p>"
+        f"<table class='infobox'><tr><th>Réalisation</th><td>Réalisateur {i % 7}</td></tr>"
+        f"<tr><th>Durée</th><td>{i % 90} minutes</td></tr></table>"
+        "</section></body></html>"
+    )
+
+
+def test_redis_text_compression(test_settings: AppSettings):
+    """compressed and uncompressed contents are both read"""
+
+    # given
+    redis_dsn = str(test_settings.storage_settings.redis_dsn)
+
+    plain_storage = RedisTextStorage[Movie](redis_dsn)
+    compressed_storage = RedisTextStorage[Movie](redis_dsn, compression="zstd")
+
+    r = redis.Redis.from_url(redis_dsn)
+
+    # when
+    plain_storage.insert("content_1", _html_page(1))
+    compressed_storage.insert("content_2", _html_page(2), revision_id=2)
+
+    # then
+    assert r.get(plain_storage._get_key("content_1")) == _html_page(1).encode()
+    assert r.get(plain_storage._get_key("content_2")).startswith(b"\x00zstd")
+
+    for storage in (plain_storage, compressed_storage):
+        assert storage.select("content_1") == _html_page(1)
+        assert storage.select("content_2") == _html_page(2)
+        assert sorted(storage.scan()) == [
+            ("content_1", _html_page(1)),
+            ("content_2", _html_page(2)),
+        ]
+
+    assert compressed_storage.select_revisions(["content_2"]) == {"content_2": 2}
+
+
+def test_redis_text_recompress_with_dictionary(test_settings: AppSettings):
+    """the contents stored before the dictionary was trained are compressed with it"""
+
+    # given
+    redis_dsn = str(test_settings.storage_settings.redis_dsn)
+
+    plain_storage = RedisTextStorage[Movie](redis_dsn)
+    plain_storage.insert_many(
+        contents=[_html_page(i) for i in range(200)],
+        content_ids=[f"content_{i}" for i in range(200)],
+    )
+
+    storage = RedisTextStorage[Movie](redis_dsn, compression="zstd", batch_size=50)
+
+    r = redis.Redis.from_url(redis_dsn)
+    plain_size = sum(len(r.get(storage._get_key(f"content_{i}"))) for i in range(200))
+
+    # when
+    dict_id = storage.train_dictionary(dict_size=4096)
+    recompressed = storage.recompress()
+
+    # then
+    assert dict_id is not None
+    assert recompressed == 200
+    assert storage.recompress() == 0, "contents are compressed once"
+
+    compressed_size = sum(
+        len(r.get(storage._get_key(f"content_{i}"))) for i in range(200)
+    )
+    assert compressed_size * 3 < plain_size
+
+    assert storage.select("content_42") == _html_page(42)
+    assert plain_storage.select("content_42") == _html_page(42)
+
+    # new contents are compressed with the dictionary
+    storage.insert("content_new", _html_page(1000))
+    assert storage.select("content_new") == _html_page(1000)
+
+
+def test_redis_text_evict_without_retention(test_settings: AppSettings):
+    """the contents are kept in Redis by default"""
+
+    # given
+    storage = RedisTextStorage[Movie](str(test_settings.storage_settings.redis_dsn))
+    storage.insert("content_1", "<html>1</html>")
+
+    # when
+    storage.evict("content_1")
+
+    # then
+    assert list(storage.scan()) == [("content_1", "<html>1</html>")]
+
+
+def test_redis_text_evict_with_ttl(test_settings: AppSettings):
+
+    # given
+    storage = RedisTextStorage[Movie](
+        str(test_settings.storage_settings.redis_dsn),
+        retention="ttl",
+        retention_ttl=60,
+    )
+    storage.on_init()
+    storage.insert("content_1", "<html>1</html>", revision_id=1)
+    storage.insert("content_2", "<html>2</html>", revision_id=2)
+
+    r = redis.Redis.from_url(str(test_settings.storage_settings.redis_dsn))
+
+    # when
+    storage.evict("content_1")
+
+    # then
+    assert 0 < r.ttl(storage._get_key("content_1")) <= 60
+    assert storage.select("content_1") == "<html>1</html>"
+    assert list(storage.scan()) == [("content_2", "<html>2</html>")]
+
+    # the page is downloaded again once expired
+    assert storage.select_revisions(["content_1", "content_2"]) == {"content_2": 2}
+
+    # inserting the content again cancels its expiration
+    storage.insert("content_1", "<html>1</html>")
+    assert r.ttl(storage._get_key("content_1")) == -1
+
+
+def test_redis_text_evict_to_archive(tmp_path, test_settings: AppSettings):
+    """the archived contents are read from the archive"""
+
+    # given
+    storage = RedisTextStorage[Movie](
+        str(test_settings.storage_settings.redis_dsn),
+        retention="archive",
+        archive_directory=tmp_path.as_posix(),
+    )
+    storage.insert("content_1", "<html>1</html>", revision_id=12)
+    storage.insert("content_2", "<html>2</html>")
+
+    r = redis.Redis.from_url(str(test_settings.storage_settings.redis_dsn))
+
+    # when
+    storage.evict("content_1")
+
+    # then
+    assert not r.exists(storage._get_key("content_1"))
+    assert storage.select("content_1") == "<html>1</html>"
+    assert storage.select_revisions(["content_1"]) == {"content_1": 12}
+    assert list(storage.scan()) == [("content_2", "<html>2</html>")]
+
+    # a storage without retention reads the archive too
+    reader = RedisTextStorage[Movie](
+        str(test_settings.storage_settings.redis_dsn),
+        archive_directory=tmp_path.as_posix(),
+    )
+    assert reader.select("content_1") == "<html>1</html>"
+    assert reader.select("content_3") is None
+
+
+def test_redis_text_archive_requires_directory(test_settings: AppSettings):
+
+    with pytest.raises(ValueError):
+        RedisTextStorage[Movie](
+            str(test_settings.storage_settings.redis_dsn), retention="archive"
+        )
+
+
 def test_redis_text_is_serializable(test_settings: AppSettings):
     """serialization is required for Prefect storage serializers"""
 
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from src.repositories.db.archive import SegmentArchive, get_archive
+
+
+def test_archive_put_get(tmp_path: Path):
+
+    # given
+    archive = SegmentArchive(tmp_path)
+
+    # when
+    archive.put("content_1", "<html>1</html>", revision_id=1)
+    archive.put("content_2", "<html>2</html>")
+
+    # then
+    assert archive.get("content_1") == "<html>1</html>"
+    assert archive.get("content_2") == "<html>2</html>"
+    assert archive.get("content_3") is None
+    assert "content_1" in archive
+    assert "content_3" not in archive
+
+
+def test_archive_put_again(tmp_path: Path):
+    """the last copy of a content is read"""
+
+    # given
+    archive = SegmentArchive(tmp_path)
+    archive.put("content_1", "<html>old</html>")
+
+    # when
+    archive.put("content_1", "<html>new</html>")
+
+    # then
+    assert archive.get("content_1") == "<html>new</html>"
+
+
+def test_archive_rotates_segments(tmp_path: Path):
+    """a new segment is started when the current one is full"""
+
+    # given
+    archive = SegmentArchive(tmp_path, segment_size=100)
+
+    # when
+    for i in range(10):
+        archive.put(f"content_{i}", f"<html>{'x' * 200} {i}</html>")
+
+    # then
+    assert len(list(tmp_path.glob("segment-*.zst"))) > 1
+    assert all(
+        archive.get(f"content_{i}") == f"<html>{'x' * 200} {i}</html>"
+        for i in range(10)
+    )
+
+
+def test_get_archive_is_shared(tmp_path: Path):
+    """a single archive is opened per directory in the process"""
+
+    assert get_archive(tmp_path) is get_archive(tmp_path.as_posix())
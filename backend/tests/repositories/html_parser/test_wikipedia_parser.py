@@ -128,6 +128,54 @@ def test_extract_links_with_css_selector():
     assert all(item in expected_output for item in result)
 
 
+def test_extract_links_with_several_css_selectors():
+    """
+    the page is parsed once for the selectors of all the entity types
+    """
+
+    # given
+    extractor = WikipediaParser()
+
+    configs = [
+        TableOfContents(
+            page_id="My TOC Page",
+            entity_type="Movie",
+            inner_links_selector=".wikitable td:nth-child(1)",
+        ),
+        TableOfContents(
+            page_id="My TOC Page",
+            entity_type="Person",
+            inner_links_selector=".wikitable td:nth-child(2)",
+        ),
+    ]
+
+    html_content = """
+    <table class="wikitable">
+        <tr>
+            <th>Titre</th>
+            <th>Réalisateur</th>
+        </tr>
+        <tr>
+            <td><a href="./Film_Title">Film Title</a></td>
+            <td><a href="./Lucien_Nonguet">Lucien Nonguet</a></td>
+        </tr>
+    </table>
+    """
+
+    # when
+    result = extractor.retrieve_inner_links(html_content, configs)
+
+    # then
+    assert result == [
+        PageLink(page_title="Film Title", page_id="Film_Title", entity_type="Movie"),
+        PageLink(
+            page_title="Lucien Nonguet",
+            page_id="Lucien_Nonguet",
+            entity_type="Person",
+        ),
+    ]
+
+
 def test_dedup_extract_links():
 
     # given
@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from src.exceptions import HttpError
+from src.settings import AppSettings
+
+
+def test_async_get_as_json(httpx_mock: HTTPXMock, test_settings: AppSettings):
+
+    # given
+    from src.repositories.http.async_http import AsyncHttpClient
+
+    settings = test_settings
+    http_client = AsyncHttpClient(settings=settings.scraping_settings)
+
+    name = "Lucien Nonguet"
+
+    url = f"https://fr.wikipedia.org/w/rest.php/v1/page/{name}/bare"
+
+    httpx_mock.add_response(
+        json={"title": name},
+    )
+
+    async def _send():
+        try:
+            return await http_client.send(url, response_type="json")
+        finally:
+            await http_client.aclose()
+
+    # when
+    response = asyncio.run(_send())
+
+    # then
+    assert isinstance(response, dict)
+
+
+def test_async_get_as_text(httpx_mock: HTTPXMock, test_settings: AppSettings):
+
+    # given
+    from src.repositories.http.async_http import AsyncHttpClient
+
+    settings = test_settings
+    http_client = AsyncHttpClient(settings=settings.scraping_settings)
+
+    url = "https://fr.wikipedia.org/w/rest.php/v1/page/Lucien_Nonguet/bare"
+
+    httpx_mock.add_response(
+        text="<html><head><title>Lucien Nonguet</title></head><body>...</body></html>",
+    )
+
+    async def _send():
+        try:
+            return await http_client.send(url, response_type="text")
+        finally:
+            await http_client.aclose()
+
+    # when
+    response = asyncio.run(_send())
+
+    assert isinstance(response, str)
+    assert len(response) > 0
+
+
+def test_async_get_404(httpx_mock: HTTPXMock, test_settings: AppSettings):
+
+    # given
+    from src.repositories.http.async_http import AsyncHttpClient
+
+    settings = test_settings
+    http_client = AsyncHttpClient(settings=settings.scraping_settings)
+
+    url = "https://fr.wikipedia.org/404"
+
+    httpx_mock.add_response(
+        status_code=404,
+    )
+
+    async def _send():
+        try:
+            return await http_client.send(url)
+        finally:
+            await http_client.aclose()
+
+    with pytest.raises(HttpError) as e:
+        asyncio.run(_send())
+
+    assert e.value.status_code == 404
+
+
+def test_async_get_concurrent_requests_share_the_client(
+    httpx_mock: HTTPXMock, test_settings: AppSettings
+):
+    """
+    the requests sent in the same event loop share the same connections
+    """
+
+    # given
+    from src.repositories.http.async_http import AsyncHttpClient
+
+    settings = test_settings
+    http_client = AsyncHttpClient(settings=settings.scraping_settings)
+
+    httpx_mock.add_response(text="<html>...</html>", is_reusable=True)
+
+    urls = [f"https://fr.wikipedia.org/wiki/Page_{i}" for i in range(20)]
+
+    async def _send():
+        try:
+            first_client, _ = http_client._pool()
+            responses = await asyncio.gather(
+                *[http_client.send(url, response_type="text") for url in urls]
+            )
+            last_client, _ = http_client._pool()
+            return responses, first_client is last_client
+        finally:
+            await http_client.aclose()
+
+    # when
+    responses, is_shared = asyncio.run(_send())
+
+    # then
+    assert len(responses) == len(urls)
+    assert is_shared is True
+    assert len(httpx_mock.get_requests()) == len(urls)
+
+
+def test_async_connections_are_kept_in_the_event_loop_of_the_process(
+    httpx_mock: HTTPXMock, test_settings: AppSettings
+):
+    """
+    the synchronous callers share the connections of the event loop of the process, until the client is closed
+    """
+
+    # given
+    from src.repositories.http.async_http import AsyncHttpClient
+    from src.repositories.http.event_loop import run_coroutine
+
+    http_client = AsyncHttpClient(settings=test_settings.scraping_settings)
+
+    httpx_mock.add_response(text="<html>...</html>", is_reusable=True)
+
+    async def _pooled_client():
+        return http_client._pool()[0]
+
+    # when
+    for i in range(2):
+        run_coroutine(
+            http_client.send(
+                f"https://fr.wikipedia.org/wiki/Page_{i}", response_type="text"
+            )
+        )
+
+    pooled_client = run_coroutine(_pooled_client())
+    http_client.close()
+
+    # then
+    assert len(httpx_mock.get_requests()) == 2
+    assert pooled_client.is_closed is True
+    assert run_coroutine(_pooled_client()) is not pooled_client
+    http_client.close()
+
+
+def test_async_is_serializable(test_settings: AppSettings):
+    """serialization is required for Prefect storage serializers"""
+
+    # given
+    import orjson
+
+    from src.repositories.http.async_http import AsyncHttpClient
+
+    http_client = AsyncHttpClient(settings=test_settings.scraping_settings)
+
+    # when
+    serialized = orjson.dumps(http_client, default=lambda o: o.__dict__)
+
+    # then
+    assert isinstance(serialized, bytes)
@@ -0,0 +1,157 @@
+import os
+from email.utils import formatdate
+from pathlib import Path
+
+import hishel
+from pytest_httpx import HTTPXMock
+
+from src.settings import AppSettings
+
+
+def test_response_is_served_from_cache(
+    httpx_mock: HTTPXMock, test_settings: AppSettings
+):
+
+    # given
+    from src.repositories.http.cache_storage import SQLiteCacheStorage
+    from src.repositories.http.sync_http import SyncHttpClient
+
+    http_client = SyncHttpClient(settings=test_settings.scraping_settings)
+
+    url = "https://fr.wikipedia.org/w/rest.php/v1/page/Lucien_Nonguet/html"
+
+    httpx_mock.add_response(
+        text="<html><body>Lucien Nonguet</body></html>",
+        headers={
+            "Cache-Control": "max-age=3600",
+            "Date": formatdate(usegmt=True),
+        },
+    )
+
+    with http_client.client() as _client:
+        storage = _client._transport._storage
+
+    # the cache is shared by the clients of the process
+    before = storage.stats()
+
+    # when
+    first = http_client.send(url, response_type="text")
+    second = http_client.send(url, response_type="text")
+
+    # then
+    after = storage.stats()
+
+    assert isinstance(storage, SQLiteCacheStorage)
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+    assert after["entries"] - before["entries"] == 1
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path: Path):
+
+    # given
+    from src.repositories.http.cache_storage import _SQLiteCache
+
+    cache = _SQLiteCache((tmp_path / "cache.sqlite").as_posix(), max_size=1024)
+
+    # random bytes are not compressible, each blob takes ~300 bytes
+    blobs = {f"key-{i}": os.urandom(300) for i in range(3)}
+    for key, blob in blobs.items():
+        cache.put(key, blob)
+
+    # key-0 becomes more recent than key-1
+    cache.get("key-0")
+
+    # when
+    cache.put("key-3", os.urandom(300))
+
+    # then
+    assert cache.get("key-1") is None
+    assert cache.get("key-0") == blobs["key-0"]
+    assert cache.stats()["size"] <= 1024
+
+
+def test_expired_responses_are_not_retrieved(tmp_path: Path):
+
+    # given
+    from src.repositories.http.cache_storage import _SQLiteCache
+
+    cache = _SQLiteCache((tmp_path / "cache.sqlite").as_posix(), max_size=1024, ttl=0)
+
+    cache.put("key", b"content")
+
+    # when
+    content = cache.get("key")
+
+    # then
+    assert content is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_replaced_response_is_not_counted_twice(tmp_path: Path):
+
+    # given
+    from src.repositories.http.cache_storage import _SQLiteCache
+
+    cache = _SQLiteCache((tmp_path / "cache.sqlite").as_posix(), max_size=1024)
+
+    # when
+    for _ in range(5):
+        cache.put("key", os.urandom(300))
+
+    # then
+    assert cache._size == cache.stats()["size"]
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_usage_is_tracked_within_the_context(tmp_path: Path):
+
+    # given
+    from src.repositories.http.cache_storage import _SQLiteCache, track_cache_usage
+
+    cache = _SQLiteCache((tmp_path / "cache.sqlite").as_posix(), max_size=1024)
+    cache.put("key", b"content")
+
+    # when
+    with track_cache_usage() as usage:
+        cache.get("key")
+        cache.get("other-key")
+
+    cache.get("key")
+
+    # then
+    assert usage == {"hits": 1, "misses": 1}
+
+
+def test_file_backend(test_settings: AppSettings):
+
+    # given
+    from src.repositories.http.cache_storage import create_cache_storage
+
+    settings = test_settings.scraping_settings.model_copy(
+        update={"cache_backend": "file"}
+    )
+
+    # when
+    storage = create_cache_storage(settings)
+
+    # then
+    assert isinstance(storage, hishel.FileStorage)
+
+
+def test_cache_dir_is_absolute(test_settings: AppSettings):
+
+    # given
+    from src.settings import ScrapingSettings
+
+    # when
+    settings = ScrapingSettings(
+        _env_file=None,
+        config_file=test_settings.scraping_settings.config_file,
+        cache_dir="./relative/cache",
+    )
+
+    # then
+    assert Path(settings.cache_dir).is_absolute()
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.settings import AppSettings
+
+
+@pytest.fixture(autouse=True)
+def reset_buckets():
+    """buckets are shared by the process, each test starts with an empty bucket"""
+
+    from src.repositories.http import rate_limiter
+
+    rate_limiter._buckets.clear()
+    yield
+    rate_limiter._buckets.clear()
+
+
+def test_tokens_are_leased_by_blocks(mocker: MockerFixture, test_settings: AppSettings):
+
+    # given
+    from src.repositories.http.rate_limiter import TokenBucketRateLimiter
+
+    settings = test_settings.scraping_settings.model_copy(
+        update={"rate_limit_block_size": 5}
+    )
+    rate_limiter = TokenBucketRateLimiter(settings=settings)
+
+    mocker.patch.object(TokenBucketRateLimiter, "_read_lease_size", return_value=5)
+    global_rate_limit = mocker.patch("src.repositories.http.rate_limiter.rate_limit")
+
+    # when
+    for _ in range(12):
+        rate_limiter.acquire()
+
+    # then
+    assert global_rate_limit.call_count == 3
+    global_rate_limit.assert_called_with(settings.rate_limit_name, occupy=5)
+
+
+def test_tokens_are_not_leased_without_global_limit(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+
+    # given
+    from src.repositories.http.rate_limiter import TokenBucketRateLimiter
+
+    rate_limiter = TokenBucketRateLimiter(settings=test_settings.scraping_settings)
+
+    mocker.patch.object(TokenBucketRateLimiter, "_read_lease_size", return_value=0)
+    global_rate_limit = mocker.patch("src.repositories.http.rate_limiter.rate_limit")
+
+    # when
+    for _ in range(10):
+        rate_limiter.acquire()
+
+    # then
+    global_rate_limit.assert_not_called()
+
+
+def test_tokens_are_shared_between_limiters(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+    """limiters created by different tasks of the same process share the bucket"""
+
+    # given
+    from src.repositories.http.rate_limiter import TokenBucketRateLimiter
+
+    settings = test_settings.scraping_settings.model_copy(
+        update={"rate_limit_block_size": 4}
+    )
+
+    mocker.patch.object(TokenBucketRateLimiter, "_read_lease_size", return_value=4)
+    global_rate_limit = mocker.patch("src.repositories.http.rate_limiter.rate_limit")
+
+    # when
+    for _ in range(4):
+        TokenBucketRateLimiter(settings=settings).acquire()
+
+    # then
+    assert global_rate_limit.call_count == 1
+
+
+def test_lease_size_is_read_again_after_an_error(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+    """a transient error does not lease the tokens one by one for the lifetime of the process"""
+
+    # given
+    from src.repositories.http.rate_limiter import TokenBucketRateLimiter
+
+    settings = test_settings.scraping_settings.model_copy(
+        update={"rate_limit_block_size": 5}
+    )
+    rate_limiter = TokenBucketRateLimiter(settings=settings)
+
+    read_lease_size = mocker.patch.object(
+        TokenBucketRateLimiter, "_read_lease_size", side_effect=[None, 5]
+    )
+    mocker.patch("src.repositories.http.rate_limiter.LEASE_SIZE_RETRY_DELAY", 0)
+    global_rate_limit = mocker.patch("src.repositories.http.rate_limiter.rate_limit")
+
+    # when
+    for _ in range(6):
+        rate_limiter.acquire()
+
+    # then
+    assert read_lease_size.call_count == 2
+    assert [c.kwargs["occupy"] for c in global_rate_limit.call_args_list] == [1, 5]
+
+
+def test_acquire_async(mocker: MockerFixture, test_settings: AppSettings):
+
+    # given
+    from src.repositories.http.rate_limiter import TokenBucketRateLimiter
+
+    settings = test_settings.scraping_settings.model_copy(
+        update={"rate_limit_block_size": 5}
+    )
+    rate_limiter = TokenBucketRateLimiter(settings=settings)
+
+    mocker.patch.object(TokenBucketRateLimiter, "_read_lease_size", return_value=5)
+    global_rate_limit = mocker.patch("src.repositories.http.rate_limiter.rate_limit")
+    global_rate_limit_async = mocker.patch(
+        "src.repositories.http.rate_limiter.rate_limit_async"
+    )
+
+    async def _acquire():
+        await asyncio.gather(*[rate_limiter.acquire_async() for _ in range(10)])
+
+    # when
+    asyncio.run(_acquire())
+
+    # then
+    # the coroutines wait for the global rate limit in the event loop, not in a thread
+    assert global_rate_limit_async.await_count == 2
+    global_rate_limit_async.assert_awaited_with(settings.rate_limit_name, occupy=5)
+    global_rate_limit.assert_not_called()
+
+
+def test_rate_limiter_is_serializable(test_settings: AppSettings):
+    """serialization is required for Prefect storage serializers"""
+
+    # given
+    import orjson
+
+    from src.repositories.http.rate_limiter import TokenBucketRateLimiter
+    from src.repositories.http.sync_http import SyncHttpClient
+
+    http_client = SyncHttpClient(
+        settings=test_settings.scraping_settings,
+        rate_limiter=TokenBucketRateLimiter(settings=test_settings.scraping_settings),
+    )
+
+    # when
+    serialized = orjson.dumps(http_client, default=lambda o: o.__dict__)
+
+    # then
+    assert isinstance(serialized, bytes)
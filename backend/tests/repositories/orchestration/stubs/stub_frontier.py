@@ -0,0 +1,41 @@
+from src.entities.content import PageLink
+from src.interfaces.frontier import IFrontier, LinkStatus
+
+
+class StubFrontier(IFrontier):
+
+    def __init__(self, frontiers: dict[str, list[PageLink]] = None) -> None:
+        self.frontiers: dict[str, dict[str, tuple[PageLink, LinkStatus]]] = {
+            frontier_id: {link.page_id: (link, LinkStatus.PENDING) for link in links}
+            for frontier_id, links in (frontiers or {}).items()
+        }
+        self.is_cleared = False
+
+    def load(self, frontier_id: str) -> list[PageLink] | None:
+
+        if frontier_id not in self.frontiers:
+            return None
+
+        return [
+            link
+            for link, status in self.frontiers[frontier_id].values()
+            if status in (LinkStatus.PENDING, LinkStatus.FAILED)
+        ]
+
+    def save(self, frontier_id: str, page_links: list[PageLink]) -> None:
+        self.frontiers[frontier_id] = {
+            link.page_id: (link, LinkStatus.PENDING) for link in page_links
+        }
+
+    def mark(
+        self, frontier_id: str, page_links: list[PageLink], status: LinkStatus
+    ) -> None:
+        for link in page_links:
+            self.frontiers[frontier_id][link.page_id] = (link, status)
+
+    def status(self, frontier_id: str, page_id: str) -> LinkStatus:
+        return self.frontiers[frontier_id][page_id][1]
+
+    def clear(self, frontier_id: str) -> None:
+        self.frontiers.pop(frontier_id, None)
+        self.is_cleared = True
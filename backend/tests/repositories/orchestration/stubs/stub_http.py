@@ -1,3 +1,5 @@
+import threading
+
 from src.interfaces.http_client import IHttpClient
 
 
@@ -49,3 +51,67 @@ class StubSyncHttpClient(IHttpClient):
         Stub method to simulate closing the HTTP client.
         """
         pass
+
+
+class StubAsyncHttpClient(StubSyncHttpClient):
+    """
+    Same as `StubSyncHttpClient`, for the code paths expecting an asynchronous client.
+    """
+
+    is_closed = False
+    call_count = 0
+
+    async def send(
+        self,
+        url: str,
+        *args,
+        **kwargs,
+    ) -> dict | str:
+        self.call_count += 1
+        return super().send(url, *args, **kwargs)
+
+    async def aclose(self):
+        """
+        Stub method to simulate releasing the connections of the client.
+        """
+        self.is_closed = True
+
+
+class StubFlakyHttpClient(StubSyncHttpClient):
+    """
+    Same as `StubSyncHttpClient`, raising `raise_exc` on the first `failures` calls,
+    and on every call to the URLs containing `fail_on`.
+    """
+
+    call_count = 0
+
+    def __init__(
+        self,
+        response: dict | str = None,
+        raise_exc: Exception = None,
+        failures: int = 0,
+        fail_on: str | None = None,
+    ):
+        super().__init__(response=response)
+        self._exc = raise_exc
+        self._failures = failures
+        self._fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        url: str,
+        *args,
+        **kwargs,
+    ) -> dict | str:
+
+        with self._lock:
+            self.call_count += 1
+            fails = self.call_count <= self._failures or (
+                self._fail_on is not None and self._fail_on in url
+            )
+
+        if fails:
+            raise self._exc
+
+        return super().send(url, *args, **kwargs)
@@ -0,0 +1,35 @@
+from src.entities.content import PageLink
+from src.interfaces.page_registry import IPageRegistry
+
+
+class StubPageRegistry(IPageRegistry):
+
+    def __init__(self, seen: list[PageLink] = None, owner: str | None = None) -> None:
+        """the pages `seen` are claimed by the flow run `owner`"""
+        self.seen: dict[tuple[str, str], str] = {
+            (link.entity_type, link.page_id): owner or "" for link in seen or []
+        }
+        self.released: list[PageLink] = []
+
+    def claim(self, page_links: list[PageLink], flow_id: str) -> list[PageLink]:
+
+        claimed = []
+
+        for link in page_links:
+            if (link.entity_type, link.page_id) not in self.seen:
+                self.seen[(link.entity_type, link.page_id)] = flow_id or ""
+                claimed.append(link)
+
+        return claimed
+
+    def take_over(self, page_links: list[PageLink], flow_id: str) -> None:
+
+        for link in page_links:
+            self.seen[(link.entity_type, link.page_id)] = flow_id or ""
+
+    def release(self, page_links: list[PageLink], flow_id: str) -> None:
+
+        for link in page_links:
+            if self.seen.get((link.entity_type, link.page_id)) == (flow_id or ""):
+                del self.seen[(link.entity_type, link.page_id)]
+                self.released.append(link)
@@ -5,6 +5,7 @@ class StubStatsCollector(IStatsCollector):
 
     def __init__(self) -> None:
         self.data: dict[StatKey, int] = {}
+        self.is_flushed = False
 
     def get_value(self, key: StatKey, flow_id: str, default: int | None = None) -> int:
         return self.data.get(key, default)
@@ -21,6 +22,9 @@ class StubStatsCollector(IStatsCollector):
     ) -> None:
         self.data[key] = self.data.get(key, start) + count
 
+    def flush(self, flow_id: str | None = None) -> None:
+        self.is_flushed = True
+
     def collect(self, flow_id: str) -> dict[str, int]:
 
         return {key.value: value for key, value in self.data.items()}
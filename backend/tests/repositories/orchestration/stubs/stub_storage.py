@@ -2,7 +2,11 @@ from typing import Generator
 
 from src.entities.composable import Composable
 from src.entities.relationship import BaseRelationship
-from src.interfaces.storage import IRelationshipHandler, IStorageHandler
+from src.interfaces.storage import (
+    IRelationshipHandler,
+    IStorageHandler,
+    IVersionedStorageHandler,
+)
 
 
 class StubStorage[T: Composable](IStorageHandler[T]):
@@ -52,6 +56,7 @@ class StubStorage[T: Composable](IStorageHandler[T]):
     def scan(
         self,
         *args,
+        **kwargs,
     ) -> Generator[tuple[str, T], None, None]:
         for i, content in enumerate(self._contents_in_store):
             yield i, content
@@ -70,10 +75,37 @@ class StubStorage[T: Composable](IStorageHandler[T]):
         raise NotImplementedError
 
 
+class StubVersionedStorage[T: Composable](StubStorage[T], IVersionedStorageHandler[T]):
+
+    _revisions: dict[str, int]
+
+    def __init__(self, revisions: dict[str, int] = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._revisions = dict(revisions or {})
+
+    def insert(
+        self,
+        content_id: str,
+        content: T,
+        revision_id: int | None = None,
+    ) -> None:
+        super().insert(content_id, content)
+        if revision_id is not None:
+            self._revisions[content_id] = revision_id
+
+    def select_revisions(self, content_ids, *args, **kwargs) -> dict[str, int]:
+        return {
+            content_id: self._revisions[content_id]
+            for content_id in content_ids
+            if content_id in self._revisions
+        }
+
+
 class StubRelationHandler[T: Composable](StubStorage[T], IRelationshipHandler[T]):
 
     is_added_relationship: bool = False
     relationship: BaseRelationship
+    relationships: list[BaseRelationship] = []
 
     def add_relationship(
         self,
@@ -83,3 +115,13 @@ class StubRelationHandler[T: Composable](StubStorage[T], IRelationshipHandler[T]
     ) -> None:
         self.relationship = relationship
         self.is_added_relationship = True
+
+    def add_relationships(
+        self,
+        relationships,
+        *args,
+        **kwargs,
+    ) -> None:
+        self.relationships = list(relationships)
+        for relationship in relationships:
+            self.add_relationship(relationship)
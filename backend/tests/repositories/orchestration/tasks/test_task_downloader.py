@@ -1,17 +1,29 @@
+from unittest.mock import MagicMock
+
 import pytest
 
 from src.entities.content import PageLink, TableOfContents
 from src.exceptions import HttpError
+from src.interfaces.frontier import LinkStatus
+from src.interfaces.stats import StatKey
 from src.repositories.orchestration.tasks.task_scraper import (
+    discard_unchanged_links,
     download_and_store,
     execute_task,
     extract_page_links,
 )
 from src.settings import AppSettings
 
-from ..stubs.stub_http import StubSyncHttpClient
+from ..stubs.stub_frontier import StubFrontier
+from ..stubs.stub_http import (
+    StubAsyncHttpClient,
+    StubFlakyHttpClient,
+    StubSyncHttpClient,
+)
+from ..stubs.stub_page_registry import StubPageRegistry
 from ..stubs.stub_parser import StubContentParser
-from ..stubs.stub_storage import StubStorage
+from ..stubs.stub_stats import StubStatsCollector
+from ..stubs.stub_storage import StubStorage, StubVersionedStorage
 
 
 def test_downloader_task_download_return_page_id(test_settings: AppSettings):
@@ -101,6 +113,36 @@ def test_downloader_task_download_and_store_http_error(test_settings: AppSetting
     assert "Boom" in str(exc_info.value)
 
 
+def test_downloader_task_download_and_store_retries_http_error(
+    test_settings: AppSettings,
+):
+
+    # given
+    client = StubFlakyHttpClient(
+        response="<html>Test Content</html>",
+        raise_exc=HttpError("Boom", status_code=503),
+        failures=1,
+    )
+    storage_handler = StubStorage()
+    stats_collector = StubStatsCollector()
+
+    # when
+    page_id = download_and_store(
+        http_client=client,
+        page_id="page_id",
+        return_content=False,
+        scraping_settings=test_settings.scraping_settings,
+        storage_handler=storage_handler,
+        stats_collector=stats_collector,
+    )
+
+    # then
+    assert page_id == "page_id"
+    assert client.call_count == 2
+    assert stats_collector.get_value(StatKey.SCRAPING_FAILED, flow_id=None) is None
+    assert stats_collector.get_value(StatKey.SCRAPING_SUCCESS, flow_id=None) == 1
+
+
 def test_downloader_task_extract_page_links(test_settings: AppSettings):
 
     # given
@@ -164,6 +206,43 @@ def test_downloader_task_execute_with_TableOfContents(test_settings: AppSettings
     assert storage_handler.is_inserted is True
 
 
+def test_downloader_task_execute_failing_link_does_not_stop_the_others(
+    test_settings: AppSettings,
+):
+    """the links are downloaded concurrently, a link failing after its retries fails the task once the others are stored"""
+
+    client = StubFlakyHttpClient(
+        response="<html>Test Content</html>",
+        raise_exc=HttpError("Boom", status_code=503),
+        fail_on="link2",
+    )
+
+    storage_handler = StubStorage()
+    extractor = StubContentParser(
+        inner_links=[
+            PageLink(page_id=f"link{i}", entity_type="Movie") for i in range(1, 6)
+        ]
+    )
+
+    # when
+    with pytest.raises(HttpError):
+        execute_task(
+            page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+            scraping_settings=test_settings.scraping_settings,
+            http_client=client,
+            storage_handler=storage_handler,
+            link_extractor=extractor,
+        )
+
+    # then
+    assert len(storage_handler._inserted) == 4
+    # the TOC, 4 links, and link2 with its retries
+    assert (
+        client.call_count
+        == 1 + 4 + 1 + test_settings.scraping_settings.link_retry_attempts
+    )
+
+
 def test_downloader_task_execute_with_PageLink(test_settings: AppSettings):
     """when the task is executed with a PageLink, it should download the page content."""
 
@@ -206,3 +285,420 @@ def test_downloader_task_execute_return_results(test_settings: AppSettings):
 
     # then
     assert storage_handler.is_inserted is True
+
+
+def test_downloader_task_execute_with_async_client(test_settings: AppSettings):
+    """when the HTTP client is asynchronous, the TOC and its links are downloaded through it, the connections are kept for the next tasks."""
+
+    client = StubAsyncHttpClient(response="<html>Test Content</html>")
+
+    storage_handler = StubStorage()
+    extractor = StubContentParser(
+        inner_links=[
+            PageLink(page_id="link1", entity_type="Movie"),
+            PageLink(page_id="link2", entity_type="Movie"),
+        ]
+    )
+
+    toc = TableOfContents(page_id="toc_id", entity_type="Movie")
+
+    # when
+    result = execute_task(
+        page=toc,
+        scraping_settings=test_settings.scraping_settings,
+        http_client=client,
+        storage_handler=storage_handler,
+        link_extractor=extractor,
+        return_results=True,
+    )
+
+    # then
+    assert extractor._is_called is True
+    assert sorted(result) == ["link1", "link2"]
+    assert client.call_count == 3  # the TOC and its 2 links
+    assert client.is_closed is False
+    assert storage_handler.is_inserted is True
+
+
+def test_downloader_task_execute_with_TableOfContents_of_several_entity_types(
+    test_settings: AppSettings,
+):
+    """the tables of contents of the same page are downloaded once, the links are stored by entity type"""
+
+    client = StubAsyncHttpClient(response="<html>Test Content</html>")
+
+    movie_storage = StubStorage()
+    person_storage = StubStorage()
+    extractor = StubContentParser(
+        inner_links=[
+            PageLink(page_id="movie1", entity_type="Movie"),
+            PageLink(page_id="person1", entity_type="Person"),
+            PageLink(page_id="person2", entity_type="Person"),
+        ]
+    )
+
+    tocs = [
+        TableOfContents(page_id="toc_id", entity_type="Movie"),
+        TableOfContents(page_id="toc_id", entity_type="Person"),
+    ]
+
+    # when
+    result = execute_task(
+        page=tocs,
+        scraping_settings=test_settings.scraping_settings,
+        http_client=client,
+        storage_handler={"Movie": movie_storage, "Person": person_storage},
+        link_extractor=extractor,
+        return_results=True,
+    )
+
+    # then
+    assert sorted(result) == ["movie1", "person1", "person2"]
+    assert client.call_count == 4  # the TOC once, and its 3 links
+    assert len(movie_storage._inserted) == 1
+    assert len(person_storage._inserted) == 2
+
+
+def test_downloader_task_execute_discards_seen_links(test_settings: AppSettings):
+    """the pages already downloaded by other tasks are not downloaded again"""
+
+    client = StubSyncHttpClient(response="<html>Test Content</html>")
+
+    storage_handler = StubStorage()
+    stats_collector = StubStatsCollector()
+    extractor = StubContentParser(
+        inner_links=[
+            PageLink(page_id="link1", entity_type="Movie"),
+            PageLink(page_id="link2", entity_type="Movie"),
+        ]
+    )
+    page_registry = StubPageRegistry(
+        seen=[PageLink(page_id="link1", entity_type="Movie")]
+    )
+
+    # when
+    result = execute_task(
+        page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+        scraping_settings=test_settings.scraping_settings,
+        http_client=client,
+        storage_handler=storage_handler,
+        link_extractor=extractor,
+        return_results=True,
+        stats_collector=stats_collector,
+        page_registry=page_registry,
+    )
+
+    # then
+    assert result == ["link2"]
+    assert stats_collector.get_value(StatKey.SCRAPING_DUPLICATE, flow_id=None) == 1
+
+
+def test_downloader_task_execute_releases_links_on_error(test_settings: AppSettings):
+    """the pages which could not be downloaded can be downloaded again when the task is retried"""
+
+    client = StubAsyncHttpClient(raise_exc=HttpError("Boom", status_code=503))
+
+    page_link = PageLink(page_id="link1", entity_type="Movie")
+    page_registry = StubPageRegistry()
+
+    # when
+    with pytest.raises(HttpError):
+        execute_task(
+            page=page_link,
+            scraping_settings=test_settings.scraping_settings,
+            http_client=client,
+            storage_handler=StubStorage(),
+            page_registry=page_registry,
+        )
+
+    # then
+    assert page_registry.released == [page_link]
+    assert page_registry.claim([page_link], flow_id=None) == [page_link]
+
+
+def test_downloader_task_execute_flushes_stats_on_error(test_settings: AppSettings):
+    """the stats buffered by the task are written even when the task fails"""
+
+    client = StubAsyncHttpClient(raise_exc=HttpError("Boom", status_code=503))
+    stats_collector = StubStatsCollector()
+
+    # when
+    with pytest.raises(HttpError):
+        execute_task(
+            page=PageLink(page_id="link1", entity_type="Movie"),
+            scraping_settings=test_settings.scraping_settings,
+            http_client=client,
+            storage_handler=StubStorage(),
+            stats_collector=stats_collector,
+        )
+
+    # then
+    assert stats_collector.get_value(StatKey.SCRAPING_FAILED, flow_id=None) == 1
+    assert stats_collector.is_flushed is True
+
+
+def test_downloader_task_execute_resumes_from_frontier(test_settings: AppSettings):
+    """an interrupted scraping resumes from the links left, without downloading the table of contents"""
+
+    client = StubAsyncHttpClient(response="<html>Test Content</html>")
+
+    storage_handler = StubStorage()
+    extractor = StubContentParser(inner_links=[])
+    frontier = StubFrontier(
+        frontiers={
+            "toc_id-Movie": [
+                PageLink(page_id="link1", entity_type="Movie"),
+                PageLink(page_id="link2", entity_type="Movie"),
+            ]
+        }
+    )
+    frontier.mark(
+        "toc_id-Movie",
+        [PageLink(page_id="link1", entity_type="Movie")],
+        LinkStatus.DONE,
+    )
+
+    # when
+    result = execute_task(
+        page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+        scraping_settings=test_settings.scraping_settings,
+        http_client=client,
+        storage_handler=storage_handler,
+        link_extractor=extractor,
+        return_results=True,
+        frontier=frontier,
+    )
+
+    # then
+    assert result == ["link2"]
+    assert client.call_count == 1
+    assert extractor._is_called is False
+    assert frontier.is_cleared is True
+
+
+def test_downloader_task_execute_resumes_the_frontier_of_a_crashed_flow_run(
+    test_settings: AppSettings,
+):
+    """a crashed flow run claimed its links without downloading them, the flow run resuming its frontier downloads them"""
+
+    # given
+    client = StubAsyncHttpClient(response="<html>Test Content</html>")
+    storage_handler = StubStorage()
+
+    links = [
+        PageLink(page_id="link1", entity_type="Movie"),
+        PageLink(page_id="link2", entity_type="Movie"),
+    ]
+
+    # the crashed flow run saved its frontier and claimed all its links at once
+    frontier = StubFrontier()
+    frontier.save("toc_id-Movie", links)
+
+    page_registry = StubPageRegistry()
+    page_registry.claim(links, flow_id="crashed-flow-run")
+
+    # when
+    result = execute_task(
+        page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+        scraping_settings=test_settings.scraping_settings,
+        http_client=client,
+        storage_handler=storage_handler,
+        link_extractor=StubContentParser(inner_links=[]),
+        return_results=True,
+        page_registry=page_registry,
+        frontier=frontier,
+    )
+
+    # then
+    assert sorted(result) == ["link1", "link2"]
+    assert len(storage_handler._inserted) == 2
+    assert frontier.is_cleared is True
+    # the links are now claimed by the flow run which downloaded them
+    assert page_registry.claim(links, flow_id="another-flow-run") == []
+
+
+def test_downloader_task_execute_does_not_mark_links_claimed_by_others_as_done(
+    test_settings: AppSettings,
+):
+    """a link claimed by another task may never be downloaded by it, it remains pending to be resumed"""
+
+    # given
+    client = StubFlakyHttpClient(
+        response="<html>Test Content</html>",
+        raise_exc=HttpError("Boom", status_code=503),
+        fail_on="link2",
+    )
+
+    other_link = PageLink(page_id="link1", entity_type="Movie")
+    extractor = StubContentParser(
+        inner_links=[other_link, PageLink(page_id="link2", entity_type="Movie")]
+    )
+    frontier = StubFrontier()
+    page_registry = StubPageRegistry(seen=[other_link], owner="other-flow-run")
+
+    # when
+    with pytest.raises(HttpError):
+        execute_task(
+            page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+            scraping_settings=test_settings.scraping_settings,
+            http_client=client,
+            storage_handler=StubStorage(),
+            link_extractor=extractor,
+            page_registry=page_registry,
+            frontier=frontier,
+        )
+
+    # then
+    assert frontier.status("toc_id-Movie", "link1") == LinkStatus.PENDING
+    assert frontier.status("toc_id-Movie", "link2") == LinkStatus.FAILED
+
+
+def test_downloader_task_execute_when_frontier_is_unavailable(
+    test_settings: AppSettings,
+):
+    """the frontier is only used to resume the scraping, the scraping goes on when it fails"""
+
+    client = StubAsyncHttpClient(response="<html>Test Content</html>")
+    extractor = StubContentParser(
+        inner_links=[PageLink(page_id="link1", entity_type="Movie")]
+    )
+
+    frontier = StubFrontier()
+    frontier.load = frontier.save = frontier.clear = MagicMock(
+        side_effect=ConnectionError("Boom")
+    )
+
+    # when
+    result = execute_task(
+        page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+        scraping_settings=test_settings.scraping_settings,
+        http_client=client,
+        storage_handler=StubStorage(),
+        link_extractor=extractor,
+        return_results=True,
+        frontier=frontier,
+    )
+
+    # then
+    assert result == ["link1"]
+    assert extractor._is_called is True
+
+
+def test_downloader_task_execute_saves_frontier_on_error(test_settings: AppSettings):
+    """the status of the links is kept when the scraping fails, to resume it on retry"""
+
+    client = StubFlakyHttpClient(
+        response="<html>Test Content</html>",
+        raise_exc=HttpError("Boom", status_code=503),
+        fail_on="link2",
+    )
+
+    extractor = StubContentParser(
+        inner_links=[
+            PageLink(page_id="link1", entity_type="Movie"),
+            PageLink(page_id="link2", entity_type="Movie"),
+        ]
+    )
+    frontier = StubFrontier()
+
+    # when
+    with pytest.raises(HttpError):
+        execute_task(
+            page=TableOfContents(page_id="toc_id", entity_type="Movie"),
+            scraping_settings=test_settings.scraping_settings,
+            http_client=client,
+            storage_handler=StubStorage(),
+            link_extractor=extractor,
+            frontier=frontier,
+        )
+
+    # then
+    assert frontier.status("toc_id-Movie", "link1") == LinkStatus.DONE
+    assert frontier.status("toc_id-Movie", "link2") == LinkStatus.FAILED
+    assert frontier.load("toc_id-Movie") == [
+        PageLink(page_id="link2", entity_type="Movie")
+    ]
+
+
+def test_downloader_task_discard_unchanged_links(test_settings: AppSettings):
+    """the pages which revision did not change since they were stored are not downloaded again"""
+
+    # given
+    client = StubSyncHttpClient(
+        response={
+            "query": {
+                "pages": [
+                    {"title": "link1", "revisions": [{"revid": 1}]},
+                    {"title": "link2", "revisions": [{"revid": 22}]},
+                    {"title": "link3", "revisions": [{"revid": 3}]},
+                ]
+            }
+        }
+    )
+    storage_handler = StubVersionedStorage(revisions={"link1": 1, "link2": 2})
+    stats_collector = StubStatsCollector()
+
+    page_links = [
+        PageLink(page_id="link1", entity_type="Movie"),  # unchanged
+        PageLink(page_id="link2", entity_type="Movie"),  # changed
+        PageLink(page_id="link3", entity_type="Movie"),  # new
+    ]
+
+    # when
+    links, revisions = discard_unchanged_links(
+        http_client=client,
+        page_links=page_links,
+        storage_handler=storage_handler,
+        scraping_settings=test_settings.scraping_settings,
+        stats_collector=stats_collector,
+    )
+
+    # then
+    assert [link.page_id for link in links] == ["link2", "link3"]
+    assert revisions == {"link1": 1, "link2": 22, "link3": 3}
+    assert stats_collector.get_value(StatKey.SCRAPING_UNCHANGED, flow_id=None) == 1
+
+
+def test_downloader_task_discard_unchanged_links_on_http_error(
+    test_settings: AppSettings,
+):
+    """when the revisions cannot be checked, all the pages are downloaded"""
+
+    # given
+    client = StubSyncHttpClient(raise_exc=HttpError("Boom", status_code=503))
+    storage_handler = StubVersionedStorage(revisions={"link1": 1})
+
+    page_links = [PageLink(page_id="link1", entity_type="Movie")]
+
+    # when
+    links, revisions = discard_unchanged_links(
+        http_client=client,
+        page_links=page_links,
+        storage_handler=storage_handler,
+        scraping_settings=test_settings.scraping_settings,
+    )
+
+    # then
+    assert links == page_links
+    assert revisions == {}
+
+
+def test_downloader_task_download_and_store_revision(test_settings: AppSettings):
+    """the revision of the page is stored along with its content"""
+
+    # given
+    client = StubSyncHttpClient(response="<html>Test Content</html>")
+    storage_handler = StubVersionedStorage()
+
+    # when
+    download_and_store(
+        http_client=client,
+        page_id="page_id",
+        scraping_settings=test_settings.scraping_settings,
+        storage_handler=storage_handler,
+        return_content=False,
+        revision_id=42,
+    )
+
+    # then
+    assert storage_handler.select_revisions(["page_id"]) == {"page_id": 42}
@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
+from src.entities.movie import Movie
 from src.entities.person import Person
 from src.entities.relationship import (
     LooseRelationship,
@@ -9,13 +10,36 @@ from src.entities.relationship import (
     StrongRelationship,
 )
 from src.exceptions import HttpError
-from src.repositories.orchestration.tasks.task_relationship import connect_by_name
+from src.repositories.orchestration.tasks.task_relationship import (
+    connect_by_name,
+    execute_task,
+)
 from src.settings import AppSettings
-from tests.repositories.orchestration.stubs.stub_http import StubSyncHttpClient
+from tests.repositories.orchestration.stubs.stub_http import (
+    StubFlakyHttpClient,
+    StubSyncHttpClient,
+)
 from tests.repositories.orchestration.stubs.stub_storage import StubRelationHandler
 
 
+def _titles_response(name: str, page_id: str) -> dict:
+    """the response of the MediaWiki Action API for a single title"""
+    return {
+        "batchcomplete": True,
+        "query": {
+            "pages": [
+                {
+                    "pageid": 1,
+                    "title": name,
+                    "fullurl": f"https://fr.wikipedia.org/wiki/{page_id}",
+                }
+            ]
+        },
+    }
+
+
 def test_connect_by_name_nominal(
+    test_settings: AppSettings,
     test_person: Person,
 ):
     """case of a strong relationship being established successfully"""
@@ -25,11 +49,7 @@ def test_connect_by_name_nominal(
     name = "Clint Eastwood"
     permalink = f"https://fr.wikipedia.org/wiki/{page_id}"
 
-    http_client = StubSyncHttpClient(
-        response={
-            "key": page_id,
-        }
-    )
+    http_client = StubSyncHttpClient(response=_titles_response(name, page_id))
 
     clint = test_person.model_copy(
         update={
@@ -45,6 +65,7 @@ def test_connect_by_name_nominal(
         relation=PeopleRelationshipType.ACTED_IN,
         storage=storage,
         http_client=http_client,
+        settings=test_settings.scraping_settings,
     )
 
     # # then
@@ -56,18 +77,16 @@ def test_connect_by_name_nominal(
     assert storage.relationship.relation_type == PeopleRelationshipType.ACTED_IN
 
 
-def test_connect_by_name_not_existing_in_storage(test_person: Person):
+def test_connect_by_name_not_existing_in_storage(
+    test_settings: AppSettings, test_person: Person
+):
     """the person is found in wikipedia, but not in the storage"""
     # given
     # a runner
     page_id = "Clint_Eastwood"
     name = "Clint Eastwood"
 
-    http_client = StubSyncHttpClient(
-        response={
-            "key": page_id,
-        }
-    )
+    http_client = StubSyncHttpClient(response=_titles_response(name, page_id))
 
     storage = StubRelationHandler(None, entity_type=Person)  # nothing in storage
 
@@ -85,6 +104,7 @@ def test_connect_by_name_not_existing_in_storage(test_person: Person):
             relation=PeopleRelationshipType.ACTED_IN,
             storage=storage,
             http_client=http_client,
+            settings=test_settings.scraping_settings,
         )
 
     # verify the event is emitted
@@ -107,7 +127,12 @@ def test_connect_by_name_not_existing_on_wikipedia(
     name = "Clint Eastwood"
     permalink = f"https://fr.wikipedia.org/wiki/{page_id}"
 
-    http_client = StubSyncHttpClient(raise_exc=HttpError("Not Found", status_code=404))
+    http_client = StubSyncHttpClient(
+        response={
+            "batchcomplete": True,
+            "query": {"pages": [{"title": name, "missing": True}]},
+        }
+    )
 
     # # an input storage with a film entity
     clint = test_person.model_copy(
@@ -124,6 +149,7 @@ def test_connect_by_name_not_existing_on_wikipedia(
         relation=PeopleRelationshipType.ACTED_IN,
         storage=storage,
         http_client=http_client,
+        settings=test_settings.scraping_settings,
     )
 
     # # then
@@ -164,8 +190,56 @@ def test_connect_by_name_wikipedia_scraping_throws_http_error(
             relation=PeopleRelationshipType.ACTED_IN,
             storage=storage,
             http_client=http_client,
+            settings=test_settings.scraping_settings,
         )
 
     # # then
     assert exc_info.value.status_code == 500
     assert not storage.is_added_relationship
+
+
+def test_execute_task_resolves_the_names_at_once(
+    test_settings: AppSettings, test_person: Person, test_film: Movie
+):
+    """the permalinks of all the persons related to a movie are retrieved in a single request"""
+
+    # given
+    page_id = "Clint_Eastwood"
+    name = "Clint Eastwood"
+
+    http_client = StubFlakyHttpClient(response=_titles_response(name, page_id))
+
+    film = test_film.model_copy(
+        update={
+            "specifications": test_film.specifications.model_copy(
+                update={
+                    "directed_by": [name],
+                    "written_by": [name],
+                    "music_by": ["Not on Wikipedia"],
+                    "special_effects_by": None,
+                }
+            ),
+            "influences": None,
+        }
+    )
+
+    clint = test_person.model_copy(
+        update={"permalink": f"https://fr.wikipedia.org/wiki/{page_id}"}
+    )
+    storage = StubRelationHandler([clint])
+
+    # when
+    execute_task.fn(
+        entity=film,
+        output_storage=storage,
+        http_client=http_client,
+        settings=test_settings.scraping_settings,
+    )
+
+    # then
+    assert http_client.call_count == 1
+    assert isinstance(storage.relationship, LooseRelationship)
+    assert storage.relationship.to_title == "Not on Wikipedia"
+
+    # the relationships of the movie are added at once
+    assert len(storage.relationships) == 3
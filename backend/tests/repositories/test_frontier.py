@@ -0,0 +1,97 @@
+import uuid
+
+import orjson
+
+from src.entities.content import PageLink
+from src.interfaces.frontier import LinkStatus
+from src.repositories.frontier import RedisFrontier
+from src.settings import AppSettings
+
+
+def test_redis_frontier_load_not_saved(test_settings: AppSettings):
+
+    # given
+    frontier = RedisFrontier(redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60)
+
+    # when
+    page_links = frontier.load(str(uuid.uuid4()))
+
+    # then
+    assert page_links is None
+
+
+def test_redis_frontier_load_links_left_to_download(test_settings: AppSettings):
+
+    # given
+    frontier = RedisFrontier(redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60)
+    frontier_id = str(uuid.uuid4())
+
+    done = PageLink(page_id="done", page_title="Done", entity_type="Movie")
+    void = PageLink(page_id="void", entity_type="Movie")
+    failed = PageLink(page_id="failed", entity_type="Person")
+    pending = PageLink(page_id="pending", page_title="Pending", entity_type="Movie")
+
+    frontier.save(frontier_id, [done, void, failed, pending])
+
+    frontier.mark(frontier_id, [done], LinkStatus.DONE)
+    frontier.mark(frontier_id, [void], LinkStatus.VOID)
+    frontier.mark(frontier_id, [failed], LinkStatus.FAILED)
+
+    # when
+    page_links = frontier.load(frontier_id)
+
+    # then
+    assert sorted(page_links, key=lambda link: link.page_id) == [failed, pending]
+
+    frontier.clear(frontier_id)
+
+
+def test_redis_frontier_all_links_done(test_settings: AppSettings):
+
+    # given
+    frontier = RedisFrontier(redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60)
+    frontier_id = str(uuid.uuid4())
+
+    link = PageLink(page_id="done", entity_type="Movie")
+
+    frontier.save(frontier_id, [link])
+
+    # when
+    frontier.mark(frontier_id, [link], LinkStatus.DONE)
+
+    # then
+    assert frontier.load(frontier_id) == []
+
+    frontier.clear(frontier_id)
+
+
+def test_redis_frontier_mark_after_clear(test_settings: AppSettings):
+    """a frontier cleared is not saved again partially"""
+
+    # given
+    frontier = RedisFrontier(redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60)
+    frontier_id = str(uuid.uuid4())
+
+    link = PageLink(page_id="link", entity_type="Movie")
+
+    frontier.save(frontier_id, [link])
+    frontier.clear(frontier_id)
+
+    # when
+    frontier.mark(frontier_id, [link], LinkStatus.FAILED)
+
+    # then
+    assert frontier.load(frontier_id) is None
+
+
+def test_redis_frontier_is_serializable(test_settings: AppSettings):
+    """serialization is required for Prefect storage serializers"""
+
+    # given
+    frontier = RedisFrontier(redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60)
+
+    # when
+    serialized = orjson.dumps(frontier, default=lambda o: o.__dict__)
+
+    # then
+    assert isinstance(serialized, bytes)
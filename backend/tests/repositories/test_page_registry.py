@@ -0,0 +1,141 @@
+import uuid
+
+import orjson
+
+from src.entities.content import PageLink
+from src.repositories.page_registry import RedisPageRegistry
+from src.settings import AppSettings
+
+
+def test_redis_page_registry_claim(test_settings: AppSettings):
+
+    # given
+    registry = RedisPageRegistry(
+        redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60
+    )
+    flow_id = str(uuid.uuid4())
+
+    movie = PageLink(page_id=str(uuid.uuid4()), entity_type="Movie")
+    other_movie = PageLink(page_id=str(uuid.uuid4()), entity_type="Movie")
+
+    registry.claim([movie], flow_id=flow_id)
+
+    # when
+    claimed = registry.claim([movie, other_movie], flow_id=flow_id)
+
+    # then
+    assert claimed == [other_movie]
+
+    registry.release([movie, other_movie], flow_id=flow_id)
+
+
+def test_redis_page_registry_claim_by_entity_type(test_settings: AppSettings):
+
+    # given
+    registry = RedisPageRegistry(
+        redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60
+    )
+    flow_id = str(uuid.uuid4())
+    page_id = str(uuid.uuid4())
+
+    movie = PageLink(page_id=page_id, entity_type="Movie")
+    person = PageLink(page_id=page_id, entity_type="Person")
+
+    registry.claim([movie], flow_id=flow_id)
+
+    # when
+    claimed = registry.claim([person], flow_id=flow_id)
+
+    # then
+    assert claimed == [person]
+
+    registry.release([movie, person], flow_id=flow_id)
+
+
+def test_redis_page_registry_release(test_settings: AppSettings):
+
+    # given
+    registry = RedisPageRegistry(
+        redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60
+    )
+    flow_id = str(uuid.uuid4())
+
+    movie = PageLink(page_id=str(uuid.uuid4()), entity_type="Movie")
+    registry.claim([movie], flow_id=flow_id)
+
+    # when
+    registry.release([movie], flow_id=flow_id)
+
+    # then
+    assert registry.claim([movie], flow_id=flow_id) == [movie]
+
+    registry.release([movie], flow_id=flow_id)
+
+
+def test_redis_page_registry_release_keeps_the_claims_of_other_flow_runs(
+    test_settings: AppSettings,
+):
+
+    # given
+    registry = RedisPageRegistry(
+        redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60
+    )
+    flow_id = str(uuid.uuid4())
+    other_flow_id = str(uuid.uuid4())
+
+    movie = PageLink(page_id=str(uuid.uuid4()), entity_type="Movie")
+    other_movie = PageLink(page_id=str(uuid.uuid4()), entity_type="Movie")
+
+    registry.claim([movie], flow_id=flow_id)
+    registry.claim([other_movie], flow_id=other_flow_id)
+
+    # when
+    registry.release([movie, other_movie], flow_id=flow_id)
+
+    # then
+    assert registry.claim([movie, other_movie], flow_id=flow_id) == [movie]
+
+    registry.release([movie], flow_id=flow_id)
+    registry.release([other_movie], flow_id=other_flow_id)
+
+
+def test_redis_page_registry_take_over(test_settings: AppSettings):
+    """the pages of a crashed flow run are claimed by the flow run resuming its scraping"""
+
+    # given
+    registry = RedisPageRegistry(
+        redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60
+    )
+    flow_id = str(uuid.uuid4())
+    crashed_flow_id = str(uuid.uuid4())
+
+    movie = PageLink(page_id=str(uuid.uuid4()), entity_type="Movie")
+    registry.claim([movie], flow_id=crashed_flow_id)
+
+    # when
+    registry.take_over([movie], flow_id=flow_id)
+
+    # then
+    # the pages are released by the flow run which took them over
+    registry.release([movie], flow_id=crashed_flow_id)
+    assert registry.claim([movie], flow_id=crashed_flow_id) == []
+
+    registry.release([movie], flow_id=flow_id)
+    assert registry.claim([movie], flow_id=crashed_flow_id) == [movie]
+
+    registry.release([movie], flow_id=crashed_flow_id)
+
+
+def test_redis_page_registry_is_serializable(test_settings: AppSettings):
+    """serialization is required for Prefect storage serializers"""
+
+    # given
+    registry = RedisPageRegistry(
+        redis_dsn=test_settings.storage_settings.redis_dsn, ttl=60
+    )
+
+    # when
+    serialized = orjson.dumps(registry, default=lambda o: o.__dict__)
+
+    # then
+    assert isinstance(serialized, bytes)
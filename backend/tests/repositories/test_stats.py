@@ -2,6 +2,7 @@ import uuid
 
 import orjson
 import redis
+from pytest_mock import MockerFixture
 
 from src.repositories.stats import RedisStatsCollector, StatKey
 from src.settings import AppSettings
@@ -18,7 +19,7 @@ def test_redis_stats_collector_get_value_not_existing(test_settings: AppSettings
 
     test_key = StatKey.SCRAPING_FAILED
     flow_id = str(uuid.uuid4())
-    key = collector._compose_key(test_key, flow_id)
+    key = collector._compose_key(flow_id)
 
     # Ensure the key does not exist
     redis_client.delete(key)
@@ -41,15 +42,15 @@ def test_redis_stats_collector_get_existing_value(test_settings: AppSettings):
     flow_id = str(uuid.uuid4())
 
     # Ensure the key does not exist
-    key = collector._compose_key(test_key, flow_id)
-    redis_client.set(key, 1)
+    key = collector._compose_key(flow_id)
+    redis_client.hset(key, test_key, 1)
 
     # when
     val = collector.get_value(test_key, flow_id=flow_id, default=0)
 
     # Then
     assert val == 1
-    redis_client.delete(test_key)
+    redis_client.delete(key)
 
 
 def test_redis_stats_collector_set_value(test_settings: AppSettings):
@@ -62,7 +63,7 @@ def test_redis_stats_collector_set_value(test_settings: AppSettings):
 
     test_key = StatKey.SCRAPING_FAILED
     flow_id = str(uuid.uuid4())
-    key = collector._compose_key(test_key, flow_id)
+    key = collector._compose_key(flow_id)
 
     # Ensure the key does not exist
     redis_client.delete(key)
@@ -71,21 +72,21 @@ def test_redis_stats_collector_set_value(test_settings: AppSettings):
     collector.set_value(test_key, flow_id=flow_id, value=42)
 
     # Then
-    assert int(redis_client.get(key)) == 42
+    assert int(redis_client.hget(key, test_key)) == 42
     redis_client.delete(key)
 
 
 def test_redis_stats_collector_inc_value(test_settings: AppSettings):
     # given
     redis_dsn = test_settings.stats_settings.redis_dsn
-    collector = RedisStatsCollector(redis_dsn=str(redis_dsn))
+    collector = RedisStatsCollector(redis_dsn=str(redis_dsn), flush_interval=0)
     redis_client = redis.Redis.from_url(
         str(test_settings.stats_settings.redis_dsn), decode_responses=True
     )
 
     test_key = StatKey.SCRAPING_FAILED
     flow_id = str(uuid.uuid4())
-    key = collector._compose_key(test_key, flow_id)
+    key = collector._compose_key(flow_id)
 
     # Ensure the key does not exist
     redis_client.delete(key)
@@ -94,13 +95,13 @@ def test_redis_stats_collector_inc_value(test_settings: AppSettings):
     collector.inc_value(test_key, flow_id=flow_id, count=5, start=10)
 
     # Then
-    assert int(redis_client.get(key)) == 15
+    assert int(redis_client.hget(key, test_key)) == 15
 
     # when
     collector.inc_value(test_key, flow_id=flow_id, count=3)
 
     # Then
-    assert int(redis_client.get(key)) == 18
+    assert int(redis_client.hget(key, test_key)) == 18
 
     redis_client.delete(key)
 
@@ -116,8 +117,7 @@ def test_redis_stats_collector_collect(test_settings: AppSettings):
     flow_id = str(uuid.uuid4())
 
     # Ensure the keys do not exist
-    for key in StatKey:
-        redis_client.delete(collector._compose_key(key, flow_id))
+    redis_client.delete(collector._compose_key(flow_id))
 
     # set some values
     collector.set_value(StatKey.SCRAPING_SUCCESS, flow_id, 10)
@@ -135,8 +135,59 @@ def test_redis_stats_collector_collect(test_settings: AppSettings):
     }
 
     # cleanup
-    for key in StatKey:
-        redis_client.delete(collector._compose_key(key, flow_id))
+    redis_client.delete(collector._compose_key(flow_id))
+
+
+def test_redis_stats_collector_buffers_increments(
+    mocker: MockerFixture, test_settings: AppSettings
+):
+    """the increments are written at once when flushed, and read at once when collected"""
+
+    # given
+    redis_dsn = test_settings.stats_settings.redis_dsn
+    collector = RedisStatsCollector(redis_dsn=str(redis_dsn), flush_interval=3600)
+    redis_client = redis.Redis.from_url(
+        str(test_settings.stats_settings.redis_dsn), decode_responses=True
+    )
+
+    flow_id = str(uuid.uuid4())
+    key = collector._compose_key(flow_id)
+
+    hincrby = mocker.spy(redis.client.Pipeline, "hincrby")
+
+    # when
+    for _ in range(10):
+        collector.inc_value(StatKey.EXTRACTION_SUCCESS, flow_id=flow_id)
+    collector.inc_value(StatKey.EXTRACTION_FAILED, flow_id=flow_id, count=2)
+
+    # then
+    assert not redis_client.exists(key), "the increments are buffered"
+
+    # when
+    collector.flush(flow_id)
+
+    # then
+    assert hincrby.call_count == 2
+    assert redis_client.hgetall(key) == {
+        StatKey.EXTRACTION_SUCCESS.value: "10",
+        StatKey.EXTRACTION_FAILED.value: "2",
+    }
+
+    # when
+    collector.inc_value(StatKey.EXTRACTION_SUCCESS, flow_id=flow_id)
+
+    get = mocker.spy(redis.Redis, "get")
+    hgetall = mocker.spy(redis.Redis, "hgetall")
+
+    # then the buffered increments are flushed when collected
+    assert collector.collect(flow_id=flow_id) == {
+        "EXTRACTION_SUCCESS": 11,
+        "EXTRACTION_FAILED": 2,
+    }
+    assert hgetall.call_count == 1
+    assert get.call_count == 0
+
+    redis_client.delete(key)
 
 
 def test_redis_stats_collector_is_serializable(test_settings: AppSettings):
@@ -1,7 +1,16 @@
 import pytest
 
 from src.exceptions import RetrievalError
-from src.repositories.wikipedia import get_page_id
+from src.repositories.wikipedia import (
+    get_page_id,
+    get_revision_ids,
+    resolve_permalinks,
+)
+from src.settings import AppSettings
+from tests.repositories.orchestration.stubs.stub_http import (
+    StubFlakyHttpClient,
+    StubSyncHttpClient,
+)
 
 
 def test_get_page_id():
@@ -28,3 +37,116 @@ def test_get_page_id_invalid_permalink():
 
     assert isinstance(exc_info.value, RetrievalError)
     assert exc_info.value.status_code == 500
+
+
+def test_get_revision_ids(test_settings: AppSettings):
+    """the revisions are mapped back to the page IDs, following normalizations and redirects"""
+
+    # given
+    http_client = StubSyncHttpClient(
+        response={
+            "batchcomplete": True,
+            "query": {
+                "normalized": [
+                    {"from": "Le_Voyage_dans_la_Lune", "to": "Le Voyage dans la Lune"},
+                    {"from": "Georges_Méliès", "to": "Georges Méliès"},
+                    {"from": "Page_inexistante", "to": "Page inexistante"},
+                ],
+                "redirects": [
+                    {"from": "Georges Méliès", "to": "Georges Méliès (cinéaste)"},
+                ],
+                "pages": [
+                    {
+                        "pageid": 1,
+                        "title": "Le Voyage dans la Lune",
+                        "revisions": [{"revid": 100}],
+                    },
+                    {
+                        "pageid": 2,
+                        "title": "Georges Méliès (cinéaste)",
+                        "revisions": [{"revid": 200}],
+                    },
+                    {"title": "Page inexistante", "missing": True},
+                ],
+            },
+        }
+    )
+
+    # when
+    revisions = get_revision_ids(
+        ["Le_Voyage_dans_la_Lune", "Georges_M%C3%A9li%C3%A8s", "Page_inexistante"],
+        http_client=http_client,
+        settings=test_settings.scraping_settings,
+    )
+
+    # then
+    assert revisions == {
+        "Le_Voyage_dans_la_Lune": 100,
+        "Georges_M%C3%A9li%C3%A8s": 200,
+    }
+
+
+def test_resolve_permalinks(test_settings: AppSettings):
+    """the permalinks, redirects and missing pages are returned together"""
+
+    # given
+    http_client = StubFlakyHttpClient(
+        response={
+            "batchcomplete": True,
+            "query": {
+                "normalized": [
+                    {"from": "georges Méliès", "to": "Georges Méliès"},
+                ],
+                "redirects": [
+                    {"from": "Georges Méliès", "to": "Georges Méliès (cinéaste)"},
+                ],
+                "pages": [
+                    {
+                        "pageid": 1,
+                        "title": "Clint Eastwood",
+                        "fullurl": "https://fr.wikipedia.org/wiki/Clint_Eastwood",
+                    },
+                    {
+                        "pageid": 2,
+                        "title": "Georges Méliès (cinéaste)",
+                        "fullurl": "https://fr.wikipedia.org/wiki/Georges_M%C3%A9li%C3%A8s_(cin%C3%A9aste)",
+                    },
+                    {"title": "Page inexistante", "missing": True},
+                ],
+            },
+        }
+    )
+
+    # when
+    resolution = resolve_permalinks(
+        ["Clint Eastwood", "georges Méliès", "Page inexistante", "Clint Eastwood", " "],
+        http_client=http_client,
+        settings=test_settings.scraping_settings,
+    )
+
+    # then
+    assert http_client.call_count == 1
+    assert str(resolution.permalinks["Clint Eastwood"]) == (
+        "https://fr.wikipedia.org/wiki/Clint_Eastwood"
+    )
+    assert "georges Méliès" in resolution.permalinks
+    assert resolution.redirects == {"georges Méliès": "Georges Méliès (cinéaste)"}
+    assert resolution.missing == ["Page inexistante"]
+
+
+def test_resolve_permalinks_by_batches(test_settings: AppSettings):
+    """the names are resolved by batches of 50 titles"""
+
+    # given
+    http_client = StubFlakyHttpClient(response={"batchcomplete": True, "query": {}})
+
+    # when
+    resolution = resolve_permalinks(
+        [f"Name {i}" for i in range(120)],
+        http_client=http_client,
+        settings=test_settings.scraping_settings,
+    )
+
+    # then
+    assert http_client.call_count == 3
+    assert len(resolution.missing) == 120
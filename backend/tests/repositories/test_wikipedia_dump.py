@@ -0,0 +1,127 @@
+import io
+import tarfile
+from pathlib import Path
+
+import orjson
+import pytest
+import redis
+
+from src.entities.content import PageLink
+from src.entities.movie import Movie
+from src.entities.person import Person
+from src.repositories.db.redis.text import RedisTextStorage
+from src.settings import AppSettings
+
+
+@pytest.fixture(scope="function", autouse=True)
+def cleanup_redis(test_settings: AppSettings):
+    r = redis.Redis.from_url(
+        str(test_settings.storage_settings.redis_dsn), decode_responses=True
+    )
+    r.flushdb()
+    yield
+    r.flushdb()
+
+
+def _write_dump(path: Path, files: dict[str, list[dict | str]]) -> Path:
+    """writes a sample dump, each file being a list of articles or raw lines"""
+
+    with tarfile.open(path, mode="w:gz") as archive:
+        for name, lines in files.items():
+            data = b"\n".join(
+                line.encode() if isinstance(line, str) else orjson.dumps(line)
+                for line in lines
+            )
+            info = tarfile.TarInfo(name=name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    return path
+
+
+def _article(name: str, revision_id: int) -> dict:
+    return {
+        "name": name,
+        "identifier": revision_id * 10,
+        "version": {"identifier": revision_id},
+        "article_body": {"html": f"<html><body>{name}</body></html>"},
+    }
+
+
+def test_read_dump(tmp_path: Path):
+
+    # given
+    from src.repositories.wikipedia_dump import read_dump
+
+    dump = _write_dump(
+        tmp_path / "dump.tar.gz",
+        {
+            "frwiki_namespace_0_0.ndjson": [
+                _article("Lucien Nonguet", 1),
+                "not a json line",
+                {"name": "Without HTML", "article_body": {}},
+            ],
+            "frwiki_namespace_0_1.ndjson": [_article("Le Voyage dans la Lune", 2)],
+        },
+    )
+
+    # when
+    pages = list(read_dump(dump))
+
+    # then
+    assert pages == [
+        ("Lucien_Nonguet", "<html><body>Lucien Nonguet</body></html>", 1),
+        (
+            "Le_Voyage_dans_la_Lune",
+            "<html><body>Le Voyage dans la Lune</body></html>",
+            2,
+        ),
+    ]
+
+
+def test_ingest_dump_stores_the_linked_pages(
+    tmp_path: Path, test_settings: AppSettings
+):
+
+    # given
+    from src.repositories.wikipedia_dump import ingest_dump
+
+    dump = _write_dump(
+        tmp_path / "dump.tar.gz",
+        {
+            "frwiki_namespace_0_0.ndjson": [
+                _article("Lucien Nonguet", 1),
+                _article("Not linked", 2),
+                _article("Le Voyage dans la Lune (1902)", 3),
+                _article("Georges Méliès", 4),
+            ],
+        },
+    )
+
+    html_stores = {
+        "Movie": RedisTextStorage[Movie](test_settings.storage_settings.redis_dsn),
+        "Person": RedisTextStorage[Person](test_settings.storage_settings.redis_dsn),
+    }
+
+    page_links = [
+        PageLink(page_id="Lucien_Nonguet", entity_type="Person"),
+        PageLink(page_id="Le_Voyage_dans_la_Lune_%281902%29", entity_type="Movie"),
+        PageLink(page_id="Georges_M%C3%A9li%C3%A8s", entity_type="Person"),
+        PageLink(page_id="Missing_from_dump", entity_type="Movie"),
+    ]
+
+    # when
+    stored = ingest_dump(dump, page_links, html_stores, batch_size=1)
+
+    # then
+    assert stored == 3
+    assert (
+        html_stores["Person"].select("Lucien_Nonguet")
+        == "<html><body>Lucien Nonguet</body></html>"
+    )
+    assert html_stores["Movie"].select("Le_Voyage_dans_la_Lune_%281902%29") is not None
+    assert html_stores["Person"].select_revisions(
+        ["Lucien_Nonguet", "Georges_M%C3%A9li%C3%A8s"]
+    ) == {"Lucien_Nonguet": 1, "Georges_M%C3%A9li%C3%A8s": 4}
+    assert html_stores["Movie"].select("Not_linked") is None
+    assert len(list(html_stores["Movie"].scan())) == 1
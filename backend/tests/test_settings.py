@@ -227,3 +227,15 @@ def test_AppSettings_defaults():
     assert settings.section_settings is not None
     assert settings.stats_settings is not None
     assert settings.scraping_settings is not None
+
+
+def test_storage_settings_html_archive_directory_is_absolute():
+
+    # when
+    settings = StorageSettings(
+        _env_file=None,
+        html_archive_directory="./relative/archive",
+    )
+
+    # then
+    assert Path(settings.html_archive_directory).is_absolute()